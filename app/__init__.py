@@ -36,6 +36,72 @@ def create_app():
     else:
         logger.warning('Gemini API key is not configured!')
 
+    # Shared Gemini client registry (keep-alive HTTP connection pool)
+    from app.client_pool import GeminiClientRegistry
+    app.config['GEMINI_MAX_CONNECTIONS'] = int(os.getenv('GEMINI_MAX_CONNECTIONS', '20'))
+    app.config['GEMINI_MAX_KEEPALIVE_CONNECTIONS'] = int(os.getenv('GEMINI_MAX_KEEPALIVE_CONNECTIONS', '10'))
+    app.config['GEMINI_KEEPALIVE_EXPIRY'] = float(os.getenv('GEMINI_KEEPALIVE_EXPIRY', '60'))
+    app.config['STORE_METADATA_CACHE_TTL'] = float(os.getenv('STORE_METADATA_CACHE_TTL', '30'))
+    app.extensions['gemini_registry'] = GeminiClientRegistry(
+        max_connections=app.config['GEMINI_MAX_CONNECTIONS'],
+        max_keepalive_connections=app.config['GEMINI_MAX_KEEPALIVE_CONNECTIONS'],
+        keepalive_expiry=app.config['GEMINI_KEEPALIVE_EXPIRY'],
+        store_cache_ttl=app.config['STORE_METADATA_CACHE_TTL']
+    )
+    logger.info('Gemini client registry created')
+
+    app.config['GEMINI_MODEL'] = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+
+    # Answer cache for repeated chat questions
+    from app.answer_cache import AnswerCache
+    app.config['ANSWER_CACHE_TTL'] = float(os.getenv('ANSWER_CACHE_TTL', '3600'))
+    app.config['ANSWER_CACHE_MAX_ENTRIES'] = int(os.getenv('ANSWER_CACHE_MAX_ENTRIES', '512'))
+    app.config['ANSWER_CACHE_MAX_MB'] = float(os.getenv('ANSWER_CACHE_MAX_MB', '16'))
+    app.extensions['answer_cache'] = AnswerCache(
+        max_entries=app.config['ANSWER_CACHE_MAX_ENTRIES'],
+        max_bytes=int(app.config['ANSWER_CACHE_MAX_MB'] * 1024 * 1024),
+        ttl_seconds=app.config['ANSWER_CACHE_TTL']
+    )
+    logger.info('Answer cache created')
+
+    # Optional semantic cache for paraphrased questions
+    app.config['SEMANTIC_CACHE_ENABLED'] = os.getenv('SEMANTIC_CACHE_ENABLED', 'False').lower() == 'true'
+    app.config['SEMANTIC_CACHE_THRESHOLD'] = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92'))
+    app.config['SEMANTIC_CACHE_MAX_ENTRIES'] = int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', '1024'))
+    app.config['SEMANTIC_CACHE_EMBEDDER'] = os.getenv('SEMANTIC_CACHE_EMBEDDER', 'gemini')
+    app.config['EMBEDDING_MODEL'] = os.getenv('EMBEDDING_MODEL', 'gemini-embedding-001')
+    if app.config['SEMANTIC_CACHE_ENABLED']:
+        from app.semantic_cache import SemanticAnswerCache, make_gemini_embedder, make_ngram_embedder
+        if app.config['SEMANTIC_CACHE_EMBEDDER'] == 'ngram':
+            embed_fn = make_ngram_embedder()
+        else:
+            registry = app.extensions['gemini_registry']
+            embed_fn = make_gemini_embedder(
+                lambda: registry.get(app.config['GEMINI_API_KEY']),
+                model=app.config['EMBEDDING_MODEL']
+            )
+        app.extensions['semantic_cache'] = SemanticAnswerCache(
+            embed_fn,
+            threshold=app.config['SEMANTIC_CACHE_THRESHOLD'],
+            max_entries=app.config['SEMANTIC_CACHE_MAX_ENTRIES'],
+            ttl_seconds=app.config['ANSWER_CACHE_TTL']
+        )
+        logger.info(f"Semantic cache enabled (embedder: {app.config['SEMANTIC_CACHE_EMBEDDER']})")
+
+    # Wayfinding route image renderer ('matplotlib' or 'pillow'), routing options, batch limits and route cache bounds
+    app.config['WAYFINDING_RENDERER'] = os.getenv('WAYFINDING_RENDERER', 'matplotlib')
+    app.config['WAYFINDING_RENDER_PROCESSES'] = int(os.getenv('WAYFINDING_RENDER_PROCESSES', '0'))
+    app.config['WAYFINDING_ROUTING_ENGINE'] = os.getenv('WAYFINDING_ROUTING_ENGINE', 'csgraph')
+    app.config['WAYFINDING_ROUTING_ALGORITHM'] = os.getenv('WAYFINDING_ROUTING_ALGORITHM', 'astar')
+    app.config['WAYFINDING_DISTANCE_TABLE'] = os.getenv('WAYFINDING_DISTANCE_TABLE', 'True').lower() == 'true'
+    app.config['WAYFINDING_SNAP_TO_EDGES'] = os.getenv('WAYFINDING_SNAP_TO_EDGES', 'True').lower() == 'true'
+    app.config['WAYFINDING_SNAP_COMPONENT'] = os.getenv('WAYFINDING_SNAP_COMPONENT', 'any')
+    app.config['WAYFINDING_BATCH_MAX_PAIRS'] = int(os.getenv('WAYFINDING_BATCH_MAX_PAIRS', '500'))
+    app.config['WAYFINDING_BATCH_WORKERS'] = int(os.getenv('WAYFINDING_BATCH_WORKERS', '4'))
+    app.config['WAYFINDING_TOUR_MAX_STOPS'] = int(os.getenv('WAYFINDING_TOUR_MAX_STOPS', '12'))
+    app.config['ROUTE_CACHE_MAX_ENTRIES'] = int(os.getenv('ROUTE_CACHE_MAX_ENTRIES', '1024'))
+    app.config['ROUTE_CACHE_MAX_MB'] = float(os.getenv('ROUTE_CACHE_MAX_MB', '64'))
+
     # Route registration
     from app import routes
     app.register_blueprint(routes.bp)
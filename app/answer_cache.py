@@ -0,0 +1,225 @@
+"""
+Answer cache for FileSearch chat responses
+TTL + LRU cache with a memory bound, invalidated per store when documents change
+"""
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
+from app.logger import get_logger
+from app.db import bump_store_version
+
+logger = get_logger()
+
+# Trailing punctuation that does not change the meaning of a question
+_TRAILING_PUNCT_RE = re.compile(r'[\s?!.~,;:？！。]+$')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a question for cache lookup
+
+    Applies NFKC normalization, lowercases, collapses whitespace and strips
+    trailing punctuation so "화장실 어디?" and "화장실  어디" share an entry.
+    """
+    text = unicodedata.normalize('NFKC', query or '')
+    text = _WHITESPACE_RE.sub(' ', text.lower()).strip()
+    return _TRAILING_PUNCT_RE.sub('', text)
+
+
+def store_name_from_document(document_name: str) -> Optional[str]:
+    """
+    Extract the store name from a document name
+
+    Args:
+        document_name: 'fileSearchStores/{store_id}/documents/{doc_id}'
+
+    Returns:
+        'fileSearchStores/{store_id}' or None if the name has another format
+    """
+    parts = (document_name or '').split('/')
+    if len(parts) >= 2 and parts[0] == 'fileSearchStores':
+        return f"{parts[0]}/{parts[1]}"
+    return None
+
+
+class AnswerCache:
+    """Thread-safe TTL/LRU cache of search results keyed by (query, stores, model)"""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 16 * 1024 * 1024, ttl_seconds: float = 3600):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached answers
+            max_bytes: Approximate memory bound for cached answers
+            ttl_seconds: Seconds an answer stays valid
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        # key -> (expires_at, store_versions, size_bytes, result)
+        self._entries: "OrderedDict[Tuple, Tuple[float, Tuple, int, Dict[str, Any]]]" = OrderedDict()
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.stale = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        logger.info(f"AnswerCache initialized - max_entries: {max_entries}, max_bytes: {max_bytes}, ttl: {ttl_seconds}s")
+
+    @staticmethod
+    def make_key(query: str, store_names: List[str], model: str) -> Tuple:
+        """Build the cache key from the normalized query, sorted stores and model"""
+        return (normalize_query(query), tuple(sorted(store_names)), model)
+
+    @staticmethod
+    def _versions_tuple(key: Tuple, store_versions: Optional[Dict[str, int]]) -> Tuple:
+        store_versions = store_versions or {}
+        return tuple(store_versions.get(name, 0) for name in key[1])
+
+    def get(self, query: str, store_names: List[str], model: str,
+            store_versions: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached answer
+
+        Args:
+            query: Search query
+            store_names: Stores searched
+            model: Model name
+            store_versions: Current store versions (from get_store_versions); entries
+                cached under older versions are treated as stale
+
+        Returns:
+            Copy of the cached result dict, or None on miss
+        """
+        key = self.make_key(query, store_names, model)
+        versions = self._versions_tuple(key, store_versions)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, entry_versions, _, result = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            if entry_versions != versions:
+                self._remove(key)
+                self.stale += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    def set(self, query: str, store_names: List[str], model: str, result: Dict[str, Any],
+            store_versions: Optional[Dict[str, int]] = None) -> bool:
+        """
+        Store a successful search result
+
+        Returns:
+            True if cached, False if the result is larger than the memory bound
+        """
+        key = self.make_key(query, store_names, model)
+        versions = self._versions_tuple(key, store_versions)
+        size_bytes = len(json.dumps(result, ensure_ascii=False, default=str).encode('utf-8')) + len(key[0].encode('utf-8'))
+
+        if size_bytes > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, versions, size_bytes, dict(result))
+            self._total_bytes += size_bytes
+
+            # LRU eviction (entry count and memory bound)
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+        return True
+
+    def _remove(self, key: Tuple):
+        """Remove an entry (caller must hold the lock)"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def invalidate_store(self, store_name: str) -> int:
+        """
+        Drop every cached answer that searched the given store
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._entries if store_name in key[1]]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+
+        if keys:
+            logger.info(f"AnswerCache invalidated {len(keys)} entries for store {store_name}")
+        return len(keys)
+
+    def clear(self):
+        """Remove all cached answers"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters and size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "expirations": self.expirations,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+def notify_store_changed(store_name: Optional[str], cache: Optional[AnswerCache] = None):
+    """
+    Record that a store's documents changed
+
+    Bumps the shared store version (visible to every process) and drops the
+    affected entries from the local cache, if one is given.
+
+    Args:
+        store_name: Store name (format: fileSearchStores/{id})
+        cache: Optional in-process AnswerCache to invalidate immediately
+    """
+    if not store_name:
+        return
+    bump_store_version(store_name)
+    if cache is not None:
+        cache.invalidate_store(store_name)
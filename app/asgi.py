@@ -0,0 +1,194 @@
+"""
+Async (ASGI) serving mode
+Serves chat search and store management natively on asyncio and delegates
+every other route to the Flask app, so one process can hold many in-flight
+Gemini requests without blocking a worker thread per request.
+
+Run with: uvicorn asgi:application --host 0.0.0.0 --port 5001
+"""
+import asyncio
+from asgiref.wsgi import WsgiToAsgi
+from app.logger import get_logger
+from app.db import set_config
+from app.routes import get_active_store_ids, get_cached_answer, cache_answer, get_gemini_client
+
+logger = get_logger()
+
+
+class AsyncGateway:
+    """ASGI application with async handlers for the hot routes and a Flask fallback"""
+
+    def __init__(self, flask_app):
+        """
+        Initialize the gateway
+
+        Args:
+            flask_app: Flask app from create_app() (shares config, caches and client registry)
+        """
+        self.flask_app = flask_app
+        self.wsgi_app = WsgiToAsgi(flask_app)
+        self.routes = {
+            ('POST', '/api/search'): self.search,
+            ('GET', '/api/stores'): self.list_stores,
+            ('POST', '/api/config/active-stores'): self.set_active_stores,
+        }
+        logger.info(f'AsyncGateway initialized - async routes: {[path for _, path in self.routes]}')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+
+        if scope['type'] == 'http':
+            handler = self.routes.get((scope['method'], scope['path']))
+            if handler is not None:
+                with self.flask_app.app_context():
+                    await self._dispatch(handler, scope, receive, send)
+                return
+
+        await self.wsgi_app(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                registry = self.flask_app.extensions.get('gemini_registry')
+                if registry is not None:
+                    await registry.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _dispatch(self, handler, scope, receive, send):
+        client_ip = scope.get('client')[0] if scope.get('client') else None
+
+        try:
+            body = await self._read_body(receive)
+            data = self.flask_app.json.loads(body) if body else {}
+            payload, status = await handler(data or {}, client_ip)
+        except Exception as e:
+            logger.error(f'Async route exception occurred - Path: {scope["path"]} - IP: {client_ip} - Error: {str(e)}', exc_info=True)
+            payload, status = {'success': False, 'error': str(e)}, 500
+
+        response = self._finalize_response(scope, client_ip, self.flask_app.json.dumps(payload), status)
+        response_body = response.get_data()
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response.headers.items()],
+        })
+        await send({'type': 'http.response.body', 'body': response_body})
+
+    def _finalize_response(self, scope, client_ip, body, status):
+        """
+        Build the Flask response for an async handler result and run Flask's after-request
+        processing on it (Flask-CORS headers etc.), so ASGI mode answers like the WSGI app
+
+        OPTIONS preflight requests never reach the async handlers; they fall through to Flask.
+        """
+        headers = [(name.decode('latin-1'), value.decode('latin-1')) for name, value in scope.get('headers', [])]
+        with self.flask_app.test_request_context(
+            scope['path'],
+            method=scope['method'],
+            headers=headers,
+            query_string=scope.get('query_string', b''),
+            environ_base={'REMOTE_ADDR': client_ip or ''}
+        ):
+            response = self.flask_app.response_class(body, status=status, mimetype='application/json')
+            return self.flask_app.process_response(response)
+
+    @staticmethod
+    async def _read_body(receive):
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+
+    # ==================== Async Handlers ====================
+
+    async def search(self, data, client_ip):
+        """FileSearch로 검색 (활성 스토어 사용, async)"""
+        logger.info(f'Async search request - IP: {client_ip}')
+
+        query = data.get('query', '').strip()
+        metadata_filter = data.get('metadata_filter', None)
+        history = data.get('history', [])
+
+        if not query:
+            logger.warning(f'Search query is missing - IP: {client_ip}')
+            return {'success': False, 'error': 'Query is required'}, 400
+
+        # SQLite 조회 및 임베딩 호출은 이벤트 루프를 막지 않도록 스레드에서 실행
+        store_ids = await asyncio.to_thread(get_active_store_ids)
+
+        if not store_ids:
+            logger.warning(f'No active stores configured - IP: {client_ip}')
+            return {'success': False, 'error': 'No active FileStores configured. Please contact administrator.'}, 400
+
+        cached, cache_context = await asyncio.to_thread(get_cached_answer, query, store_ids, history)
+        if cached is not None:
+            logger.info(f'Search cache hit - Query: {query} - Stores: {store_ids} - IP: {client_ip}')
+            return cached, 200
+
+        gemini = get_gemini_client()
+        result = await gemini.search_with_file_search_async(
+            query, store_ids, metadata_filter,
+            model=self.flask_app.config['GEMINI_MODEL'],
+            history=history
+        )
+        cache_answer(query, store_ids, history, cache_context, result)
+
+        if result['success']:
+            logger.info(f'Search successful - Query: {query} - Stores: {store_ids} - IP: {client_ip}')
+            return result, 200
+
+        logger.error(f'Search failed - Query: {query} - Error: {result.get("error")} - IP: {client_ip}')
+        return result, 400
+
+    async def list_stores(self, data, client_ip):
+        """모든 FileSearchStore 조회 (async)"""
+        logger.info(f'Async store list retrieval request - IP: {client_ip}')
+
+        gemini = get_gemini_client()
+        result = await gemini.list_file_search_stores_async()
+
+        if result['success']:
+            logger.info(f'Store list retrieval successful - Count: {result.get("count", 0)} - IP: {client_ip}')
+            return result, 200
+
+        logger.error(f'Store list retrieval failed - Error: {result.get("error")} - IP: {client_ip}')
+        return result, 400
+
+    async def set_active_stores(self, data, client_ip):
+        """활성 FileStore 목록 설정 (다중 선택, async)"""
+        logger.info(f'Async set active stores request - IP: {client_ip}')
+
+        store_names = data.get('store_names', [])
+
+        if not store_names or not isinstance(store_names, list):
+            logger.warning(f'Store names missing or invalid - IP: {client_ip}')
+            return {'success': False, 'error': 'Store names array is required'}, 400
+
+        # Store names 유효성 검증 (동시 조회, 동기 경로와 같은 동시 요청 수 제한)
+        gemini = get_gemini_client()
+        store_infos = await gemini.get_file_search_stores_async(store_names)
+        invalid_stores = [name for name in store_names if not store_infos[name].get('success')]
+
+        if invalid_stores:
+            logger.warning(f'Invalid store names: {invalid_stores} - IP: {client_ip}')
+            return {'success': False, 'error': f'Invalid FileStore names: {", ".join(invalid_stores)}'}, 400
+
+        active_stores_json = self.flask_app.json.dumps(store_names)
+        if await asyncio.to_thread(set_config, 'active_stores', active_stores_json):
+            logger.info(f'Active stores set successfully - Stores: {store_names} - IP: {client_ip}')
+            return {
+                'success': True,
+                'active_stores': store_names,
+                'message': f'Active FileStores set successfully ({len(store_names)} stores)'
+            }, 200
+
+        logger.error(f'Failed to set active stores - Stores: {store_names} - IP: {client_ip}')
+        return {'success': False, 'error': 'Failed to save configuration'}, 500
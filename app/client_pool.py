@@ -0,0 +1,236 @@
+"""
+Process-wide registry of pooled GeminiClient instances
+Shares one keep-alive HTTP connection pool per API key across all requests
+"""
+import threading
+from typing import Optional, Dict, Any
+import httpx
+from google.genai import types
+from app.gemini_client import GeminiClient
+from app.logger import get_logger
+
+logger = get_logger()
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    """HTTP transport that reports each request to its owner, including ones that fail before a response"""
+
+    def __init__(self, owner: "_PooledHttpClient", **kwargs):
+        super().__init__(**kwargs)
+        self._owner = owner
+
+    def handle_request(self, request):
+        self._owner._request_started()
+        response = None
+        try:
+            response = super().handle_request(request)
+            return response
+        finally:
+            self._owner._request_finished(response is not None)
+
+
+class _AsyncCountingTransport(httpx.AsyncHTTPTransport):
+    """Async variant of _CountingTransport"""
+
+    def __init__(self, owner: "_PooledHttpClient", **kwargs):
+        super().__init__(**kwargs)
+        self._owner = owner
+
+    async def handle_async_request(self, request):
+        self._owner._request_started()
+        response = None
+        try:
+            response = await super().handle_async_request(request)
+            return response
+        finally:
+            self._owner._request_finished(response is not None)
+
+
+class _PooledHttpClient:
+    """Keep-alive httpx client pair (sync + async) with request counters"""
+
+    def __init__(self, limits: httpx.Limits, timeout: Optional[float] = None):
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.responses_received = 0
+        self.requests_failed = 0
+        self.in_flight = 0
+
+        # Limits go on the transports: httpx ignores client-level limits when a transport is given
+        self.sync_client = httpx.Client(
+            transport=_CountingTransport(self, limits=limits),
+            timeout=timeout,
+            follow_redirects=True
+        )
+        self.async_client = httpx.AsyncClient(
+            transport=_AsyncCountingTransport(self, limits=limits),
+            timeout=timeout,
+            follow_redirects=True
+        )
+
+    def _request_started(self):
+        with self._lock:
+            self.requests_sent += 1
+            self.in_flight += 1
+
+    def _request_finished(self, responded: bool):
+        """Called once per request, whether it got a response or raised (timeout, connection error, cancellation)"""
+        with self._lock:
+            if responded:
+                self.responses_received += 1
+            else:
+                self.requests_failed += 1
+            self.in_flight -= 1
+
+    @staticmethod
+    def _connection_stats(client) -> Dict[str, int]:
+        """Count open/idle connections in the underlying httpcore pool"""
+        pool = getattr(getattr(client, '_transport', None), '_pool', None)
+        connections = list(getattr(pool, 'connections', []) or [])
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                "requests_sent": self.requests_sent,
+                "responses_received": self.responses_received,
+                "requests_failed": self.requests_failed,
+                "in_flight": self.in_flight
+            }
+        counters["sync_pool"] = self._connection_stats(self.sync_client)
+        counters["async_pool"] = self._connection_stats(self.async_client)
+        return counters
+
+    def close(self):
+        self.sync_client.close()
+
+    async def aclose(self):
+        await self.async_client.aclose()
+
+
+class GeminiClientRegistry:
+    """Thread-safe registry that hands out one shared GeminiClient per API key"""
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 60.0,
+        timeout: Optional[float] = None,
+        store_cache_ttl: float = 30.0
+    ):
+        """
+        Initialize the registry
+
+        Args:
+            max_connections: Maximum open connections per client (all traffic goes to one Gemini host)
+            max_keepalive_connections: Maximum idle connections kept alive for reuse
+            keepalive_expiry: Seconds an idle connection is kept before closing
+            timeout: Optional HTTP timeout in seconds (None = SDK default)
+            store_cache_ttl: Seconds each client caches FileSearchStore metadata
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = timeout
+        self.store_cache_ttl = store_cache_ttl
+        self._lock = threading.Lock()
+        self._clients: Dict[str, GeminiClient] = {}
+        self._http_clients: Dict[str, _PooledHttpClient] = {}
+        self.created_count = 0
+        self.reused_count = 0
+
+        logger.info(
+            f"GeminiClientRegistry initialized - max_connections: {max_connections}, "
+            f"max_keepalive: {max_keepalive_connections}, keepalive_expiry: {keepalive_expiry}s"
+        )
+
+    def get(self, api_key: str) -> GeminiClient:
+        """
+        Return the shared GeminiClient for an API key, creating it on first use
+
+        Args:
+            api_key: Google AI API key
+
+        Returns:
+            Shared GeminiClient instance
+        """
+        key = api_key or ''
+        client = self._clients.get(key)
+        if client is not None:
+            with self._lock:
+                self.reused_count += 1
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.reused_count += 1
+                return client
+
+            http_client = _PooledHttpClient(self.limits, self.timeout)
+            http_options = types.HttpOptions(
+                httpx_client=http_client.sync_client,
+                httpx_async_client=http_client.async_client
+            )
+            client = GeminiClient(api_key, http_options=http_options, store_cache_ttl=self.store_cache_ttl)
+
+            self._http_clients[key] = http_client
+            self._clients[key] = client
+            self.created_count += 1
+            logger.info(f"Pooled GeminiClient created (total: {len(self._clients)})")
+            return client
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics for sizing the connection limits
+
+        Returns:
+            Dict with limits, client counts and per-client connection statistics
+        """
+        with self._lock:
+            http_clients = list(self._http_clients.values())
+            created_count = self.created_count
+            reused_count = self.reused_count
+
+        return {
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry
+            },
+            "clients": len(http_clients),
+            "clients_created": created_count,
+            "clients_reused": reused_count,
+            "pools": [http_client.stats() for http_client in http_clients]
+        }
+
+    def close(self):
+        """Close all pooled HTTP connections"""
+        with self._lock:
+            for http_client in self._http_clients.values():
+                try:
+                    http_client.close()
+                except Exception as e:
+                    logger.warning(f"Error closing pooled HTTP client: {e}")
+            self._http_clients.clear()
+            self._clients.clear()
+        logger.info("GeminiClientRegistry closed")
+
+    async def aclose(self):
+        """Close all pooled HTTP connections, including the async pools (asyncio serving mode)"""
+        with self._lock:
+            http_clients = list(self._http_clients.values())
+        for http_client in http_clients:
+            try:
+                await http_client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing pooled async HTTP client: {e}")
+        self.close()
@@ -1,7 +1,8 @@
 import sqlite3
 import os
+import threading
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 from app.logger import get_logger
 
 logger = get_logger()
@@ -11,36 +12,133 @@ DB_DIR = Path(__file__).parent.parent / 'data'
 DB_DIR.mkdir(exist_ok=True)
 DB_PATH = DB_DIR / 'document_mappings.db'
 
-def init_db():
-    """Initialize the database and create tables if they don't exist"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+# Bound parameters per IN (...) query (SQLite builds before 3.32 allow at most 999)
+SQLITE_MAX_PARAMS = 900
 
-        # Create document_mappings table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS document_mappings (
-                document_name TEXT PRIMARY KEY,
-                original_filename TEXT NOT NULL,
-                file_id TEXT,
-                store_name TEXT,
-                category TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+# Connection tuning
+DB_BUSY_TIMEOUT_MS = 5000         # Wait this long for a competing writer instead of failing with "database is locked"
+DB_CACHE_SIZE_KB = 8192           # Page cache per connection
+DB_STATEMENT_CACHE_SIZE = 128     # Prepared statements kept per connection
 
-        # Create config table for storing application settings
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS config (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+_local = threading.local()
 
-        conn.commit()
+# Read-through config cache (key -> value, None for missing keys)
+_config_cache: Dict[str, Optional[str]] = {}
+_config_cache_lock = threading.Lock()
+_config_generation = 0
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Get the calling thread's database connection, opening it on first use
+
+    Connections are kept per thread (and per process, so the scheduler and
+    forked workers never share one) instead of being opened for every query.
+    That lets sqlite3 reuse its prepared statements. The database runs in WAL
+    mode, so readers do not block the single writer and concurrent uploads
+    and searches no longer serialize on the file lock.
+
+    Returns:
+        sqlite3.Connection for the current thread
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.pid == os.getpid() and _local.path == DB_PATH:
+        return conn
+
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        cached_statements=DB_STATEMENT_CACHE_SIZE
+    )
+    conn.execute('PRAGMA journal_mode=WAL')
+    # NORMAL is durable across application crashes in WAL mode and avoids an fsync per commit
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA cache_size=-{DB_CACHE_SIZE_KB}')
+    conn.execute(f'PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}')
+    conn.execute('PRAGMA temp_store=MEMORY')
+
+    _local.conn = conn
+    _local.pid = os.getpid()
+    _local.path = DB_PATH
+    _local.data_version = None
+    return conn
+
+def close_connection():
+    """Close the calling thread's database connection, if any"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.pid == os.getpid():
         conn.close()
-        logger.info(f"Database initialized at {DB_PATH}")
+    _local.conn = None
+
+# Schema migrations: (version, description, statements), applied in order by init_db().
+# The applied version is recorded in PRAGMA user_version. Append new migrations
+# with the next version number; never edit one that has shipped.
+MIGRATIONS = [
+    (1, 'Create base tables', [
+        '''
+        CREATE TABLE IF NOT EXISTS document_mappings (
+            document_name TEXT PRIMARY KEY,
+            original_filename TEXT NOT NULL,
+            file_id TEXT,
+            store_name TEXT,
+            category TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Config table for storing application settings
+        '''
+        CREATE TABLE IF NOT EXISTS config (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Store versions (bumped whenever a store's documents change)
+        '''
+        CREATE TABLE IF NOT EXISTS store_versions (
+            store_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ]),
+    (2, 'Index document_mappings by store/category and store/created_at', [
+        'CREATE INDEX IF NOT EXISTS idx_document_mappings_store_category ON document_mappings (store_name, category)',
+        'CREATE INDEX IF NOT EXISTS idx_document_mappings_store_created ON document_mappings (store_name, created_at)',
+    ]),
+]
+
+def get_schema_version() -> int:
+    """
+    Get the applied schema version
+
+    Returns:
+        Version of the last applied migration (0 for a new database)
+    """
+    return get_connection().execute('PRAGMA user_version').fetchone()[0]
+
+def init_db():
+    """Initialize the database and apply pending schema migrations"""
+    try:
+        conn = get_connection()
+
+        # BEGIN IMMEDIATE serializes processes starting at the same time
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            current_version = conn.execute('PRAGMA user_version').fetchone()[0]
+            for version, description, statements in MIGRATIONS:
+                if version <= current_version:
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {version}')
+                logger.info(f"Applied database migration {version}: {description}")
+                current_version = version
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logger.info(f"Database initialized at {DB_PATH} (schema version {current_version})")
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}", exc_info=True)
         raise
@@ -60,17 +158,15 @@ def save_mapping(document_name: str, original_filename: str, file_id: Optional[s
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT OR REPLACE INTO document_mappings
-            (document_name, original_filename, file_id, store_name, category)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (document_name, original_filename, file_id, store_name, category))
-
-        conn.commit()
-        conn.close()
+        conn = get_connection()
+        with conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO document_mappings
+                (document_name, original_filename, file_id, store_name, category)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (document_name, original_filename, file_id, store_name, category))
         logger.info(f"Saved mapping: {document_name} -> {original_filename} (category: {category})")
         return True
     except Exception as e:
@@ -88,7 +184,7 @@ def get_mapping(document_name: str) -> Optional[str]:
         Original filename if found, None otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -97,7 +193,6 @@ def get_mapping(document_name: str) -> Optional[str]:
         ''', (document_name,))
 
         result = cursor.fetchone()
-        conn.close()
 
         if result:
             return result[0]
@@ -117,16 +212,14 @@ def delete_mapping(document_name: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            DELETE FROM document_mappings
-            WHERE document_name = ?
-        ''', (document_name,))
-
-        conn.commit()
-        conn.close()
+        conn = get_connection()
+        with conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                DELETE FROM document_mappings
+                WHERE document_name = ?
+            ''', (document_name,))
         logger.info(f"Deleted mapping: {document_name}")
         return True
     except Exception as e:
@@ -141,12 +234,11 @@ def get_all_mappings() -> Dict[str, str]:
         Dictionary of document_name -> original_filename
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
 
         cursor.execute('SELECT document_name, original_filename FROM document_mappings')
         results = cursor.fetchall()
-        conn.close()
 
         return {doc_name: filename for doc_name, filename in results}
     except Exception as e:
@@ -165,16 +257,15 @@ def set_config(key: str, value: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT OR REPLACE INTO config (key, value, updated_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-        ''', (key, value))
-
-        conn.commit()
-        conn.close()
+        conn = get_connection()
+        with conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO config (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            ''', (key, value))
+        invalidate_config_cache(key)
         logger.info(f"Config set: {key} = {value}")
         return True
     except Exception as e:
@@ -185,27 +276,67 @@ def get_config(key: str) -> Optional[str]:
     """
     Get a configuration value
 
+    Read-through cached. Before serving from the cache, the connection's
+    PRAGMA data_version is checked (an in-memory read, no table access).
+    SQLite changes it whenever another connection or process commits, so
+    changes from other workers or the admin page show up on the next read.
+    File mtime cannot be used in WAL mode, because commits only touch the
+    -wal file until a checkpoint.
+
     Args:
         key: Configuration key
 
     Returns:
         Configuration value if found, None otherwise
     """
+    global _config_generation
+
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
+
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        with _config_cache_lock:
+            if _local.data_version != data_version:
+                # Another connection committed since this thread last looked
+                _local.data_version = data_version
+                _config_cache.clear()
+                _config_generation += 1
+            elif key in _config_cache:
+                return _config_cache[key]
+            generation = _config_generation
+
         cursor = conn.cursor()
 
         cursor.execute('SELECT value FROM config WHERE key = ?', (key,))
         result = cursor.fetchone()
-        conn.close()
+        value = result[0] if result else None
 
-        if result:
-            return result[0]
-        return None
+        with _config_cache_lock:
+            # Skip caching if the cache was invalidated while reading
+            if generation == _config_generation:
+                _config_cache[key] = value
+
+        return value
     except Exception as e:
         logger.error(f"Error getting config: {str(e)}", exc_info=True)
         return None
 
+def invalidate_config_cache(key: Optional[str] = None):
+    """
+    Drop cached configuration values
+
+    Args:
+        key: Key to drop, or None to clear the whole cache
+    """
+    global _config_generation
+
+    with _config_cache_lock:
+        if key is None:
+            _config_cache.clear()
+        else:
+            _config_cache.pop(key, None)
+        _config_generation += 1
+
 def get_document_category(document_name: str) -> Optional[str]:
     """
     Get category for a document
@@ -217,12 +348,11 @@ def get_document_category(document_name: str) -> Optional[str]:
         Category if found, None otherwise
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
 
         cursor.execute('SELECT category FROM document_mappings WHERE document_name = ?', (document_name,))
         result = cursor.fetchone()
-        conn.close()
 
         if result:
             return result[0]
@@ -231,5 +361,129 @@ def get_document_category(document_name: str) -> Optional[str]:
         logger.error(f"Error getting document category: {str(e)}", exc_info=True)
         return None
 
+def get_documents_by_category(store_name: str, category: str) -> List[str]:
+    """
+    Get names of the documents of a category in a store
+
+    Args:
+        store_name: Store name (format: fileSearchStores/{id})
+        category: Document category
+
+    Returns:
+        List of document names (empty on error)
+    """
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT document_name FROM document_mappings
+            WHERE store_name = ? AND category = ?
+        ''', (store_name, category))
+
+        return [doc_name for (doc_name,) in cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Error getting documents by category: {str(e)}", exc_info=True)
+        return []
+
+def get_mappings_bulk(document_names: List[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+    """
+    Get original filenames and categories for many documents at once
+
+    Uses one connection and IN (...) queries chunked below SQLite's bound
+    parameter limit, instead of one get_mapping/get_document_category
+    round-trip per document.
+
+    Args:
+        document_names: List of full document names
+
+    Returns:
+        Dictionary of document_name -> (original_filename, category) for mapped documents
+    """
+    mappings = {}
+    unique_names = list(dict.fromkeys(document_names))
+    if not unique_names:
+        return mappings
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        for start in range(0, len(unique_names), SQLITE_MAX_PARAMS):
+            chunk = unique_names[start:start + SQLITE_MAX_PARAMS]
+            placeholders = ','.join('?' for _ in chunk)
+            cursor.execute(
+                f'SELECT document_name, original_filename, category FROM document_mappings WHERE document_name IN ({placeholders})',
+                chunk
+            )
+            mappings.update({doc_name: (filename, category) for doc_name, filename, category in cursor.fetchall()})
+
+        return mappings
+    except Exception as e:
+        logger.error(f"Error getting mappings in bulk: {str(e)}", exc_info=True)
+        return mappings
+
+def bump_store_version(store_name: str) -> bool:
+    """
+    Increment the version of a store after its documents changed
+
+    Shared through the database so that other processes (e.g. the data
+    updater scheduler) can invalidate answers cached by the web server.
+
+    Args:
+        store_name: Store name (format: fileSearchStores/{id})
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        conn = get_connection()
+        with conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT INTO store_versions (store_name, version, updated_at)
+                VALUES (?, 1, CURRENT_TIMESTAMP)
+                ON CONFLICT(store_name) DO UPDATE SET
+                    version = version + 1,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (store_name,))
+        logger.info(f"Store version bumped: {store_name}")
+        return True
+    except Exception as e:
+        logger.error(f"Error bumping store version: {str(e)}", exc_info=True)
+        return False
+
+def get_store_versions(store_names: List[str]) -> Dict[str, int]:
+    """
+    Get current versions of stores
+
+    Args:
+        store_names: List of store names
+
+    Returns:
+        Dictionary of store_name -> version (0 for stores never changed)
+    """
+    versions = {name: 0 for name in store_names}
+    if not store_names:
+        return versions
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        placeholders = ','.join('?' for _ in store_names)
+        cursor.execute(
+            f'SELECT store_name, version FROM store_versions WHERE store_name IN ({placeholders})',
+            list(store_names)
+        )
+        results = cursor.fetchall()
+
+        versions.update({name: version for name, version in results})
+        return versions
+    except Exception as e:
+        logger.error(f"Error getting store versions: {str(e)}", exc_info=True)
+        return versions
+
 # Initialize database on module import
 init_db()
@@ -0,0 +1,218 @@
+"""
+시설물 간 최단 거리 테이블
+모든 시설물(도로 노드에 스냅된 위치) 쌍의 최단 거리와 선행 노드를 미리 계산해
+.npz 파일로 저장하고, 시설물 이름 기반 길찾기를 탐색 없이 테이블 조회로 처리
+
+지도 데이터 옆에 미리 빌드:
+    python -m app.distance_table            # map/facility_distances.npz 생성
+    python -m app.distance_table --check    # 현재 지도 데이터와 일치하는지만 확인
+"""
+import argparse
+import hashlib
+import sys
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+from app.logger import get_logger
+
+logger = get_logger()
+
+# 저장 형식 버전 (배열 구성이 바뀌면 올려서 기존 파일을 무효화)
+TABLE_FORMAT_VERSION = 1
+
+DISTANCE_TABLE_FILENAME = 'facility_distances.npz'
+
+
+def compute_data_checksum(roads_path, facilities_path, calibration):
+    """
+    지도 데이터 체크섬 (테이블이 현재 데이터로 만들어졌는지 확인용)
+
+    Args:
+        roads_path: roads.geojson 경로
+        facilities_path: 시설물 JSON 경로
+        calibration: 좌표 보정값 튜플 (x_offset, y_offset, x_scale, y_scale)
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256(f"v{TABLE_FORMAT_VERSION}".encode())
+    for path in (roads_path, facilities_path):
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        digest.update(b'\0')
+    digest.update(repr(tuple(float(value) for value in calibration)).encode())
+    return digest.hexdigest()
+
+
+class FacilityDistanceTable:
+    """시설물 쌍별 최단 거리 + 경로 복원용 선행 노드 테이블"""
+
+    def __init__(self, checksum, facility_nodes, source_nodes, facility_rows, distances, predecessors):
+        """
+        초기화
+
+        Args:
+            checksum: 테이블을 만든 지도 데이터 체크섬
+            facility_nodes: (F,) 시설물별 스냅된 도로 노드 ID
+            source_nodes: (S,) 중복을 제거한 시설물 노드 ID (탐색 시작점)
+            facility_rows: (F,) 시설물별 source_nodes 행 번호
+            distances: (S, S) 시설물 노드 간 최단 거리 (연결되지 않으면 inf)
+            predecessors: (S, N) 시작점별 다익스트라 선행 노드 (-9999: 없음)
+        """
+        self.checksum = checksum
+        self.facility_nodes = facility_nodes
+        self.source_nodes = source_nodes
+        self.facility_rows = facility_rows
+        self.distances = distances
+        self.predecessors = predecessors
+
+    @classmethod
+    def build(cls, network, facility_nodes, checksum):
+        """
+        도로망에서 테이블 계산 (시작점 S개에 대해 다익스트라 1회씩, csgraph가 한 번에 처리)
+
+        Args:
+            network: RoadNetwork
+            facility_nodes: 시설물별 스냅된 도로 노드 ID 배열
+            checksum: 지도 데이터 체크섬
+        """
+        facility_nodes = np.asarray(facility_nodes, dtype=np.int32)
+        source_nodes, facility_rows = np.unique(facility_nodes, return_inverse=True)
+
+        all_distances, predecessors = dijkstra(
+            network.adjacency, directed=False, indices=source_nodes, return_predecessors=True
+        )
+        distances = all_distances[:, source_nodes]
+
+        logger.info(f"Facility distance table built: {len(facility_nodes)} facilities, {len(source_nodes)} source nodes")
+        return cls(
+            checksum,
+            facility_nodes,
+            source_nodes.astype(np.int32),
+            facility_rows.astype(np.int32),
+            distances,
+            predecessors.astype(np.int32)
+        )
+
+    @classmethod
+    def load(cls, path, checksum, node_count):
+        """
+        저장된 테이블 읽기
+
+        Args:
+            path: .npz 파일 경로
+            checksum: 현재 지도 데이터 체크섬
+            node_count: 현재 도로망 노드 수
+
+        Returns:
+            FacilityDistanceTable 또는 파일이 없거나 지도 데이터와 맞지 않으면 None
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                stored_checksum = str(data['checksum'])
+                if stored_checksum != checksum:
+                    logger.warning(f"Facility distance table is stale: {path} (run: python -m app.distance_table)")
+                    return None
+
+                table = cls(
+                    stored_checksum,
+                    data['facility_nodes'],
+                    data['source_nodes'],
+                    data['facility_rows'],
+                    data['distances'],
+                    data['predecessors']
+                )
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Failed to read facility distance table {path}: {e}")
+            return None
+
+        if table.predecessors.shape[1] != node_count:
+            logger.warning(f"Facility distance table node count mismatch: {path}")
+            return None
+
+        logger.info(f"Facility distance table loaded: {path}")
+        return table
+
+    def save(self, path):
+        """테이블을 .npz 파일로 저장"""
+        np.savez_compressed(
+            path,
+            checksum=np.array(self.checksum),
+            facility_nodes=self.facility_nodes,
+            source_nodes=self.source_nodes,
+            facility_rows=self.facility_rows,
+            distances=self.distances,
+            predecessors=self.predecessors
+        )
+        logger.info(f"Facility distance table saved: {path}")
+
+    @property
+    def nbytes(self):
+        """테이블 배열 메모리 사용량 (바이트)"""
+        return (self.facility_nodes.nbytes + self.source_nodes.nbytes + self.facility_rows.nbytes
+                + self.distances.nbytes + self.predecessors.nbytes)
+
+    def distance(self, start_index, end_index):
+        """시설물 인덱스 쌍의 최단 거리 (연결되지 않으면 inf)"""
+        return float(self.distances[self.facility_rows[start_index], self.facility_rows[end_index]])
+
+    def route(self, start_index, end_index):
+        """
+        시설물 인덱스 쌍의 최단 경로 (탐색 없이 선행 노드로 복원)
+
+        Args:
+            start_index: 출발 시설물 인덱스 (시설물 JSON 순서)
+            end_index: 도착 시설물 인덱스
+
+        Returns:
+            tuple: (노드 ID 배열, 경로 길이) 또는 연결되어 있지 않으면 None
+        """
+        row = self.facility_rows[start_index]
+        path_length = self.distances[row, self.facility_rows[end_index]]
+        if not np.isfinite(path_length):
+            return None
+
+        source = self.source_nodes[row]
+        predecessors = self.predecessors[row]
+        node = int(self.facility_nodes[end_index])
+        path = [node]
+        while node != source:
+            node = int(predecessors[node])
+            path.append(node)
+        path.reverse()
+        return np.array(path, dtype=np.int64), float(path_length)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시설물 간 최단 거리 테이블 빌드')
+    parser.add_argument('--map-dir', default='map', help='지도 데이터 디렉토리')
+    parser.add_argument('--check', action='store_true', help='빌드하지 않고 기존 테이블이 최신인지만 확인')
+    args = parser.parse_args()
+
+    # 순환 import 방지 (wayfinding 모듈이 이 모듈을 사용)
+    from app.wayfinding import WayfindingService
+
+    service = WayfindingService(map_dir=args.map_dir, use_distance_table=False)
+    G, _, _, _ = service.load_graph_data()
+    if not G:
+        print('지도 데이터를 불러올 수 없습니다.')
+        return 1
+
+    path = service.distance_table_path
+    checksum = service.get_data_checksum()
+    if args.check:
+        table = FacilityDistanceTable.load(path, checksum, len(service._network))
+        print(f"{path}: {'최신' if table is not None else '없음 또는 오래됨'}")
+        return 0 if table is not None else 1
+
+    table = service.build_distance_table()
+    table.save(path)
+    print(f"{path}: facilities={len(table.facility_nodes)} sources={len(table.source_nodes)} "
+          f"memory={table.nbytes / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+시설물 검색 인덱스
+시설물 목록을 로드할 때 한 번 만들어 이름/카테고리/좌표/이름 부분 문자열 검색을
+시설물 전체를 훑지 않고 처리
+"""
+import threading
+import numpy as np
+from scipy.spatial import KDTree
+
+
+class FacilityIndex:
+    """이름 dict + 카테고리별 목록/KDTree + 전체 KDTree + 이름 n-gram 역색인 (KDTree는 최초 검색 시 생성)"""
+
+    # 이름 부분 문자열 검색용 n-gram 길이 (한글 시설물 이름 패턴이 대부분 2글자 이상)
+    NGRAM = 2
+
+    # 최근접 검색 시 거리가 같은 시설물을 가리기 위해 함께 조회할 후보 수
+    TIE_CANDIDATES = 4
+
+    # 지도 번들에 저장하는 역색인 (이름 -> 속성)
+    POSTINGS = {'category': 'by_category', 'unigram': '_unigrams', 'ngram': '_ngrams'}
+
+    def __init__(self, facilities, coords=None, postings=None):
+        """
+        초기화
+
+        Args:
+            facilities: 시설물 dict 리스트 (name, x, y, category 포함)
+            coords: (N, 2) 시설물 좌표 (지도 번들에 저장된 값, None이면 계산)
+            postings: POSTINGS 이름 -> {키: 인덱스 배열} (지도 번들에 저장된 값, None이면 계산)
+        """
+        self.facilities = facilities
+        if coords is None:
+            coords = np.array([(f['x'], f['y']) for f in facilities], dtype=np.float64).reshape(len(facilities), 2)
+        self.coords = coords
+
+        # 이름 -> 인덱스 (같은 이름이 여러 개면 첫 번째, 기존 선형 검색과 동일)
+        self.by_name = {}
+        for i, facility in enumerate(facilities):
+            self.by_name.setdefault(facility.get('name', ''), i)
+
+        if postings is None:
+            postings = self._build_postings(facilities)
+        self.by_category = postings['category']
+        # n-gram -> 인덱스 목록 (1글자 패턴용 unigram 포함)
+        self._unigrams = postings['unigram']
+        self._ngrams = postings['ngram']
+        self._empty = np.empty(0, dtype=np.int64)
+
+        # 전체/카테고리별 KDTree (최초 최근접 검색 시 생성)
+        self._tree_lock = threading.Lock()
+        self._tree = None
+        self._category_trees = {}
+
+    @classmethod
+    def _build_postings(cls, facilities):
+        """카테고리/unigram/n-gram -> 시설물 인덱스 배열"""
+        categories = {}
+        unigrams = {}
+        ngrams = {}
+        for i, facility in enumerate(facilities):
+            name = facility.get('name', '')
+            categories.setdefault(facility.get('category'), []).append(i)
+            for char in set(name):
+                unigrams.setdefault(char, []).append(i)
+            for gram in {name[j:j + cls.NGRAM] for j in range(len(name) - cls.NGRAM + 1)}:
+                ngrams.setdefault(gram, []).append(i)
+
+        return {
+            name: {key: np.array(indices, dtype=np.int64) for key, indices in table.items()}
+            for name, table in (('category', categories), ('unigram', unigrams), ('ngram', ngrams))
+        }
+
+    @classmethod
+    def from_arrays(cls, facilities, arrays, keys):
+        """
+        to_arrays()로 저장한 배열로 인덱스 생성 (역색인 목록은 지도 번들 배열의 뷰, 복사 없음)
+
+        Args:
+            facilities: 시설물 dict 리스트
+            arrays: 이름 -> 배열 ('coords'와 POSTINGS 이름별 '<이름>_offsets', '<이름>_items')
+            keys: POSTINGS 이름 -> 키 목록 (offsets 순서)
+        """
+        postings = {}
+        for name in cls.POSTINGS:
+            offsets, items = arrays[f'{name}_offsets'], arrays[f'{name}_items']
+            postings[name] = {key: items[offsets[i]:offsets[i + 1]] for i, key in enumerate(keys[name])}
+        return cls(facilities, coords=arrays['coords'], postings=postings)
+
+    def to_arrays(self):
+        """
+        지도 번들에 저장할 배열과 역색인 키 (역색인은 키 목록 + CSR offsets/items)
+
+        Returns:
+            tuple: (이름 -> 배열, POSTINGS 이름 -> 키 목록)
+        """
+        arrays = {'coords': self.coords}
+        keys = {}
+        for name, attr in self.POSTINGS.items():
+            table = getattr(self, attr)
+            keys[name] = list(table)
+            lengths = [len(indices) for indices in table.values()]
+            arrays[f'{name}_offsets'] = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))).astype(np.int64)
+            arrays[f'{name}_items'] = np.concatenate(list(table.values())) if table else self._empty
+        return arrays, keys
+
+    @property
+    def tree(self):
+        """전체 시설물 좌표 KDTree (시설물이 없으면 None)"""
+        if self._tree is None and len(self.facilities):
+            with self._tree_lock:
+                if self._tree is None:
+                    self._tree = KDTree(self.coords)
+        return self._tree
+
+    def _category_tree(self, category):
+        """카테고리 시설물 좌표 KDTree (해당 카테고리가 없으면 None)"""
+        tree = self._category_trees.get(category)
+        if tree is None:
+            indices = self.by_category.get(category)
+            if indices is None:
+                return None
+            with self._tree_lock:
+                tree = self._category_trees.setdefault(category, KDTree(self.coords[indices]))
+        return tree
+
+    def __len__(self):
+        return len(self.facilities)
+
+    def find_by_name(self, name):
+        """이름이 정확히 일치하는 시설물 (인덱스, 시설물) 또는 (None, None)"""
+        index = self.by_name.get(name)
+        if index is None:
+            return None, None
+        return index, self.facilities[index]
+
+    def search_name(self, pattern):
+        """
+        이름에 pattern이 포함된 시설물 인덱스 (오름차순)
+
+        pattern의 n-gram 역색인 목록을 교집합한 후보만 실제 문자열로 확인합니다.
+        """
+        if not pattern:
+            return np.arange(len(self.facilities), dtype=np.int64)
+
+        if len(pattern) < self.NGRAM:
+            return self._unigrams.get(pattern, self._empty)
+
+        candidates = None
+        # 짧은 역색인 목록부터 교집합
+        postings = sorted(
+            (self._ngrams.get(pattern[j:j + self.NGRAM], self._empty) for j in range(len(pattern) - self.NGRAM + 1)),
+            key=len
+        )
+        for posting in postings:
+            candidates = posting if candidates is None else np.intersect1d(candidates, posting, assume_unique=True)
+            if not len(candidates):
+                return self._empty
+
+        if len(pattern) == self.NGRAM:
+            return candidates
+        return np.array([i for i in candidates.tolist() if pattern in self.facilities[i].get('name', '')], dtype=np.int64)
+
+    def match(self, category=None, name_pattern=None):
+        """name_pattern이 있으면 이름 검색, 없으면 카테고리로 시설물 인덱스 조회"""
+        if name_pattern:
+            return self.search_name(name_pattern)
+        return self.by_category.get(category, self._empty)
+
+    def nearest(self, x, y, max_distance=np.inf, category=None):
+        """
+        직선 거리로 가장 가까운 시설물
+
+        Args:
+            x, y: 좌표
+            max_distance: 최대 거리 (이 거리까지 포함)
+            category: 지정하면 해당 카테고리 안에서만 검색
+
+        Returns:
+            tuple: (인덱스, 거리) 또는 max_distance 안에 없으면 (None, None)
+        """
+        if category is None:
+            tree, indices = self.tree, None
+        else:
+            tree, indices = self._category_tree(category), self.by_category.get(category)
+        if tree is None:
+            return None, None
+
+        # KDTree의 distance_upper_bound는 경계값을 제외하므로 바로 다음 실수로 올림
+        bound = np.nextafter(max_distance, np.inf) if np.isfinite(max_distance) else np.inf
+        distances, found = tree.query((x, y), k=min(self.TIE_CANDIDATES, tree.n), distance_upper_bound=bound)
+        distances, found = np.atleast_1d(distances), np.atleast_1d(found)
+        if not np.isfinite(distances[0]):
+            return None, None
+
+        # 같은 좌표의 시설물이 여러 개면 목록 순서가 빠른 시설물 (기존 선형 검색과 동일)
+        tied = found[distances <= distances[0]]
+        if indices is not None:
+            tied = indices[tied]
+        return int(tied.min()), float(distances[0])
+
+    def nearest_among(self, x, y, indices):
+        """indices 중 직선 거리로 가장 가까운 시설물 (인덱스, 거리) 또는 (None, None)"""
+        if not len(indices):
+            return None, None
+        distances = np.hypot(self.coords[indices, 0] - x, self.coords[indices, 1] - y)
+        best = int(np.argmin(distances))
+        return int(indices[best]), float(distances[best])
@@ -4,28 +4,77 @@ Implements FileSearchStore API for document search and retrieval
 """
 from google import genai
 from google.genai import types
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
+import threading
+import time
 from pathlib import Path
 from app.logger import get_logger
-from app.db import save_mapping, get_mapping, delete_mapping
+from app.db import save_mapping, get_mappings_bulk, delete_mapping
+
+# System instruction for the park guide chatbot (FileSearch answers)
+FILE_SEARCH_SYSTEM_INSTRUCTION = '''너는 올림픽공원 안내 도우미 '백호돌이'야. 친절하고 명랑한 말투를 사용해. 모르는 정보는 지어내지 말고 모른다고 해
+
+                        [작성 규칙]
+                        1. 질문과 직접적인 관련이 없는 부가적인 맥락(이유, 배경, 과거 히스토리, 향후 계획 등)은 답변에서 제거해라.
+                        2. 검색된 텍스트(Chunk)를 그대로 복사해서 붙여넣지 말고, 질문에 맞춰 자연스럽고 필요없는 정보를 제공하지 않도록 재구성해라.
+                        3. date를 비교하여 최신정보를 기준으로 판단해라.
+                        4. 이전 대화 내역을 참고하여 문맥에 맞는 답변을 제공해라.
+                        5. 입력 언어를 인식하고 입력언어와 동일한 언어를 답변해라.
+                        6. 한국체육산업개발 주식회사의 보안에 위협이 될만한 답변은 생성하지 말아라
+                        
+                        [컨셉]
+                        긍정적이고 현재를 즐기는 ESFP
+                        운동이 좋아, 사람이 좋아!
+                        크고 소중한 올림픽공원 토박이
+
+                        서울올림픽기념 국민체육진흥공단 의 공식 마스코트이다.
+
+                        산책을 좋아해서, 올림픽공원에 자주 출몰한다.
+
+                        올림픽공원에서 태어나 서울살이 중인 1인 가구 프로자취러이지만,
+                        숨겨진 정체는 1988 서울 올림픽 마스코트 호돌이의 마법으로 
+                        세계평화의 문에서 깨어난 스포츠 수호사신(四神)백호 이다.
+                        관심받는 것을 은근히 좋아한다.
+                        활발하게 뛰어다니기를 좋아하고 이곳 저곳 탐험하기를 즐긴다.
+
+                        내면에 열정을 간직하고 있고 매사에 긍정적이다.
+                        가끔 실수할 때도 있지만, 다양한 분야에 관심이 많아 항상 열심히 도전한다.
+                        
+                        슬로건 : 튼튼하게 탄탄하게 든든하게
+
+                        좋아하는 것
+                        올림픽공원, 운동, SNS업데이트, 사람, 관심, 치팅데이[3], 주황색[4]
+                        싫어하는 것
+                        올림픽공원의 쓰레기, 곶감
+                        싫어하는 것에는 예민하게 반응한다.
+                        '''
 
 
 class GeminiClient:
     """Client for interacting with Gemini API using google.genai SDK"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_options: Optional[types.HttpOptions] = None, store_cache_ttl: float = 30.0):
         """
         Initialize Gemini client with API key
 
         Args:
             api_key: Google AI API key for authentication
+            http_options: Optional HTTP options (e.g. shared pooled httpx clients)
+            store_cache_ttl: Seconds store metadata is cached (0 disables the cache)
         """
         self.api_key = api_key
         self.logger = get_logger()
 
+        # Short-lived FileSearchStore metadata cache: store_name -> (expires_at, store_info)
+        self.store_cache_ttl = store_cache_ttl
+        self._store_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._store_cache_lock = threading.Lock()
+
         # Configure the client with API key
-        self.client = genai.Client(api_key=api_key)        
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
         self.logger.info("GeminiClient initialized successfully")
 
 
@@ -77,17 +126,10 @@ class GeminiClient:
             store_list = []
 
             for store in stores:
-                store_info = {
-                    "store_name": store.name,
-                    "display_name": store.display_name,
-                    "create_time": str(store.create_time) if hasattr(store, 'create_time') else None,
-                    "update_time": str(store.update_time) if hasattr(store, 'update_time') else None,
-                    "active_documents_count": int(store.active_documents_count) if (hasattr(store, 'active_documents_count') and store.active_documents_count is not None) else 0,
-                    "pending_documents_count": int(store.pending_documents_count) if (hasattr(store, 'pending_documents_count') and store.pending_documents_count is not None) else 0,
-                    "failed_documents_count": int(store.failed_documents_count) if (hasattr(store, 'failed_documents_count') and store.failed_documents_count is not None) else 0,
-                    "size_bytes": int(store.size_bytes) if (hasattr(store, 'size_bytes') and store.size_bytes is not None) else 0
-                }
-                store_list.append(store_info)
+                store_list.append(self._store_to_dict(store))
+
+            for store_info in store_list:
+                self._cache_store({"success": True, **store_info})
 
             self.logger.info(f"Found {len(store_list)} FileSearchStores")
             return {
@@ -103,33 +145,92 @@ class GeminiClient:
                 "stores": []
             }
 
-    def get_file_search_store(self, store_name: str) -> Dict[str, Any]:
+    def get_file_search_store(self, store_name: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Get a specific FileSearchStore by name
 
         Args:
             store_name: Name of the store to retrieve
+            use_cache: If True, serve recently fetched metadata from the store cache
 
         Returns:
             Dict with success status and store information
         """
+        if use_cache:
+            cached = self._get_cached_store(store_name)
+            if cached is not None:
+                return cached
+
         try:
             self.logger.info(f"Getting FileSearchStore: {store_name}")
 
             store = self.client.file_search_stores.get(name=store_name)
 
             self.logger.info(f"FileSearchStore retrieved successfully: {store_name}")
+            return self._cache_store({"success": True, **self._store_to_dict(store)})
+        except Exception as e:
+            self.logger.error(f"Error getting FileSearchStore {store_name}: {str(e)}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    async def list_file_search_stores_async(self) -> Dict[str, Any]:
+        """
+        List all FileSearchStores (asyncio twin of list_file_search_stores)
+
+        Returns:
+            Dict with success status and list of stores
+        """
+        try:
+            self.logger.info("Listing all FileSearchStores (async)")
+
+            stores = await self.client.aio.file_search_stores.list()
+            store_list = []
+
+            async for store in stores:
+                store_list.append(self._store_to_dict(store))
+
+            for store_info in store_list:
+                self._cache_store({"success": True, **store_info})
+
+            self.logger.info(f"Found {len(store_list)} FileSearchStores")
             return {
                 "success": True,
-                "store_name": store.name,
-                "display_name": store.display_name,
-                "create_time": str(store.create_time) if hasattr(store, 'create_time') else None,
-                "update_time": str(store.update_time) if hasattr(store, 'update_time') else None,
-                "active_documents_count": int(store.active_documents_count) if (hasattr(store, 'active_documents_count') and store.active_documents_count is not None) else 0,
-                "pending_documents_count": int(store.pending_documents_count) if (hasattr(store, 'pending_documents_count') and store.pending_documents_count is not None) else 0,
-                "failed_documents_count": int(store.failed_documents_count) if (hasattr(store, 'failed_documents_count') and store.failed_documents_count is not None) else 0,
-                "size_bytes": int(store.size_bytes) if (hasattr(store, 'size_bytes') and store.size_bytes is not None) else 0
+                "stores": store_list,
+                "count": len(store_list)
             }
+        except Exception as e:
+            self.logger.error(f"Error listing FileSearchStores: {str(e)}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e),
+                "stores": []
+            }
+
+    async def get_file_search_store_async(self, store_name: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Get a specific FileSearchStore by name (asyncio twin of get_file_search_store)
+
+        Args:
+            store_name: Name of the store to retrieve
+            use_cache: If True, serve recently fetched metadata from the store cache
+
+        Returns:
+            Dict with success status and store information
+        """
+        if use_cache:
+            cached = self._get_cached_store(store_name)
+            if cached is not None:
+                return cached
+
+        try:
+            self.logger.info(f"Getting FileSearchStore (async): {store_name}")
+
+            store = await self.client.aio.file_search_stores.get(name=store_name)
+
+            self.logger.info(f"FileSearchStore retrieved successfully: {store_name}")
+            return self._cache_store({"success": True, **self._store_to_dict(store)})
         except Exception as e:
             self.logger.error(f"Error getting FileSearchStore {store_name}: {str(e)}", exc_info=True)
             return {
@@ -137,6 +238,120 @@ class GeminiClient:
                 "error": str(e)
             }
 
+    def get_file_search_stores(self, store_names: List[str], max_workers: int = 8) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several FileSearchStores at once
+
+        Cached entries are served directly; the rest are fetched concurrently
+        with a bounded thread pool instead of one round-trip after another.
+
+        Args:
+            store_names: Names of the stores to retrieve
+            max_workers: Maximum concurrent API requests
+
+        Returns:
+            Dict of store_name -> result of get_file_search_store
+        """
+        unique_names = list(dict.fromkeys(store_names))
+        results = {}
+        missing = []
+        for store_name in unique_names:
+            cached = self._get_cached_store(store_name)
+            if cached is not None:
+                results[store_name] = cached
+            else:
+                missing.append(store_name)
+
+        if missing:
+            self.logger.info(f"Fetching {len(missing)} FileSearchStores concurrently ({len(results)} cached)")
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+                fetched = executor.map(lambda name: self.get_file_search_store(name, use_cache=False), missing)
+                results.update(zip(missing, fetched))
+
+        return results
+
+    async def get_file_search_stores_async(self, store_names: List[str], max_workers: int = 8) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several FileSearchStores at once (asyncio twin of get_file_search_stores)
+
+        Cached entries are served directly; the rest are fetched concurrently,
+        at most max_workers at a time like the thread pool of the sync version.
+
+        Args:
+            store_names: Names of the stores to retrieve
+            max_workers: Maximum concurrent API requests
+
+        Returns:
+            Dict of store_name -> result of get_file_search_store_async
+        """
+        unique_names = list(dict.fromkeys(store_names))
+        results = {}
+        missing = []
+        for store_name in unique_names:
+            cached = self._get_cached_store(store_name)
+            if cached is not None:
+                results[store_name] = cached
+            else:
+                missing.append(store_name)
+
+        if missing:
+            self.logger.info(f"Fetching {len(missing)} FileSearchStores concurrently ({len(results)} cached, async)")
+            semaphore = asyncio.Semaphore(max(1, min(max_workers, len(missing))))
+
+            async def fetch(name):
+                async with semaphore:
+                    return await self.get_file_search_store_async(name, use_cache=False)
+
+            fetched = await asyncio.gather(*(fetch(name) for name in missing))
+            results.update(zip(missing, fetched))
+
+        return results
+
+    def invalidate_store_cache(self, store_name: Optional[str] = None):
+        """
+        Drop cached store metadata
+
+        Args:
+            store_name: Store to drop, or None to clear the whole cache
+        """
+        with self._store_cache_lock:
+            if store_name is None:
+                self._store_cache.clear()
+            else:
+                self._store_cache.pop(store_name, None)
+
+    def _get_cached_store(self, store_name: str) -> Optional[Dict[str, Any]]:
+        """Return cached store metadata if still fresh"""
+        with self._store_cache_lock:
+            entry = self._store_cache.get(store_name)
+            if entry is None:
+                return None
+            expires_at, store_info = entry
+            if expires_at <= time.monotonic():
+                del self._store_cache[store_name]
+                return None
+            return dict(store_info)
+
+    def _cache_store(self, store_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache successful store metadata and return it"""
+        if self.store_cache_ttl > 0 and store_info.get("success"):
+            with self._store_cache_lock:
+                self._store_cache[store_info["store_name"]] = (time.monotonic() + self.store_cache_ttl, dict(store_info))
+        return store_info
+
+    def _store_to_dict(self, store) -> Dict[str, Any]:
+        """Convert a FileSearchStore object to the API response format"""
+        return {
+            "store_name": store.name,
+            "display_name": store.display_name,
+            "create_time": str(store.create_time) if hasattr(store, 'create_time') else None,
+            "update_time": str(store.update_time) if hasattr(store, 'update_time') else None,
+            "active_documents_count": int(store.active_documents_count) if (hasattr(store, 'active_documents_count') and store.active_documents_count is not None) else 0,
+            "pending_documents_count": int(store.pending_documents_count) if (hasattr(store, 'pending_documents_count') and store.pending_documents_count is not None) else 0,
+            "failed_documents_count": int(store.failed_documents_count) if (hasattr(store, 'failed_documents_count') and store.failed_documents_count is not None) else 0,
+            "size_bytes": int(store.size_bytes) if (hasattr(store, 'size_bytes') and store.size_bytes is not None) else 0
+        }
+
     def delete_file_search_store(self, store_name: str) -> Dict[str, Any]:
         """
         Delete a FileSearchStore
@@ -151,6 +366,7 @@ class GeminiClient:
             self.logger.info(f"Deleting FileSearchStore: {store_name}")
 
             self.client.file_search_stores.delete(name=store_name)
+            self.invalidate_store_cache(store_name)
 
             self.logger.info(f"FileSearchStore deleted successfully: {store_name}")
             return {
@@ -183,24 +399,15 @@ class GeminiClient:
                 parent=store_name
             )
 
-            document_list = []
-            for idx, doc in enumerate(documents):
-                # Try to get original filename and category from mapping
-                from app.db import get_document_category
-
-                self.logger.debug(f"Document {idx}: name={doc.name}")
-                self.logger.debug(f"Document {idx}: has display_name={hasattr(doc, 'display_name')}")
-                if hasattr(doc, 'display_name'):
-                    self.logger.debug(f"Document {idx}: display_name={doc.display_name}")
-
-                original_filename = get_mapping(doc.name)
-                self.logger.debug(f"Document {idx}: get_mapping returned={original_filename}")
+            # Fetch every page first so mappings are resolved with one bulk query
+            documents = list(documents)
+            mappings = get_mappings_bulk([doc.name for doc in documents])
 
-                category = get_document_category(doc.name)
-                self.logger.debug(f"Document {idx}: get_document_category returned={category}")
-
-                display_name = original_filename if original_filename else (doc.display_name if hasattr(doc, 'display_name') else None)
-                self.logger.debug(f"Document {idx}: final display_name={display_name}")
+            document_list = []
+            for doc in documents:
+                # Original filename and category from mapping (fallback: API display_name)
+                original_filename, category = mappings.get(doc.name, (None, None))
+                display_name = original_filename if original_filename else getattr(doc, 'display_name', None)
 
                 doc_info = {
                     "document_name": doc.name,
@@ -250,6 +457,7 @@ class GeminiClient:
 
             # Delete mapping from database
             delete_mapping(document_name)
+            self.invalidate_store_cache(document_name.split('/documents/')[0])
 
             self.logger.info(f"Document deleted successfully: {document_name}")
             return {
@@ -312,6 +520,7 @@ class GeminiClient:
                     errors.append(error_msg)
                     self.logger.error(error_msg)
 
+            self.invalidate_store_cache(store_name)
             self.logger.info(f"Deletion complete: {deleted_count} deleted, {failed_count} failed")
 
             return {
@@ -402,6 +611,7 @@ class GeminiClient:
                 file_name=file_id
             )
 
+            self.invalidate_store_cache(store_name)
             self.logger.info(f"File imported successfully to store {store_name}")
             self.logger.info(f"Result type: {type(result)}")
             self.logger.info(f"Result has 'name' attribute: {hasattr(result, 'name')}")
@@ -627,97 +837,256 @@ class GeminiClient:
             self.logger.debug(f"Metadata filter: {metadata_filter}")
             self.logger.debug(f"History length: {len(history) if history else 0}")
 
-            sys_inst = '''너는 올림픽공원 안내 도우미 '백호돌이'야. 친절하고 명랑한 말투를 사용해. 모르는 정보는 지어내지 말고 모른다고 해
-
-                        [작성 규칙]
-                        1. 질문과 직접적인 관련이 없는 부가적인 맥락(이유, 배경, 과거 히스토리, 향후 계획 등)은 답변에서 제거해라.
-                        2. 검색된 텍스트(Chunk)를 그대로 복사해서 붙여넣지 말고, 질문에 맞춰 자연스럽고 필요없는 정보를 제공하지 않도록 재구성해라.
-                        3. date를 비교하여 최신정보를 기준으로 판단해라.
-                        4. 이전 대화 내역을 참고하여 문맥에 맞는 답변을 제공해라.
-                        5. 입력 언어를 인식하고 입력언어와 동일한 언어를 답변해라.
-                        6. 한국체육산업개발 주식회사의 보안에 위협이 될만한 답변은 생성하지 말아라
-                        
-                        [컨셉]
-                        긍정적이고 현재를 즐기는 ESFP
-                        운동이 좋아, 사람이 좋아!
-                        크고 소중한 올림픽공원 토박이
+            contents = self._build_search_contents(query, history)
 
-                        서울올림픽기념 국민체육진흥공단 의 공식 마스코트이다.
+            # Generate content with FileSearch tool
+            response = self.client.models.generate_content(
+                model=model,
+                contents=contents,
+                config=self._build_file_search_config(store_names)
+            )
 
-                        산책을 좋아해서, 올림픽공원에 자주 출몰한다.
+            return self._build_search_result(query, response, store_names, model)
+        except Exception as e:
+            self.logger.error(f"Error in FileSearch: {str(e)}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e),
+                "query": query
+            }
 
-                        올림픽공원에서 태어나 서울살이 중인 1인 가구 프로자취러이지만,
-                        숨겨진 정체는 1988 서울 올림픽 마스코트 호돌이의 마법으로 
-                        세계평화의 문에서 깨어난 스포츠 수호사신(四神)백호 이다.
-                        관심받는 것을 은근히 좋아한다.
-                        활발하게 뛰어다니기를 좋아하고 이곳 저곳 탐험하기를 즐긴다.
+    async def search_with_file_search_async(
+        self,
+        query: str,
+        store_names: List[str],
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        model: str = "gemini-2.5-flash",
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Search using FileSearch tool (asyncio twin of search_with_file_search)
 
-                        내면에 열정을 간직하고 있고 매사에 긍정적이다.
-                        가끔 실수할 때도 있지만, 다양한 분야에 관심이 많아 항상 열심히 도전한다.
-                        
-                        슬로건 : 튼튼하게 탄탄하게 든든하게
+        Args:
+            query: Search query
+            store_names: List of FileSearchStore names to search in
+            metadata_filter: Optional metadata filter for search
+            model: Model to use for search (default: gemini-2.5-flash)
+            history: Optional conversation history (list of {"role": "user"/"model", "parts": [text]})
 
-                        좋아하는 것
-                        올림픽공원, 운동, SNS업데이트, 사람, 관심, 치팅데이[3], 주황색[4]
-                        싫어하는 것
-                        올림픽공원의 쓰레기, 곶감
-                        싫어하는 것에는 예민하게 반응한다.
-                        '''
+        Returns:
+            Dict with success status and search results
+        """
+        try:
+            self.logger.info(f"Searching with FileSearch in stores (async): {store_names}")
+            self.logger.debug(f"Query: {query}")
+            self.logger.debug(f"Metadata filter: {metadata_filter}")
+            self.logger.debug(f"History length: {len(history) if history else 0}")
 
-            # Build conversation contents with history
-            # Convert history to proper format if it exists
-            contents = []
-            if history:
-                for msg in history:
-                    role = msg.get('role', 'user')
-                    parts = msg.get('parts', [])
-                    # Create proper Content object
-                    if isinstance(parts, list) and len(parts) > 0:
-                        text_content = parts[0] if isinstance(parts[0], str) else str(parts[0])
-                        contents.append(types.Content(role=role, parts=[types.Part(text=text_content)]))
-
-            # Add current query
-            contents.append(types.Content(role='user', parts=[types.Part(text=query)]))
+            contents = self._build_search_contents(query, history)
 
-            # Generate content with FileSearch tool
-            response = self.client.models.generate_content(
+            response = await self.client.aio.models.generate_content(
                 model=model,
                 contents=contents,
-                config=types.GenerateContentConfig(
-                    system_instruction=sys_inst,
-                    tools=[
-                        types.Tool(
-                            file_search=types.FileSearch(
-                                file_search_store_names=store_names
-                            )
-                        )
-                    ],
-                    temperature=0.3
+                config=self._build_file_search_config(store_names)
+            )
 
-                )
+            return self._build_search_result(query, response, store_names, model)
+        except Exception as e:
+            self.logger.error(f"Error in FileSearch: {str(e)}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e),
+                "query": query
+            }
+
+    def stream_search_with_file_search(
+        self,
+        query: str,
+        store_names: List[str],
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        model: str = "gemini-2.5-flash",
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Search using FileSearch tool and yield the answer as it is generated
+
+        Args:
+            query: Search query
+            store_names: List of FileSearchStore names to search in
+            metadata_filter: Optional metadata filter for search
+            model: Model to use for search (default: gemini-2.5-flash)
+            history: Optional conversation history (list of {"role": "user"/"model", "parts": [text]})
+
+        Yields:
+            {"type": "delta", "text": str} for each text fragment, then a single
+            {"type": "done", ...} event with the full result and citations, or
+            {"type": "error", "error": str} if generation fails
+        """
+        try:
+            self.logger.info(f"Streaming search with FileSearch in stores: {store_names}")
+            self.logger.debug(f"Query: {query}")
+            self.logger.debug(f"Metadata filter: {metadata_filter}")
+            self.logger.debug(f"History length: {len(history) if history else 0}")
+
+            contents = self._build_search_contents(query, history)
+
+            stream = self.client.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=self._build_file_search_config(store_names)
             )
 
-            # Extract text from response
-            result_text = response.text if hasattr(response, 'text') else str(response)
+            text_parts = []
+            citations = []
+            for chunk in stream:
+                text = chunk.text if hasattr(chunk, 'text') else None
+                if text:
+                    text_parts.append(text)
+                    yield {"type": "delta", "text": text}
+
+                # Grounding metadata usually arrives with the last chunk
+                chunk_citations = self._extract_citations(chunk)
+                if chunk_citations:
+                    citations = chunk_citations
+
+            result_text = ''.join(text_parts)
 
-            self.logger.info(f"Search completed successfully")
+            self.logger.info(f"Streaming search completed successfully")
             self.logger.debug(f"Result length: {len(result_text)} characters")
 
-            return {
+            yield {
+                "type": "done",
                 "success": True,
                 "query": query,
                 "result": result_text,
+                "citations": citations,
                 "stores_searched": store_names,
                 "model": model
             }
         except Exception as e:
-            self.logger.error(f"Error in FileSearch: {str(e)}", exc_info=True)
-            return {
+            self.logger.error(f"Error in streaming FileSearch: {str(e)}", exc_info=True)
+            yield {
+                "type": "error",
                 "success": False,
                 "error": str(e),
                 "query": query
             }
 
+    def embed_text(
+        self,
+        text: str,
+        model: str = "gemini-embedding-001",
+        output_dimensionality: int = 768
+    ) -> Dict[str, Any]:
+        """
+        Compute a semantic-similarity embedding for a text
+
+        Args:
+            text: Text to embed
+            model: Embedding model (default: gemini-embedding-001)
+            output_dimensionality: Size of the returned vector
+
+        Returns:
+            Dict with success status and embedding values
+        """
+        try:
+            response = self.client.models.embed_content(
+                model=model,
+                contents=text,
+                config=types.EmbedContentConfig(
+                    task_type='SEMANTIC_SIMILARITY',
+                    output_dimensionality=output_dimensionality
+                )
+            )
+            return {
+                "success": True,
+                "embedding": list(response.embeddings[0].values),
+                "model": model
+            }
+        except Exception as e:
+            self.logger.error(f"Error embedding text: {str(e)}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def _build_search_contents(self, query: str, history: Optional[List[Dict[str, str]]] = None) -> List[types.Content]:
+        """Build conversation contents (history + current query) for a FileSearch request"""
+        # Convert history to proper format if it exists
+        contents = []
+        if history:
+            for msg in history:
+                role = msg.get('role', 'user')
+                parts = msg.get('parts', [])
+                # Create proper Content object
+                if isinstance(parts, list) and len(parts) > 0:
+                    text_content = parts[0] if isinstance(parts[0], str) else str(parts[0])
+                    contents.append(types.Content(role=role, parts=[types.Part(text=text_content)]))
+
+        # Add current query
+        contents.append(types.Content(role='user', parts=[types.Part(text=query)]))
+        return contents
+
+    def _build_file_search_config(self, store_names: List[str]) -> types.GenerateContentConfig:
+        """Build the generation config with the FileSearch tool for the given stores"""
+        return types.GenerateContentConfig(
+            system_instruction=FILE_SEARCH_SYSTEM_INSTRUCTION,
+            tools=[
+                types.Tool(
+                    file_search=types.FileSearch(
+                        file_search_store_names=store_names
+                    )
+                )
+            ],
+            temperature=0.3
+        )
+
+    def _build_search_result(self, query: str, response, store_names: List[str], model: str) -> Dict[str, Any]:
+        """Build the search result dict from a generate_content response"""
+        # Extract text from response
+        result_text = response.text if hasattr(response, 'text') else str(response)
+
+        self.logger.info(f"Search completed successfully")
+        self.logger.debug(f"Result length: {len(result_text)} characters")
+
+        return {
+            "success": True,
+            "query": query,
+            "result": result_text,
+            "citations": self._extract_citations(response),
+            "stores_searched": store_names,
+            "model": model
+        }
+
+    def _extract_citations(self, response) -> List[Dict[str, Any]]:
+        """Extract retrieved document citations from a response's grounding metadata"""
+        citations = []
+        candidates = getattr(response, 'candidates', None) or []
+        if not candidates:
+            return citations
+
+        grounding_metadata = getattr(candidates[0], 'grounding_metadata', None)
+        grounding_chunks = getattr(grounding_metadata, 'grounding_chunks', None) or []
+
+        seen = set()
+        for grounding_chunk in grounding_chunks:
+            context = getattr(grounding_chunk, 'retrieved_context', None)
+            if context is None:
+                continue
+            title = getattr(context, 'title', None)
+            document_name = getattr(context, 'document_name', None)
+            key = document_name or title
+            if key in seen:
+                continue
+            seen.add(key)
+            citations.append({
+                "title": title,
+                "document_name": document_name,
+                "uri": getattr(context, 'uri', None),
+                "text": getattr(context, 'text', None)
+            })
+        return citations
+
     def search_with_grounding(
         self,
         query: str,
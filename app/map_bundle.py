@@ -0,0 +1,182 @@
+"""
+컴파일된 지도 번들
+도로망(노드 좌표, CSR 간선, 연결 요소), 시설물 목록과 검색 역색인, 도로 선분 격자 색인,
+시설물별 스냅 노드, 시설물 간 거리 테이블을 하나의 바이너리 파일로 저장하고, mmap으로 열어 복사 없이 NumPy 배열로 사용
+
+여러 워커 프로세스가 같은 파일을 열면 OS 페이지 캐시를 공유합니다.
+
+파일 구조:
+    MAGIC (8바이트) | 헤더 길이 (uint64, little-endian) | 헤더 JSON | 패딩 | 배열 데이터 (64바이트 정렬)
+
+빌드:
+    python -m app.map_bundle            # map/olympic_map.bundle 생성
+    python -m app.map_bundle --check    # 현재 지도 데이터와 일치하는지만 확인
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import numpy as np
+from app.logger import get_logger
+
+logger = get_logger()
+
+MAGIC = b'OLYMAP\x00\x01'
+
+# 저장 형식 버전 (배열 구성이 바뀌면 올려서 기존 파일을 무효화)
+BUNDLE_FORMAT_VERSION = 2
+
+MAP_BUNDLE_FILENAME = 'olympic_map.bundle'
+
+# 배열 시작 위치 정렬 (캐시 라인 단위)
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_bundle(path, checksum, arrays, metadata):
+    """
+    지도 번들 파일 쓰기
+
+    Args:
+        path: 번들 파일 경로
+        checksum: 원본 지도 데이터 체크섬 (compute_data_checksum)
+        arrays: 이름 -> NumPy 배열
+        metadata: JSON으로 저장할 부가 정보 (시설물 목록 등)
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+    # 배열 위치는 데이터 영역 시작 기준 상대 오프셋
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+        offset += array.nbytes
+
+    header = json.dumps({
+        'version': BUNDLE_FORMAT_VERSION,
+        'checksum': checksum,
+        'arrays': layout,
+        'metadata': metadata
+    }, ensure_ascii=False).encode('utf-8')
+
+    data_start = _align(len(MAGIC) + 8 + len(header))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b'\0' * (data_start + layout[name]['offset'] - f.tell()))
+            f.write(array.tobytes())
+
+    # 읽는 중인 프로세스가 절반만 쓰인 파일을 보지 않도록 교체
+    os.replace(tmp_path, path)
+    logger.info(f"Map bundle written: {path} ({data_start + offset} bytes)")
+
+
+class MapBundle:
+    """mmap으로 연 지도 번들 (배열은 읽기 전용 뷰)"""
+
+    def __init__(self, path, header, buffer, data_start):
+        self.path = path
+        self.checksum = header['checksum']
+        self.metadata = header['metadata']
+        self._layout = header['arrays']
+        self._buffer = buffer
+        self._data_start = data_start
+
+    @classmethod
+    def open(cls, path, checksum=None):
+        """
+        번들 파일 열기
+
+        Args:
+            path: 번들 파일 경로
+            checksum: 현재 지도 데이터 체크섬 (None이면 확인하지 않음)
+
+        Returns:
+            MapBundle 또는 파일이 없거나 형식/체크섬이 맞지 않으면 None
+        """
+        try:
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to open map bundle {path}: {e}")
+            return None
+
+        try:
+            if buffer[:len(MAGIC)] != MAGIC:
+                raise ValueError('not a map bundle')
+            (header_length,) = struct.unpack_from('<Q', buffer, len(MAGIC))
+            header_start = len(MAGIC) + 8
+            header = json.loads(bytes(buffer[header_start:header_start + header_length]).decode('utf-8'))
+            if header.get('version') != BUNDLE_FORMAT_VERSION:
+                raise ValueError(f"unsupported bundle version {header.get('version')}")
+        except (ValueError, struct.error) as e:
+            logger.warning(f"Invalid map bundle {path}: {e}")
+            buffer.close()
+            return None
+
+        if checksum is not None and header['checksum'] != checksum:
+            logger.warning(f"Map bundle is stale: {path} (run: python -m app.map_bundle)")
+            buffer.close()
+            return None
+
+        logger.info(f"Map bundle opened: {path}")
+        return cls(path, header, buffer, _align(header_start + header_length))
+
+    def __contains__(self, name):
+        return name in self._layout
+
+    def names(self):
+        """저장된 배열 이름 목록"""
+        return list(self._layout)
+
+    def close(self):
+        """mmap 버퍼 닫기 (이 번들의 배열을 사용하지 않을 때만)"""
+        self._buffer.close()
+
+    def array(self, name):
+        """이름으로 배열 조회 (mmap 버퍼를 공유하는 읽기 전용 배열, 복사 없음)"""
+        spec = self._layout[name]
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        array = np.frombuffer(self._buffer, dtype=dtype, count=count, offset=self._data_start + spec['offset'])
+        return array.reshape(spec['shape'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='지도 번들 빌드')
+    parser.add_argument('--map-dir', default='map', help='지도 데이터 디렉토리')
+    parser.add_argument('--check', action='store_true', help='빌드하지 않고 기존 번들이 최신인지만 확인')
+    args = parser.parse_args()
+
+    # 순환 import 방지 (wayfinding 모듈이 이 모듈을 사용)
+    from app.wayfinding import WayfindingService
+
+    service = WayfindingService(map_dir=args.map_dir, use_map_bundle=False)
+    path = service.map_bundle_path
+    if args.check:
+        bundle = MapBundle.open(path, service.get_data_checksum())
+        if bundle is not None:
+            bundle.close()
+        print(f"{path}: {'최신' if bundle is not None else '없음 또는 오래됨'}")
+        return 0 if bundle is not None else 1
+
+    if not service.build_map_bundle():
+        print('지도 데이터를 불러올 수 없습니다.')
+        return 1
+    print(f"{path}: written")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
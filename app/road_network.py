@@ -0,0 +1,534 @@
+"""
+배열 기반 도로망 라우팅 엔진
+도로망을 정수 노드 ID와 CSR 인접 행렬(NumPy 배열)로 한 번 변환하고
+scipy.sparse.csgraph.dijkstra 로 경로와 거리를 한 번에 계산
+간선 가중치가 좌표 간 직선 거리이므로 A* (단방향/양방향) 탐색도 지원
+"""
+import heapq
+import math
+import threading
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra, connected_components
+from app.logger import get_logger
+
+logger = get_logger()
+
+# 최단 경로 알고리즘: 'dijkstra' (csgraph, 전체 탐색), 'astar', 'bidirectional_astar'
+ROUTING_ALGORITHMS = ('dijkstra', 'astar', 'bidirectional_astar')
+
+
+class RoadNetwork:
+    """정수 노드 ID + CSR 인접 행렬로 표현한 무방향 도로망"""
+
+    def __init__(self, coords, adjacency, components=None):
+        """
+        초기화
+
+        Args:
+            coords: (N, 2) float64 배열 - 노드 ID별 지도 좌표
+            adjacency: (N, N) CSR 행렬 - 간선 가중치(거리), 양방향 모두 저장
+            components: 노드별 연결 요소 라벨 (지도 번들에 저장된 값, None이면 계산)
+        """
+        self.coords = coords
+        self.adjacency = adjacency
+        # 좌표 튜플 -> 노드 ID (좌표 튜플로 노드를 다루는 코드용, 최초 node_id 호출 시 생성)
+        self._node_index_lock = threading.Lock()
+        self._node_index = None
+
+        # 연결 요소 라벨 (서로 다른 요소의 두 노드는 탐색 없이 경로 없음으로 판단)
+        if components is None:
+            self.component_count, self.components = connected_components(adjacency, directed=False)
+        else:
+            self.components = components
+            self.component_count = int(components.max()) + 1 if len(components) else 0
+        self.component_sizes = np.bincount(self.components, minlength=self.component_count)
+        self.largest_component = int(np.argmax(self.component_sizes)) if self.component_count else None
+
+        # A* 탐색용 파이썬 리스트 (NumPy 원소 접근보다 빠름, 최초 A* 호출 시 생성)
+        self._lists_lock = threading.Lock()
+        self._lists = None
+
+    @classmethod
+    def from_segments(cls, segments):
+        """
+        선분 목록으로 도로망 생성
+
+        Args:
+            segments: 이미 보정된 좌표의 ((x1, y1), (x2, y2)) 목록
+
+        Returns:
+            RoadNetwork: 노드 순서는 선분에 처음 등장한 순서 (networkx.Graph 와 동일)
+        """
+        node_ids = {}
+        edges = {}
+        for u, v in segments:
+            u_id = node_ids.setdefault(u, len(node_ids))
+            v_id = node_ids.setdefault(v, len(node_ids))
+            if u_id == v_id:
+                # 자기 자신으로의 간선은 최단 경로에 영향이 없으므로 노드만 등록
+                continue
+            # 중복 간선은 마지막 값 사용 (networkx.Graph.add_edge 와 동일)
+            key = (u_id, v_id) if u_id < v_id else (v_id, u_id)
+            edges[key] = math.hypot(u[0] - v[0], u[1] - v[1])
+
+        n = len(node_ids)
+        coords = np.array(list(node_ids), dtype=np.float64).reshape(n, 2)
+        if edges:
+            pairs = np.array(list(edges), dtype=np.int32)
+            weights = np.fromiter(edges.values(), dtype=np.float64, count=len(edges))
+        else:
+            pairs = np.empty((0, 2), dtype=np.int32)
+            weights = np.empty(0, dtype=np.float64)
+
+        # 무방향 그래프이므로 양방향 간선을 모두 저장
+        rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+        cols = np.concatenate([pairs[:, 1], pairs[:, 0]])
+        adjacency = csr_matrix((np.concatenate([weights, weights]), (rows, cols)), shape=(n, n))
+        return cls(coords, adjacency)
+
+    @classmethod
+    def from_arrays(cls, coords, indptr, indices, weights, components=None):
+        """
+        저장된 CSR 배열로 도로망 생성 (지도 번들에서 복사 없이 사용)
+
+        Args:
+            coords: (N, 2) 노드 좌표
+            indptr, indices, weights: CSR 인접 행렬 배열 (양방향 간선 포함)
+            components: 노드별 연결 요소 라벨 (None이면 계산)
+        """
+        n = coords.shape[0]
+        adjacency = csr_matrix((weights, indices, indptr), shape=(n, n), copy=False)
+        return cls(coords, adjacency, components)
+
+    def __len__(self):
+        return self.coords.shape[0]
+
+    @property
+    def edge_count(self):
+        """무방향 간선 수"""
+        return self.adjacency.nnz // 2
+
+    @property
+    def nbytes(self):
+        """노드 좌표 + CSR 배열 메모리 사용량 (바이트)"""
+        return (self.coords.nbytes + self.adjacency.data.nbytes
+                + self.adjacency.indices.nbytes + self.adjacency.indptr.nbytes)
+
+    @property
+    def node_index(self):
+        """좌표 튜플 -> 노드 ID"""
+        if self._node_index is None:
+            with self._node_index_lock:
+                if self._node_index is None:
+                    self._node_index = {(float(x), float(y)): i for i, (x, y) in enumerate(self.coords.tolist())}
+        return self._node_index
+
+    def node_id(self, node):
+        """좌표 튜플의 노드 ID (없으면 None)"""
+        return self.node_index.get((float(node[0]), float(node[1])))
+
+    def connected(self, source, target):
+        """두 노드가 같은 연결 요소에 있는지 (O(1))"""
+        return self.components[source] == self.components[target]
+
+    def shortest_path(self, source, target, algorithm='dijkstra', stats=None):
+        """
+        두 노드 사이 최단 경로
+
+        Args:
+            source: 출발 노드 ID
+            target: 도착 노드 ID
+            algorithm: 'dijkstra', 'astar' 또는 'bidirectional_astar'
+            stats: 전달하면 stats['expanded'] 에 확정(확장)한 노드 수를 더함
+
+        Returns:
+            tuple: (노드 ID 배열, 경로 길이) 또는 연결되어 있지 않으면 None
+        """
+        if algorithm not in ROUTING_ALGORITHMS:
+            raise ValueError(f"Unknown routing algorithm: {algorithm} (available: {', '.join(ROUTING_ALGORITHMS)})")
+        if not self.connected(source, target):
+            # 연결 요소가 다르면 탐색 없이 경로 없음
+            if stats is not None:
+                stats['expanded'] = stats.get('expanded', 0)
+            return None
+
+        if algorithm == 'astar':
+            return self.astar_path(source, target, stats)
+        if algorithm == 'bidirectional_astar':
+            return self.bidirectional_astar_path(source, target, stats)
+
+        # 다익스트라 1회로 경로와 거리 계산 (csgraph는 조기 종료가 없어 연결된 노드를 모두 확정)
+        distances, predecessors = dijkstra(
+            self.adjacency, directed=False, indices=source, return_predecessors=True
+        )
+        if stats is not None:
+            stats['expanded'] = stats.get('expanded', 0) + int(np.isfinite(distances).sum())
+        return self.path_from_predecessors(predecessors, distances, source, target)
+
+    def nearest_targets(self, source, targets, k=1, stats=None):
+        """
+        출발 지점에서 도로 거리로 가장 가까운 목표 k개 (다중 목표 다익스트라, k개를 찾으면 즉시 종료)
+
+        Args:
+            source: 출발 노드 ID 또는 간선 위 가상 노드 (u, v, u까지 거리, v까지 거리) - 가상 노드면
+                    양 끝 노드를 (지점까지 거리)에서 동시에 출발
+            targets: 노드 ID -> 해당 노드에 스냅된 목표(시설물 인덱스 등) 리스트
+            k: 찾을 목표 수
+            stats: 전달하면 stats['expanded'] 에 확정(확장)한 노드 수를 더함
+
+        Returns:
+            list: 가까운 순서의 (목표, 경로 길이, 노드 ID 배열) 리스트 (도달 가능한 목표만)
+                  - 노드 배열은 출발 노드 (가상 노드면 먼저 거친 끝 노드)에서 시작
+        """
+        if isinstance(source, tuple):
+            su, sv, su_offset, sv_offset = source
+            seeds = ((su, su_offset), (sv, sv_offset))
+        else:
+            su, seeds = source, ((source, 0.0),)
+
+        # 다른 연결 요소의 목표는 도달할 수 없으므로, 도달 가능한 목표가 k개 미만이면
+        # 연결 요소 전체를 탐색하지 않도록 k를 줄임
+        component = self.components[su]
+        k = min(k, sum(len(items) for node, items in targets.items() if self.components[node] == component))
+        if k == 0:
+            if stats is not None:
+                stats['expanded'] = stats.get('expanded', 0)
+            return []
+
+        indptr, indices, weights, _ = self._get_lists()
+
+        g = {}
+        parent = {}
+        heap = []
+        for node, offset in seeds:
+            if offset < g.get(node, math.inf):
+                g[node] = offset
+                parent[node] = None
+                heapq.heappush(heap, (offset, node))
+        closed = set()
+        found = []
+        expanded = 0
+
+        while heap and len(found) < k:
+            g_u, u = heapq.heappop(heap)
+            if u in closed:
+                continue
+            closed.add(u)
+            expanded += 1
+
+            for target in targets.get(u, ()):
+                path = [u]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                path.reverse()
+                found.append((target, g_u, np.array(path, dtype=np.int64)))
+                if len(found) == k:
+                    break
+
+            for j in range(indptr[u], indptr[u + 1]):
+                v = indices[j]
+                g_v = g_u + weights[j]
+                if v not in closed and g_v < g.get(v, math.inf):
+                    g[v] = g_v
+                    parent[v] = u
+                    heapq.heappush(heap, (g_v, v))
+
+        if stats is not None:
+            stats['expanded'] = stats.get('expanded', 0) + expanded
+        return found
+
+    def _get_lists(self):
+        """(indptr, indices, weights, coords) 파이썬 리스트"""
+        if self._lists is None:
+            with self._lists_lock:
+                if self._lists is None:
+                    self._lists = (
+                        self.adjacency.indptr.tolist(),
+                        self.adjacency.indices.tolist(),
+                        self.adjacency.data.tolist(),
+                        self.coords.tolist()
+                    )
+        return self._lists
+
+    def astar_path(self, source, target, stats=None):
+        """
+        A* 최단 경로 (휴리스틱: 목적지까지 직선 거리)
+
+        간선 가중치가 두 좌표 사이 직선 거리이므로 휴리스틱이 실제 거리를 넘지 않아
+        다익스트라와 같은 길이의 경로를 찾으면서 목적지 방향 노드만 주로 확장합니다.
+
+        Returns:
+            tuple: (노드 ID 배열, 경로 길이) 또는 연결되어 있지 않으면 None
+        """
+        indptr, indices, weights, coords = self._get_lists()
+        tx, ty = coords[target]
+
+        g = {source: 0.0}
+        parent = {source: source}
+        closed = set()
+        heap = [(math.hypot(coords[source][0] - tx, coords[source][1] - ty), 0.0, source)]
+        expanded = 0
+        found = False
+
+        while heap:
+            _, g_u, u = heapq.heappop(heap)
+            if u in closed or g_u > g[u]:
+                continue
+            closed.add(u)
+            expanded += 1
+            if u == target:
+                found = True
+                break
+
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                g_v = g_u + weights[k]
+                if g_v < g.get(v, math.inf):
+                    g[v] = g_v
+                    parent[v] = u
+                    # 부동소수점 오차로 이미 확정된 노드가 더 짧아지면 다시 확장
+                    closed.discard(v)
+                    x, y = coords[v]
+                    heapq.heappush(heap, (g_v + math.hypot(x - tx, y - ty), g_v, v))
+
+        if stats is not None:
+            stats['expanded'] = stats.get('expanded', 0) + expanded
+        if not found:
+            return None
+
+        path = [target]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return np.array(path, dtype=np.int64), g[target]
+
+    def bidirectional_astar_path(self, source, target, stats=None):
+        """
+        양방향 A* 최단 경로 (출발/도착 양쪽에서 동시에 탐색)
+
+        평균 포텐셜 p(v) = (h_target(v) - h_source(v)) / 2 를 사용해 양방향 모두 일관된
+        휴리스틱을 유지하고, 두 탐색의 최소 키 합이 현재 최단 거리 이상이면 종료합니다.
+
+        Returns:
+            tuple: (노드 ID 배열, 경로 길이) 또는 연결되어 있지 않으면 None
+        """
+        if source == target:
+            if stats is not None:
+                stats['expanded'] = stats.get('expanded', 0) + 1
+            return np.array([source], dtype=np.int64), 0.0
+
+        indptr, indices, weights, coords = self._get_lists()
+        sx, sy = coords[source]
+        tx, ty = coords[target]
+
+        def potential(v):
+            x, y = coords[v]
+            return (math.hypot(x - tx, y - ty) - math.hypot(x - sx, y - sy)) / 2
+
+        # 0: 정방향 (source ->), 1: 역방향 (target ->); 역방향 포텐셜은 -potential
+        g = ({source: 0.0}, {target: 0.0})
+        parent = ({source: source}, {target: target})
+        heaps = ([(potential(source), 0.0, source)], [(-potential(target), 0.0, target)])
+        signs = (1.0, -1.0)
+        best = math.inf
+        meet = None
+        expanded = 0
+
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            _, g_u, u = heapq.heappop(heaps[side])
+            g_side, g_other = g[side], g[1 - side]
+            if g_u > g_side[u]:
+                continue
+            expanded += 1
+
+            sign = signs[side]
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                g_v = g_u + weights[k]
+                if g_v < g_side.get(v, math.inf):
+                    g_side[v] = g_v
+                    parent[side][v] = u
+                    heapq.heappush(heaps[side], (g_v + sign * potential(v), g_v, v))
+
+                # 반대편에서 이미 도달한 노드면 전체 경로 후보 갱신
+                g_rest = g_other.get(v)
+                if g_rest is not None and g_side[v] + g_rest < best:
+                    best = g_side[v] + g_rest
+                    meet = v
+
+        if stats is not None:
+            stats['expanded'] = stats.get('expanded', 0) + expanded
+        if meet is None:
+            return None
+
+        path = [meet]
+        while path[-1] != source:
+            path.append(parent[0][path[-1]])
+        path.reverse()
+        node = meet
+        while node != target:
+            node = parent[1][node]
+            path.append(node)
+        return np.array(path, dtype=np.int64), best
+
+    def virtual_path(self, start, end, algorithm='astar', stats=None):
+        """
+        간선 위 두 지점(가상 노드) 사이 최단 경로
+
+        출발 지점은 간선 양 끝 노드에서 각각 (지점까지 거리)만큼 떨어진 가상 노드로 보고
+        양 끝 노드를 동시에 출발점으로 탐색하며, 도착 간선의 양 끝 노드를 거쳐 도착 지점까지의
+        거리를 더해 비교합니다. 같은 간선 위의 두 지점이면 간선을 따라 바로 가는 경로도 후보입니다.
+
+        Args:
+            start, end: (u, v, u까지 거리, v까지 거리) - SegmentIndex.edge_point
+            algorithm: 'dijkstra' (csgraph) 또는 'astar' ('bidirectional_astar'도 단방향 A*로 처리)
+            stats: 전달하면 stats['expanded'] 에 확정(확장)한 노드 수를 더함
+
+        Returns:
+            tuple: (가상 출발/도착 지점 사이를 지나는 도로 노드 ID 배열, 경로 길이) 또는 연결되어 있지 않으면 None
+                   (같은 간선 위에서 바로 가는 경우 노드 배열은 비어 있음)
+        """
+        su, sv, su_offset, sv_offset = start
+        eu, ev, eu_offset, ev_offset = end
+        if not self.connected(su, eu):
+            # 간선 양 끝은 같은 연결 요소이므로 한쪽 끝만 비교
+            if stats is not None:
+                stats['expanded'] = stats.get('expanded', 0)
+            return None
+        best = abs(su_offset - eu_offset) if (su, sv) == (eu, ev) else math.inf
+        empty = np.empty(0, dtype=np.int64)
+
+        if algorithm == 'dijkstra':
+            distances, predecessors = dijkstra(
+                self.adjacency, directed=False, indices=[su, sv], return_predecessors=True
+            )
+            if stats is not None:
+                stats['expanded'] = stats.get('expanded', 0) + int(np.isfinite(distances).sum())
+            trees = {su: (distances[0], predecessors[0]), sv: (distances[1], predecessors[1])}
+            return self.virtual_path_from_trees(start, end, trees)
+
+        if algorithm not in ROUTING_ALGORITHMS:
+            raise ValueError(f"Unknown routing algorithm: {algorithm} (available: {', '.join(ROUTING_ALGORITHMS)})")
+
+        indptr, indices, weights, coords = self._get_lists()
+        # 휴리스틱: 가상 도착 지점까지 직선 거리 (도착 간선의 끝 노드를 거치는 어떤 경로보다도 짧음)
+        end_length = eu_offset + ev_offset
+        ratio = eu_offset / end_length if end_length > 0 else 0.0
+        tx = coords[eu][0] + ratio * (coords[ev][0] - coords[eu][0])
+        ty = coords[eu][1] + ratio * (coords[ev][1] - coords[eu][1])
+        target_offsets = {eu: eu_offset, ev: ev_offset}
+
+        g = {}
+        parent = {}
+        heap = []
+        for node, offset in ((su, su_offset), (sv, sv_offset)):
+            if offset < g.get(node, math.inf):
+                g[node] = offset
+                parent[node] = None
+                heapq.heappush(heap, (offset + math.hypot(coords[node][0] - tx, coords[node][1] - ty), offset, node))
+
+        closed = set()
+        meet = None
+        expanded = 0
+        while heap:
+            f_u, g_u, u = heapq.heappop(heap)
+            # 남은 노드를 거치는 경로는 모두 f 이상이므로 현재 최단 경로가 확정
+            if f_u >= best:
+                break
+            if u in closed or g_u > g[u]:
+                continue
+            closed.add(u)
+            expanded += 1
+
+            target_offset = target_offsets.get(u)
+            if target_offset is not None and g_u + target_offset < best:
+                best = g_u + target_offset
+                meet = u
+
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                g_v = g_u + weights[k]
+                if g_v < g.get(v, math.inf):
+                    g[v] = g_v
+                    parent[v] = u
+                    closed.discard(v)
+                    x, y = coords[v]
+                    heapq.heappush(heap, (g_v + math.hypot(x - tx, y - ty), g_v, v))
+
+        if stats is not None:
+            stats['expanded'] = stats.get('expanded', 0) + expanded
+        if not np.isfinite(best):
+            return None
+        if meet is None:
+            return empty, best
+
+        path = [meet]
+        while parent[path[-1]] is not None:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return np.array(path, dtype=np.int64), best
+
+    def virtual_path_from_trees(self, start, end, trees):
+        """
+        미리 계산한 최단 경로 트리로 간선 위 두 지점(가상 노드) 사이 최단 경로 (virtual_path 참고)
+
+        Args:
+            start, end: (u, v, u까지 거리, v까지 거리) - SegmentIndex.edge_point
+                        (도로 노드 자체는 (n, n, 0, 0))
+            trees: 노드 ID -> (거리 배열, 선행 노드 배열) - 출발 간선 양 끝 노드의 트리 포함
+
+        Returns:
+            tuple: (가상 출발/도착 지점 사이를 지나는 도로 노드 ID 배열, 경로 길이) 또는 연결되어 있지 않으면 None
+        """
+        su, sv, su_offset, sv_offset = start
+        eu, ev, eu_offset, ev_offset = end
+        best = abs(su_offset - eu_offset) if (su, sv) == (eu, ev) else math.inf
+        route = (np.empty(0, dtype=np.int64), best) if np.isfinite(best) else None
+        for source, source_offset in ((su, su_offset), (sv, sv_offset)):
+            distances, predecessors = trees[source]
+            for target, target_offset in ((eu, eu_offset), (ev, ev_offset)):
+                length = source_offset + float(distances[target]) + target_offset
+                if length < best:
+                    best = length
+                    route = (self.path_from_predecessors(predecessors, distances, source, target)[0], length)
+        return route
+
+    def shortest_path_tree(self, sources):
+        """
+        여러 출발 노드의 최단 경로 트리 (csgraph 다익스트라 1회 호출)
+
+        Args:
+            sources: 출발 노드 ID 목록
+
+        Returns:
+            tuple: (거리 배열 (S, N), 선행 노드 배열 (S, N))
+        """
+        return dijkstra(self.adjacency, directed=False, indices=np.asarray(sources, dtype=np.int64), return_predecessors=True)
+
+    @staticmethod
+    def path_from_predecessors(predecessors, distances, source, target):
+        """
+        다익스트라 선행 노드 배열에서 경로 복원
+
+        Returns:
+            tuple: (노드 ID 배열, 경로 길이) 또는 연결되어 있지 않으면 None
+        """
+        if not np.isfinite(distances[target]):
+            return None
+
+        path = [target]
+        node = target
+        while node != source:
+            node = predecessors[node]
+            path.append(node)
+        path.reverse()
+        return np.array(path, dtype=np.int64), float(distances[target])
+
+    def path_coords(self, path_ids):
+        """노드 ID 배열을 좌표 튜플 리스트로 변환"""
+        return [tuple(point) for point in self.coords[path_ids].tolist()]
@@ -0,0 +1,145 @@
+"""
+Route cache for wayfinding
+LRU cache with a memory bound for shortest paths and rendered route images,
+cleared by WayfindingService when the map data or calibration changes
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+from app.logger import get_logger
+
+logger = get_logger()
+
+_MISSING = object()
+
+
+class RouteCache:
+    """Thread-safe LRU cache keyed by (kind, start_node, end_node, ...) tuples"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached entries
+            max_bytes: Approximate memory bound for cached paths and images
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        # key -> (size_bytes, value)
+        self._entries: "OrderedDict[Tuple, Tuple[int, Any]]" = OrderedDict()
+        self._total_bytes = 0
+
+        # Counters per entry kind (key[0], e.g. 'path' / 'image')
+        self._hits: Dict[Hashable, int] = {}
+        self._misses: Dict[Hashable, int] = {}
+        self.evictions = 0
+        self.invalidations = 0
+
+        logger.info(f"RouteCache initialized - max_entries: {max_entries}, max_bytes: {max_bytes}")
+
+    def get(self, key: Tuple, default: Any = None) -> Any:
+        """
+        Look up a cached value
+
+        Args:
+            key: Cache key; key[0] is the entry kind used for statistics
+            default: Returned on miss
+
+        Returns:
+            Cached value, or default on miss
+        """
+        kind = key[0]
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._misses[kind] = self._misses.get(kind, 0) + 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._hits[kind] = self._hits.get(kind, 0) + 1
+            return entry[1]
+
+    def set(self, key: Tuple, value: Any, size_bytes: int) -> bool:
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: Value to cache (treated as immutable by callers)
+            size_bytes: Approximate memory used by the value
+
+        Returns:
+            True if cached, False if the value is larger than the memory bound
+        """
+        if size_bytes > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (size_bytes, value)
+            self._total_bytes += size_bytes
+
+            # LRU eviction (entry count and memory bound)
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+        return True
+
+    def _remove(self, key: Tuple):
+        """Remove an entry (caller must hold the lock)"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[0]
+
+    def clear(self) -> int:
+        """
+        Remove all cached routes
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+            self.invalidations += removed
+
+        if removed:
+            logger.info(f"RouteCache cleared {removed} entries")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters and size"""
+        with self._lock:
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+            lookups = hits + misses
+            by_kind = {}
+            for kind in set(self._hits) | set(self._misses):
+                kind_hits = self._hits.get(kind, 0)
+                kind_lookups = kind_hits + self._misses.get(kind, 0)
+                by_kind[str(kind)] = {
+                    "hits": kind_hits,
+                    "misses": kind_lookups - kind_hits,
+                    "hit_rate": (kind_hits / kind_lookups) if kind_lookups else 0.0
+                }
+
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": (hits / lookups) if lookups else 0.0,
+                "by_kind": by_kind,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
@@ -1,14 +1,15 @@
-from flask import Blueprint, render_template, request, jsonify, current_app
+from flask import Blueprint, render_template, request, jsonify, current_app, Response, stream_with_context
 from app.logger import get_logger
 from werkzeug.utils import secure_filename
 import os
 import tempfile
 import csv
 import json
-import sqlite3
-from app.gemini_client import GeminiClient
-from app.wayfinding import WayfindingService
-from app.db import set_config, get_config
+from functools import lru_cache
+from app.wayfinding import WayfindingService, RENDERERS, RESPONSE_FORMATS, NEAREST_MODES, MAX_NEAREST_CANDIDATES
+from app.road_network import ROUTING_ALGORITHMS
+from app.db import set_config, get_config, get_store_versions, get_documents_by_category
+from app.answer_cache import notify_store_changed, store_name_from_document
 
 bp = Blueprint('main', __name__)
 
@@ -19,9 +20,52 @@ def get_wayfinding_service():
     """길찾기 서비스 싱글톤 인스턴스 반환"""
     global wayfinding_service
     if wayfinding_service is None:
-        wayfinding_service = WayfindingService()
+        wayfinding_service = WayfindingService(
+            renderer=current_app.config.get('WAYFINDING_RENDERER', 'matplotlib'),
+            route_cache_max_entries=current_app.config.get('ROUTE_CACHE_MAX_ENTRIES', 1024),
+            route_cache_max_bytes=int(current_app.config.get('ROUTE_CACHE_MAX_MB', 64) * 1024 * 1024),
+            routing_engine=current_app.config.get('WAYFINDING_ROUTING_ENGINE', 'csgraph'),
+            routing_algorithm=current_app.config.get('WAYFINDING_ROUTING_ALGORITHM', 'astar'),
+            use_distance_table=current_app.config.get('WAYFINDING_DISTANCE_TABLE', True),
+            render_processes=current_app.config.get('WAYFINDING_RENDER_PROCESSES', 0),
+            snap_to_edges=current_app.config.get('WAYFINDING_SNAP_TO_EDGES', True),
+            snap_component=current_app.config.get('WAYFINDING_SNAP_COMPONENT', 'any')
+        )
     return wayfinding_service
 
+def get_route_options(data, default_format='image'):
+    """
+    요청에서 경로 응답 옵션 추출
+
+    Args:
+        data: 요청 JSON
+        default_format: response_format이 없을 때 사용할 응답 형식
+
+    Returns:
+        tuple: (renderer, response_format, algorithm) - renderer/algorithm이 None이면 서비스 기본값
+
+    Raises:
+        ValueError: 지원하지 않는 렌더러, 응답 형식 또는 경로 알고리즘
+    """
+    renderer = data.get('renderer') or None
+    if renderer and renderer not in RENDERERS:
+        raise ValueError(f"Unsupported renderer: {renderer} (available: {', '.join(RENDERERS)})")
+
+    response_format = data.get('response_format') or default_format
+    if response_format not in RESPONSE_FORMATS:
+        raise ValueError(f"Unsupported response_format: {response_format} (available: {', '.join(RESPONSE_FORMATS)})")
+
+    algorithm = data.get('algorithm') or None
+    if algorithm and algorithm not in ROUTING_ALGORITHMS:
+        raise ValueError(f"Unsupported algorithm: {algorithm} (available: {', '.join(ROUTING_ALGORITHMS)})")
+
+    return renderer, response_format, algorithm
+
+def get_gemini_client():
+    """앱 공용 레지스트리에서 커넥션 풀을 공유하는 GeminiClient 반환"""
+    registry = current_app.extensions['gemini_registry']
+    return registry.get(current_app.config['GEMINI_API_KEY'])
+
 # 허용되는 파일 확장자
 ALLOWED_EXTENSIONS = {'pdf', 'txt', 'doc', 'docx', 'xlsx', 'xls', 'ppt', 'pptx', 'csv', 'json', 'xml', 'html'}
 
@@ -80,6 +124,84 @@ def convert_csv_to_json(file_path, filename):
         logger.error(f"Error converting CSV to JSON: {str(e)}", exc_info=True)
         return file_path, filename
 
+@lru_cache(maxsize=16)
+def parse_store_list(active_stores_json):
+    """저장된 active_stores JSON 파싱 (같은 설정 값은 한 번만 파싱)"""
+    try:
+        return tuple(json.loads(active_stores_json))
+    except (json.JSONDecodeError, TypeError):
+        # JSON 파싱 실패 시 빈 목록
+        return ()
+
+def get_active_store_ids():
+    """
+    활성 FileStore 목록 조회 (다중 설정 우선, 없으면 단일 설정 사용)
+
+    Returns:
+        list: 활성 스토어 이름 목록
+    """
+    active_stores_json = get_config('active_stores')
+    if active_stores_json:
+        return list(parse_store_list(active_stores_json))
+
+    # 새 설정이 없으면 기존 단일 active_store_name을 사용 (하위 호환)
+    active_store = get_config('active_store_name')
+    return [active_store] if active_store else []
+
+def get_answer_cache():
+    """앱 공용 답변 캐시 반환"""
+    return current_app.extensions['answer_cache']
+
+def get_cached_answer(query, store_ids, history):
+    """
+    캐시된 답변 조회 (정확 일치 캐시 → 의미 유사도 캐시 순서, 대화 맥락이 있는 질문은 캐시하지 않음)
+
+    Returns:
+        tuple: (캐시된 결과 또는 None, 저장 시 재사용할 캐시 컨텍스트 또는 None)
+    """
+    if history:
+        return None, None
+
+    model = current_app.config['GEMINI_MODEL']
+    store_versions = get_store_versions(store_ids)
+    cache_context = {'store_versions': store_versions, 'embedding': None}
+
+    cached = get_answer_cache().get(query, store_ids, model, store_versions)
+
+    semantic_cache = current_app.extensions.get('semantic_cache')
+    if cached is None and semantic_cache is not None:
+        cache_context['embedding'] = semantic_cache.embed(query)
+        cached = semantic_cache.get(query, store_ids, model, store_versions, embedding=cache_context['embedding'])
+
+    if cached is not None:
+        cached['query'] = query
+        cached['cached'] = True
+    return cached, cache_context
+
+def cache_answer(query, store_ids, history, cache_context, result):
+    """성공한 검색 결과를 답변 캐시(및 의미 유사도 캐시)에 저장"""
+    if history or cache_context is None or not result.get('success'):
+        return
+
+    model = current_app.config['GEMINI_MODEL']
+    store_versions = cache_context['store_versions']
+    get_answer_cache().set(query, store_ids, model, result, store_versions)
+
+    semantic_cache = current_app.extensions.get('semantic_cache')
+    if semantic_cache is not None and cache_context['embedding'] is not None:
+        semantic_cache.set(query, store_ids, model, result, store_versions, embedding=cache_context['embedding'])
+
+def invalidate_store_answers(store_name):
+    """스토어 문서 변경 시 캐시된 답변 무효화"""
+    notify_store_changed(store_name, get_answer_cache())
+    semantic_cache = current_app.extensions.get('semantic_cache')
+    if store_name and semantic_cache is not None:
+        semantic_cache.invalidate_store(store_name)
+
+def format_sse(event, data):
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 # ==================== Index Route ====================
 
 @bp.route('/')
@@ -122,7 +244,7 @@ def create_store():
 
         logger.debug(f'Store creation attempt - Name: {store_name} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.create_file_search_store(store_name)
 
         if result['success']:
@@ -145,7 +267,7 @@ def list_stores():
     try:
         logger.info(f'Store list retrieval request - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.list_file_search_stores()
 
         if result['success']:
@@ -170,7 +292,7 @@ def get_store(store_id):
     try:
         logger.info(f'Store retrieval request - Store ID: {store_id} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.get_file_search_store(store_id)
 
         if result['success']:
@@ -194,7 +316,7 @@ def get_store_documents(store_id):
     try:
         logger.info(f'Store document list retrieval request - Store ID: {store_id} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.list_documents_in_store(store_id)
 
         if result['success']:
@@ -219,10 +341,11 @@ def delete_store(store_id):
     try:
         logger.info(f'Store deletion request - Store ID: {store_id} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.delete_file_search_store(store_id)
 
         if result['success']:
+            invalidate_store_answers(store_id)
             logger.info(f'Store deletion successful - Store ID: {store_id} - IP: {client_ip}')
             return jsonify(result), 200
         else:
@@ -273,7 +396,7 @@ def upload_file():
             final_filename = converted_filename
 
             # Gemini Files API를 통해 파일 업로드 (변환된 파일명을 display_name으로 전달)
-            gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+            gemini = get_gemini_client()
             result = gemini.upload_file(final_path, display_name=final_filename)
 
             if result['success']:
@@ -316,10 +439,11 @@ def import_file(file_id):
 
         logger.debug(f'File import attempt - File ID: {file_id} - Store ID: {store_id} - Metadata: {metadata} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.import_file_to_store(file_id, store_id, metadata)
 
         if result['success']:
+            invalidate_store_answers(store_id)
             logger.info(f'File import successful - File ID: {file_id} - Store ID: {store_id} - IP: {client_ip}')
             return jsonify(result), 200
         else:
@@ -339,7 +463,7 @@ def list_files():
     try:
         logger.info(f'File list retrieval request - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.list_files()
 
         if result['success']:
@@ -364,7 +488,7 @@ def get_file_info(file_id):
     try:
         logger.info(f'File information retrieval request - File ID: {file_id} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.get_file(file_id)
 
         if result['success']:
@@ -388,7 +512,7 @@ def delete_file(file_id):
     try:
         logger.info(f'File deletion request - File ID: {file_id} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.delete_file(file_id)
 
         if result['success']:
@@ -411,7 +535,7 @@ def delete_all_files():
     try:
         logger.info(f'Delete all files request - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
 
         # 모든 파일 목록 조회
         files_result = gemini.list_files()
@@ -473,10 +597,11 @@ def delete_document(document_name):
     try:
         logger.info(f'Document deletion request - Document: {document_name} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.delete_document_from_store(document_name)
 
         if result['success']:
+            invalidate_store_answers(store_name_from_document(document_name))
             logger.info(f'Document deletion successful - Document: {document_name} - IP: {client_ip}')
             return jsonify(result), 200
         else:
@@ -496,10 +621,11 @@ def delete_all_documents(store_name):
     try:
         logger.info(f'Delete all documents request - Store: {store_name} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.delete_all_documents_from_store(store_name)
 
         if result['success']:
+            invalidate_store_answers(store_name)
             logger.info(f'Delete all documents successful - Store: {store_name} - Deleted: {result["deleted_count"]}/{result["total_count"]} - IP: {client_ip}')
             return jsonify(result), 200
         else:
@@ -527,15 +653,7 @@ def delete_documents_by_category(store_name):
         logger.info(f'Delete documents by category request - Store: {store_name} - Category: {category} - IP: {client_ip}')
 
         # 해당 카테고리의 문서들 조회
-        from app.db import get_all_mappings
-        conn = sqlite3.connect('data/document_mappings.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT document_name FROM document_mappings
-            WHERE store_name = ? AND category = ?
-        ''', (store_name, category))
-        documents = cursor.fetchall()
-        conn.close()
+        documents = get_documents_by_category(store_name, category)
 
         if not documents:
             logger.info(f'No documents found for category - Store: {store_name} - Category: {category} - IP: {client_ip}')
@@ -547,12 +665,12 @@ def delete_documents_by_category(store_name):
             }), 200
 
         # 문서 삭제
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         deleted_count = 0
         failed_count = 0
         errors = []
 
-        for (doc_name,) in documents:
+        for doc_name in documents:
             try:
                 result = gemini.delete_document_from_store(doc_name)
                 if result['success']:
@@ -564,6 +682,9 @@ def delete_documents_by_category(store_name):
                 failed_count += 1
                 errors.append(f"Error deleting {doc_name}: {str(e)}")
 
+        if deleted_count:
+            invalidate_store_answers(store_name)
+
         logger.info(f'Delete by category completed - Store: {store_name} - Category: {category} - Deleted: {deleted_count}/{len(documents)} - IP: {client_ip}')
 
         return jsonify({
@@ -600,16 +721,7 @@ def search():
             return jsonify({'success': False, 'error': 'Query is required'}), 400
 
         # Get active stores from config (supports multiple stores)
-        active_stores_json = get_config('active_stores')
-        if active_stores_json:
-            try:
-                store_ids = json.loads(active_stores_json)
-            except json.JSONDecodeError:
-                store_ids = []
-        else:
-            # Fallback to single active store for backward compatibility
-            active_store = get_config('active_store_name')
-            store_ids = [active_store] if active_store else []
+        store_ids = get_active_store_ids()
 
         if not store_ids:
             logger.warning(f'No active stores configured - IP: {client_ip}')
@@ -617,8 +729,14 @@ def search():
 
         logger.debug(f'Search started - Query: {query} - Active Stores: {store_ids} - History: {len(history)} messages - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
-        result = gemini.search_with_file_search(query, store_ids, metadata_filter, history=history)
+        cached, cache_context = get_cached_answer(query, store_ids, history)
+        if cached is not None:
+            logger.info(f'Search cache hit - Query: {query} - Stores: {store_ids} - IP: {client_ip}')
+            return jsonify(cached), 200
+
+        gemini = get_gemini_client()
+        result = gemini.search_with_file_search(query, store_ids, metadata_filter, model=current_app.config['GEMINI_MODEL'], history=history)
+        cache_answer(query, store_ids, history, cache_context, result)
 
         if result['success']:
             logger.info(f'Search successful - Query: {query} - Stores: {store_ids} - IP: {client_ip}')
@@ -632,6 +750,132 @@ def search():
         logger.error(f'Search exception occurred - IP: {client_ip} - Error: {str(e)}', exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@bp.route('/api/search/stream', methods=['POST'])
+def search_stream():
+    """FileSearch 스트리밍 검색 (Server-Sent Events로 답변 조각 전송)"""
+    logger = get_logger()
+    client_ip = request.remote_addr
+
+    try:
+        logger.info(f'Streaming search request - IP: {client_ip}')
+
+        data = request.get_json()
+        query = data.get('query', '').strip()
+        metadata_filter = data.get('metadata_filter', None)
+        history = data.get('history', [])
+
+        if not query:
+            logger.warning(f'Search query is missing - IP: {client_ip}')
+            return jsonify({'success': False, 'error': 'Query is required'}), 400
+
+        store_ids = get_active_store_ids()
+
+        if not store_ids:
+            logger.warning(f'No active stores configured - IP: {client_ip}')
+            return jsonify({'success': False, 'error': 'No active FileStores configured. Please contact administrator.'}), 400
+
+        logger.debug(f'Streaming search started - Query: {query} - Active Stores: {store_ids} - History: {len(history)} messages - IP: {client_ip}')
+
+        cached, cache_context = get_cached_answer(query, store_ids, history)
+        gemini = get_gemini_client()
+        model = current_app.config['GEMINI_MODEL']
+
+        def generate():
+            if cached is not None:
+                logger.info(f'Streaming search cache hit - Query: {query} - Stores: {store_ids} - IP: {client_ip}')
+                yield format_sse('delta', {'text': cached.get('result', '')})
+                yield format_sse('done', cached)
+                return
+
+            for event in gemini.stream_search_with_file_search(query, store_ids, metadata_filter, model=model, history=history):
+                event_type = event.pop('type')
+                if event_type == 'done':
+                    logger.info(f'Streaming search successful - Query: {query} - Stores: {store_ids} - IP: {client_ip}')
+                    cache_answer(query, store_ids, history, cache_context, event)
+                elif event_type == 'error':
+                    logger.error(f'Streaming search failed - Query: {query} - Error: {event.get("error")} - IP: {client_ip}')
+                yield format_sse(event_type, event)
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'  # 프록시(nginx) 버퍼링 비활성화
+            }
+        )
+
+    except Exception as e:
+        logger.error(f'Streaming search exception occurred - IP: {client_ip} - Error: {str(e)}', exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/stats/answer-cache', methods=['GET'])
+def get_answer_cache_stats():
+    """답변 캐시 적중률/크기 통계 조회"""
+    logger = get_logger()
+    client_ip = request.remote_addr
+
+    try:
+        logger.info(f'Answer cache stats request - IP: {client_ip}')
+
+        stats = get_answer_cache().stats()
+        semantic_cache = current_app.extensions.get('semantic_cache')
+        semantic_stats = semantic_cache.stats() if semantic_cache is not None else None
+
+        return jsonify({'success': True, 'stats': stats, 'semantic_stats': semantic_stats}), 200
+
+    except Exception as e:
+        logger.error(f'Answer cache stats exception - IP: {client_ip} - Error: {str(e)}', exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/stats/client-pool', methods=['GET'])
+def get_client_pool_stats():
+    """Gemini 클라이언트 커넥션 풀 통계 조회"""
+    logger = get_logger()
+    client_ip = request.remote_addr
+
+    try:
+        logger.info(f'Client pool stats request - IP: {client_ip}')
+
+        stats = current_app.extensions['gemini_registry'].stats()
+        return jsonify({'success': True, 'stats': stats}), 200
+
+    except Exception as e:
+        logger.error(f'Client pool stats exception - IP: {client_ip} - Error: {str(e)}', exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/stats/route-cache', methods=['GET'])
+def get_route_cache_stats():
+    """길찾기 경로/이미지 캐시 적중률/크기 통계 조회"""
+    logger = get_logger()
+    client_ip = request.remote_addr
+
+    try:
+        logger.info(f'Route cache stats request - IP: {client_ip}')
+
+        stats = get_wayfinding_service().route_cache.stats()
+        return jsonify({'success': True, 'stats': stats}), 200
+
+    except Exception as e:
+        logger.error(f'Route cache stats exception - IP: {client_ip} - Error: {str(e)}', exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/stats/routing', methods=['GET'])
+def get_routing_stats():
+    """길찾기 경로 탐색 알고리즘별 탐색 횟수/확장 노드 수 통계 조회"""
+    logger = get_logger()
+    client_ip = request.remote_addr
+
+    try:
+        logger.info(f'Routing stats request - IP: {client_ip}')
+
+        stats = get_wayfinding_service().routing_stats()
+        return jsonify({'success': True, 'stats': stats}), 200
+
+    except Exception as e:
+        logger.error(f'Routing stats exception - IP: {client_ip} - Error: {str(e)}', exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 # ==================== File Preview Route ====================
 
 @bp.route('/api/files/<path:file_id>/preview', methods=['GET'])
@@ -646,7 +890,7 @@ def preview_file(file_id):
     
     logger.info(f'File preview request - File ID: {file_id}, IP: {client_ip}')
     try:
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         file_info = gemini.get_file(file_id)
         
         if not file_info.get('success'):
@@ -714,7 +958,7 @@ def upload_to_store():
 
             logger.debug(f'FileStore upload attempt - File: {final_filename} - Store: {store_name} - Category: {category} - IP: {client_ip}')
 
-            gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+            gemini = get_gemini_client()
             result = gemini.upload_and_import_to_store(
                 file_path=final_file_path,
                 store_name=store_name,
@@ -723,6 +967,7 @@ def upload_to_store():
             )
 
             if result['success']:
+                invalidate_store_answers(store_name)
                 logger.info(f'FileStore upload successful - Original: {file.filename} - Final: {final_filename} - Store: {store_name} - Category: {category} - IP: {client_ip}')
                 return jsonify(result), 201
             else:
@@ -770,7 +1015,7 @@ def import_file_to_store():
 
         logger.debug(f'File import attempt - File: {file_id} - Store: {store_name} - Filename: {original_filename} - Category: {category} - IP: {client_ip}')
 
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         result = gemini.import_file_to_store(
             file_id=file_id,
             store_name=store_name,
@@ -779,6 +1024,7 @@ def import_file_to_store():
         )
 
         if result['success']:
+            invalidate_store_answers(store_name)
             logger.info(f'File import successful - File: {file_id} - Store: {store_name} - Category: {category} - IP: {client_ip}')
             return jsonify(result), 201
         else:
@@ -829,7 +1075,7 @@ def set_active_store():
             return jsonify({'success': False, 'error': 'Store name is required'}), 400
 
         # Store name 유효성 검증 (실제 존재하는지)
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
+        gemini = get_gemini_client()
         store_info = gemini.get_file_search_store(store_name)
 
         if not store_info.get('success'):
@@ -862,17 +1108,7 @@ def get_active_stores():
         logger.info(f'Get active stores request - IP: {client_ip}')
 
         # JSON으로 저장된 다중 active stores 조회
-        active_stores_json = get_config('active_stores')
-        if active_stores_json:
-            try:
-                active_stores = json.loads(active_stores_json)
-            except json.JSONDecodeError:
-                # JSON 파싱 실패 시 빈 리스트
-                active_stores = []
-        else:
-            # 새 설정이 없으면 기존 단일 active_store_name을 사용
-            active_store = get_config('active_store_name')
-            active_stores = [active_store] if active_store else []
+        active_stores = get_active_store_ids()
 
         logger.info(f'Active stores retrieved: {active_stores} - IP: {client_ip}')
         return jsonify({
@@ -904,13 +1140,10 @@ def set_active_stores():
             logger.warning(f'Empty store names list - IP: {client_ip}')
             return jsonify({'success': False, 'error': 'At least one store must be selected'}), 400
 
-        # Store names 유효성 검증
-        gemini = GeminiClient(current_app.config['GEMINI_API_KEY'])
-        invalid_stores = []
-        for store_name in store_names:
-            store_info = gemini.get_file_search_store(store_name)
-            if not store_info.get('success'):
-                invalid_stores.append(store_name)
+        # Store names 유효성 검증 (캐시 + 동시 조회)
+        gemini = get_gemini_client()
+        store_infos = gemini.get_file_search_stores(store_names)
+        invalid_stores = [name for name, info in store_infos.items() if not info.get('success')]
 
         if invalid_stores:
             logger.warning(f'Invalid store names: {invalid_stores} - IP: {client_ip}')
@@ -979,10 +1212,17 @@ def find_path():
             logger.warning(f'Start and end are the same - IP: {client_ip}')
             return jsonify({'success': False, 'error': 'Start and end locations must be different'}), 400
 
+        try:
+            renderer, response_format, algorithm = get_route_options(data)
+        except ValueError as e:
+            logger.warning(f'Invalid route options - IP: {client_ip} - Error: {str(e)}')
+            return jsonify({'success': False, 'error': str(e)}), 400
+
         logger.debug(f'Finding path - Start: {start_name} - End: {end_name} - IP: {client_ip}')
 
         service = get_wayfinding_service()
-        result = service.find_path(start_name, end_name)
+        result = service.find_path(start_name, end_name, renderer=renderer, response_format=response_format,
+                                   algorithm=algorithm)
 
         if result['success']:
             logger.info(f'Path found successfully - Start: {start_name} - End: {end_name} - Distance: {result.get("distance")} - IP: {client_ip}')
@@ -1014,10 +1254,17 @@ def find_path_coords():
             logger.warning(f'Missing coordinates - IP: {client_ip}')
             return jsonify({'success': False, 'error': 'All coordinates (start_x, start_y, end_x, end_y) are required'}), 400
 
+        try:
+            renderer, response_format, algorithm = get_route_options(data)
+        except ValueError as e:
+            logger.warning(f'Invalid route options - IP: {client_ip} - Error: {str(e)}')
+            return jsonify({'success': False, 'error': str(e)}), 400
+
         logger.debug(f'Finding path - Start: ({start_x}, {start_y}) - End: ({end_x}, {end_y}) - IP: {client_ip}')
 
         service = get_wayfinding_service()
-        result = service.find_path_from_coords(start_x, start_y, end_x, end_y)
+        result = service.find_path_from_coords(start_x, start_y, end_x, end_y, renderer=renderer, response_format=response_format,
+                                               algorithm=algorithm)
 
         if result['success']:
             logger.info(f'Path found successfully - Distance: {result.get("distance")} - IP: {client_ip}')
@@ -1030,6 +1277,99 @@ def find_path_coords():
         logger.error(f'Coordinate-based path finding exception - IP: {client_ip} - Error: {str(e)}', exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@bp.route('/api/wayfinding/batch', methods=['POST'])
+def find_paths_batch():
+    """여러 출발지/도착지 쌍의 최단 경로 일괄 찾기"""
+    logger = get_logger()
+    client_ip = request.remote_addr
+
+    try:
+        data = request.get_json() or {}
+        pairs = data.get('pairs')
+        logger.info(f'Batch path finding request - Pairs: {len(pairs) if isinstance(pairs, list) else 0} - IP: {client_ip}')
+
+        if not isinstance(pairs, list) or not pairs:
+            logger.warning(f'Missing pairs - IP: {client_ip}')
+            return jsonify({'success': False, 'error': 'pairs must be a non-empty list of {"start": ..., "end": ...}'}), 400
+
+        max_pairs = current_app.config.get('WAYFINDING_BATCH_MAX_PAIRS', 500)
+        if len(pairs) > max_pairs:
+            logger.warning(f'Too many pairs: {len(pairs)} - IP: {client_ip}')
+            return jsonify({'success': False, 'error': f'At most {max_pairs} pairs are allowed per request'}), 400
+
+        if not all(isinstance(pair, dict) and 'start' in pair and 'end' in pair for pair in pairs):
+            logger.warning(f'Invalid pairs - IP: {client_ip}')
+            return jsonify({'success': False, 'error': 'Each pair requires start and end (facility name or {"x", "y"})'}), 400
+
+        try:
+            renderer, response_format, _ = get_route_options(data, default_format='vector')
+        except ValueError as e:
+            logger.warning(f'Invalid route options - IP: {client_ip} - Error: {str(e)}')
+            return jsonify({'success': False, 'error': str(e)}), 400
+
+        service = get_wayfinding_service()
+        result = service.find_paths_batch([(pair['start'], pair['end']) for pair in pairs], renderer=renderer,
+                                          response_format=response_format,
+                                          max_workers=current_app.config.get('WAYFINDING_BATCH_WORKERS', 4))
+
+        if result['success']:
+            logger.info(f'Batch paths found - Pairs: {len(pairs)} - Sources: {result.get("sources")} - IP: {client_ip}')
+            return jsonify(result), 200
+        else:
+            logger.warning(f'Batch path finding failed - Error: {result.get("message")} - IP: {client_ip}')
+            return jsonify(result), 400
+
+    except Exception as e:
+        logger.error(f'Batch path finding exception - IP: {client_ip} - Error: {str(e)}', exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/api/wayfinding/tour', methods=['POST'])
+def plan_tour():
+    """여러 경유지를 한 번에 방문하는 경로 찾기 (방문 순서 최적화)"""
+    logger = get_logger()
+    client_ip = request.remote_addr
+
+    try:
+        data = request.get_json() or {}
+        stops = data.get('stops')
+        logger.info(f'Tour planning request - Stops: {len(stops) if isinstance(stops, list) else 0} - IP: {client_ip}')
+
+        max_stops = current_app.config.get('WAYFINDING_TOUR_MAX_STOPS', 12)
+        if not isinstance(stops, list) or not 2 <= len(stops) <= max_stops:
+            logger.warning(f'Invalid stop count - IP: {client_ip}')
+            return jsonify({'success': False, 'error': f'stops must be a list of 2 to {max_stops} stops'}), 400
+
+        if not all(isinstance(stop, str) or (isinstance(stop, dict) and 'x' in stop and 'y' in stop) for stop in stops):
+            logger.warning(f'Invalid stops - IP: {client_ip}')
+            return jsonify({'success': False, 'error': 'Each stop must be a facility name or {"x", "y"}'}), 400
+
+        optimize = data.get('optimize', True)
+        keep_end = data.get('keep_end', False)
+        if not isinstance(optimize, bool) or not isinstance(keep_end, bool):
+            logger.warning(f'Invalid tour options - optimize: {optimize!r}, keep_end: {keep_end!r} - IP: {client_ip}')
+            return jsonify({'success': False, 'error': 'optimize and keep_end must be true or false'}), 400
+
+        try:
+            renderer, response_format, _ = get_route_options(data)
+        except ValueError as e:
+            logger.warning(f'Invalid route options - IP: {client_ip} - Error: {str(e)}')
+            return jsonify({'success': False, 'error': str(e)}), 400
+
+        service = get_wayfinding_service()
+        result = service.plan_tour(stops, renderer=renderer, response_format=response_format,
+                                   optimize=optimize, keep_end=keep_end)
+
+        if result['success']:
+            logger.info(f'Tour found - Stops: {len(stops)} - Distance: {result.get("distance")} - IP: {client_ip}')
+            return jsonify(result), 200
+        else:
+            logger.warning(f'Tour planning failed - Error: {result.get("message")} - IP: {client_ip}')
+            return jsonify(result), 400
+
+    except Exception as e:
+        logger.error(f'Tour planning exception - IP: {client_ip} - Error: {str(e)}', exc_info=True)
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @bp.route('/api/wayfinding/nearest-facility', methods=['POST'])
 def find_nearest_facility():
     """가장 가까운 특정 시설물 찾기"""
@@ -1044,16 +1384,36 @@ def find_nearest_facility():
         y = data.get('y')
         category = data.get('category', 'toilet')
         name_pattern = data.get('name_pattern')
+        mode = data.get('mode') or 'straight'
 
         if x is None or y is None:
             logger.warning(f'Missing coordinates - IP: {client_ip}')
             return jsonify({'success': False, 'error': 'Coordinates (x, y) are required'}), 400
 
+        if mode not in NEAREST_MODES:
+            logger.warning(f'Invalid nearest mode: {mode} - IP: {client_ip}')
+            return jsonify({'success': False, 'error': f"Unsupported mode: {mode} (available: {', '.join(NEAREST_MODES)})"}), 400
+
+        try:
+            k = int(data.get('k', 1))
+        except (TypeError, ValueError):
+            k = 0
+        if not 1 <= k <= MAX_NEAREST_CANDIDATES:
+            logger.warning(f'Invalid candidate count: {data.get("k")} - IP: {client_ip}')
+            return jsonify({'success': False, 'error': f'k must be an integer between 1 and {MAX_NEAREST_CANDIDATES}'}), 400
+
+        try:
+            renderer, response_format, algorithm = get_route_options(data)
+        except ValueError as e:
+            logger.warning(f'Invalid route options - IP: {client_ip} - Error: {str(e)}')
+            return jsonify({'success': False, 'error': str(e)}), 400
+
         search_term = name_pattern if name_pattern else category
         logger.debug(f'Finding nearest {search_term} - Location: ({x}, {y}) - IP: {client_ip}')
 
         service = get_wayfinding_service()
-        result = service.find_nearest_facility_by_category(x, y, category, name_pattern)
+        result = service.find_nearest_facility_by_category(x, y, category, name_pattern, renderer=renderer, response_format=response_format,
+                                                           algorithm=algorithm, mode=mode, k=k)
 
         if result['success']:
             logger.info(f'Nearest facility found - Category: {category} - IP: {client_ip}')
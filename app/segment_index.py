@@ -0,0 +1,194 @@
+"""
+도로 선분 공간 색인
+도로망의 간선(선분)을 균일 격자에 등록해 클릭 좌표에서 가장 가까운 선분과
+그 위의 투영점을 찾음
+
+가장 가까운 도로 노드로 스냅하면 긴 직선 구간에서 노드가 멀리 떨어져 있어
+돌아가는 경로가 나오므로, 선분 위 투영점을 가상 노드로 사용합니다.
+격자 셀당 선분 수가 일정하게 유지되도록 셀 크기를 정하므로 도로망이 커져도
+조회는 주변 몇 개 셀만 확인합니다.
+"""
+import math
+import numpy as np
+
+
+class SegmentIndex:
+    """무방향 도로 간선의 균일 격자 색인 (셀 -> 선분 ID, CSR 형태)"""
+
+    # 셀당 평균 선분 수 목표 (셀 크기 결정용)
+    SEGMENTS_PER_CELL = 4
+
+    def __init__(self, network):
+        """
+        초기화
+
+        Args:
+            network: RoadNetwork (CSR 인접 행렬에서 u < v 인 간선만 사용)
+        """
+        adjacency = network.adjacency
+        rows = np.repeat(np.arange(len(network), dtype=np.int64), np.diff(adjacency.indptr))
+        cols = adjacency.indices.astype(np.int64)
+        mask = rows < cols
+        self.u = rows[mask]
+        self.v = cols[mask]
+        self.lengths = np.asarray(adjacency.data, dtype=np.float64)[mask]
+        # 선분별 연결 요소 (특정 연결 요소 안에서만 투영할 때 사용)
+        self.components = network.components[self.u]
+
+        coords = network.coords
+        self.start = coords[self.u] if len(self.u) else np.empty((0, 2))
+        self.delta = (coords[self.v] - self.start) if len(self.u) else np.empty((0, 2))
+        self._length_sq = np.einsum('ij,ij->i', self.delta, self.delta)
+
+        if not len(self.u):
+            self.origin = np.zeros(2)
+            self.cell_size = 1.0
+            self.shape = (1, 1)
+            self._cell_start = np.zeros(2, dtype=np.int64)
+            self._cell_items = np.empty(0, dtype=np.int64)
+            return
+
+        # 격자 범위/셀 크기: 전체 면적을 선분 수 / SEGMENTS_PER_CELL 개 셀로 나누되 평균 선분 길이보다 작지 않게
+        lo = np.minimum(self.start, self.start + self.delta)
+        hi = np.maximum(self.start, self.start + self.delta)
+        self.origin = lo.min(axis=0)
+        extent = np.maximum(hi.max(axis=0) - self.origin, 1e-9)
+        area_cell = math.sqrt(extent[0] * extent[1] * self.SEGMENTS_PER_CELL / len(self.u))
+        self.cell_size = max(area_cell, float(self.lengths.mean()), 1e-9)
+        self.shape = (int(extent[0] // self.cell_size) + 1, int(extent[1] // self.cell_size) + 1)
+
+        # 각 선분을 경계 상자가 겹치는 모든 셀에 등록
+        cell_lo = self._cell_of(lo)
+        cell_hi = self._cell_of(hi)
+        spans = cell_hi - cell_lo + 1
+        counts = spans[:, 0] * spans[:, 1]
+        segments = np.repeat(np.arange(len(self.u), dtype=np.int64), counts)
+        offsets = np.arange(counts.sum(), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        cx = cell_lo[segments, 0] + offsets % spans[segments, 0]
+        cy = cell_lo[segments, 1] + offsets // spans[segments, 0]
+        cells = cx * self.shape[1] + cy
+
+        order = np.argsort(cells, kind='stable')
+        self._cell_items = segments[order]
+        self._cell_start = np.searchsorted(cells[order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    # 지도 번들에 저장하는 배열 (이름 -> 속성)
+    ARRAYS = {
+        'u': 'u', 'v': 'v', 'lengths': 'lengths', 'components': 'components',
+        'start': 'start', 'delta': 'delta', 'length_sq': '_length_sq',
+        'cell_start': '_cell_start', 'cell_items': '_cell_items'
+    }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        to_arrays()로 저장한 배열로 색인 생성 (지도 번들에서 복사 없이 사용)
+
+        Args:
+            arrays: 이름 -> 배열 (ARRAYS 와 'grid', 'shape')
+        """
+        index = cls.__new__(cls)
+        for name, attr in cls.ARRAYS.items():
+            setattr(index, attr, arrays[name])
+        grid = arrays['grid']
+        index.origin = np.array(grid[:2], dtype=np.float64)
+        index.cell_size = float(grid[2])
+        index.shape = tuple(int(n) for n in arrays['shape'])
+        return index
+
+    def to_arrays(self):
+        """지도 번들에 저장할 배열 (from_arrays 참고)"""
+        arrays = {name: getattr(self, attr) for name, attr in self.ARRAYS.items()}
+        arrays['grid'] = np.array([self.origin[0], self.origin[1], self.cell_size], dtype=np.float64)
+        arrays['shape'] = np.array(self.shape, dtype=np.int64)
+        return arrays
+
+    def __len__(self):
+        return len(self.u)
+
+    @property
+    def nbytes(self):
+        """선분 배열 + 격자 메모리 사용량 (바이트)"""
+        return (self.u.nbytes + self.v.nbytes + self.lengths.nbytes + self.components.nbytes
+                + self.start.nbytes + self.delta.nbytes + self._length_sq.nbytes + self._cell_start.nbytes + self._cell_items.nbytes)
+
+    def _cell_of(self, points):
+        """좌표 배열의 격자 셀 (ix, iy), 격자 밖이면 가장자리 셀로 제한"""
+        cells = np.floor((np.asarray(points, dtype=np.float64) - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, np.array(self.shape) - 1)
+
+    def _ring(self, cx, cy, r):
+        """(cx, cy) 중심 반경 r 정사각형 테두리 셀에 등록된 선분 ID"""
+        nx, ny = self.shape
+        x0, x1 = max(cx - r, 0), min(cx + r, nx - 1)
+        y0, y1 = max(cy - r, 0), min(cy + r, ny - 1)
+        parts = []
+        for ix in range(x0, x1 + 1):
+            if ix in (cx - r, cx + r):
+                ys = range(y0, y1 + 1)
+            else:
+                ys = [y for y in (cy - r, cy + r) if y0 <= y <= y1]
+            for iy in ys:
+                cell = ix * ny + iy
+                parts.append(self._cell_items[self._cell_start[cell]:self._cell_start[cell + 1]])
+        return np.concatenate(parts) if parts else self._cell_items[:0]
+
+    def project(self, x, y, component=None):
+        """
+        가장 가까운 선분 위로 좌표를 투영
+
+        Args:
+            x, y: 좌표
+            component: 지정하면 해당 연결 요소의 선분 중에서만 검색
+
+        Returns:
+            tuple: (선분 ID, 선분 시작점 기준 비율 t (0~1), 투영점 (x, y), 거리)
+                   또는 선분이 없으면 None
+        """
+        if not len(self.u):
+            return None
+
+        point = np.array([x, y], dtype=np.float64)
+        cx, cy = self._cell_of(point).tolist()
+        nx, ny = self.shape
+        max_ring = max(cx, nx - 1 - cx, cy, ny - 1 - cy)
+
+        best = None
+        checked = set()
+        for r in range(max_ring + 1):
+            candidates = [s for s in np.unique(self._ring(cx, cy, r)).tolist() if s not in checked]
+            checked.update(candidates)
+            ids = np.array(candidates, dtype=np.int64)
+            if component is not None:
+                ids = ids[self.components[ids] == component]
+            if len(ids):
+                start, delta, length_sq = self.start[ids], self.delta[ids], self._length_sq[ids]
+                t = np.clip(np.einsum('ij,ij->i', point - start, delta) / np.where(length_sq > 0, length_sq, 1.0), 0.0, 1.0)
+                projected = start + t[:, None] * delta
+                distances = np.hypot(projected[:, 0] - x, projected[:, 1] - y)
+                i = int(np.argmin(distances))
+                # 거리가 같으면 ID가 작은 선분 (결과가 색인 순서에 좌우되지 않도록)
+                tied = ids[distances <= distances[i]]
+                i = int(np.flatnonzero(ids == tied.min())[0])
+                if best is None or distances[i] < best[3] or (distances[i] == best[3] and ids[i] < best[0]):
+                    best = (int(ids[i]), float(t[i]), (float(projected[i, 0]), float(projected[i, 1])), float(distances[i]))
+
+            # 아직 확인하지 않은 선분은 모두 반경 r 정사각형 밖 → 정사각형 경계까지 거리 이상
+            if best is not None:
+                lo = self.origin + (np.array([cx, cy]) - r) * self.cell_size
+                hi = self.origin + (np.array([cx, cy]) + r + 1) * self.cell_size
+                bound = min(x - lo[0], hi[0] - x, y - lo[1], hi[1] - y)
+                if best[3] <= bound:
+                    break
+        return best
+
+    def edge_point(self, projection):
+        """
+        투영 결과를 가상 노드 표현으로 변환
+
+        Returns:
+            tuple: (u, v, u까지 거리, v까지 거리) - RoadNetwork.virtual_path 의 출발/도착 지점
+        """
+        segment, t, _, _ = projection
+        length = float(self.lengths[segment])
+        return int(self.u[segment]), int(self.v[segment]), t * length, (1.0 - t) * length
@@ -0,0 +1,302 @@
+"""
+Semantic (embedding-similarity) answer cache
+Serves stored answers for paraphrased questions using a brute-force NumPy vector index
+"""
+import hashlib
+import threading
+import time
+from typing import Optional, List, Dict, Any, Tuple, Callable, Sequence
+import numpy as np
+from app.answer_cache import normalize_query
+from app.logger import get_logger
+
+logger = get_logger()
+
+# Embedding function: text -> vector (any length, normalized by the cache)
+EmbeddingFunction = Callable[[str], Sequence[float]]
+
+
+def make_gemini_embedder(get_client: Callable[[], Any], model: str = "gemini-embedding-001") -> EmbeddingFunction:
+    """
+    Build an embedding function backed by GeminiClient.embed_text
+
+    Args:
+        get_client: Callable returning the (shared) GeminiClient
+        model: Embedding model name
+
+    Returns:
+        Embedding function raising RuntimeError when the API call fails
+    """
+    def embed(text: str) -> Sequence[float]:
+        result = get_client().embed_text(text, model=model)
+        if not result['success']:
+            raise RuntimeError(result.get('error', 'Embedding failed'))
+        return result['embedding']
+    return embed
+
+
+def make_ngram_embedder(dim: int = 256, n: int = 2) -> EmbeddingFunction:
+    """
+    Build a deterministic character n-gram hashing embedder
+
+    Needs no network access, so it is useful for offline testing and
+    development. It only matches near-identical wording, not real paraphrases.
+
+    Args:
+        dim: Vector size
+        n: Character n-gram length
+    """
+    def embed(text: str) -> Sequence[float]:
+        text = normalize_query(text).replace(' ', '')
+        vector = np.zeros(dim, dtype=np.float32)
+        grams = [text[i:i + n] for i in range(max(1, len(text) - n + 1))]
+        for gram in grams:
+            digest = hashlib.md5(gram.encode('utf-8')).digest()
+            vector[int.from_bytes(digest[:4], 'little') % dim] += 1.0
+        return vector
+    return embed
+
+
+class SemanticAnswerCache:
+    """Thread-safe cache returning answers of previously asked, similar questions"""
+
+    def __init__(
+        self,
+        embed_fn: EmbeddingFunction,
+        threshold: float = 0.92,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            embed_fn: Function mapping a query text to an embedding vector
+            threshold: Minimum cosine similarity for a hit (0..1)
+            max_entries: Maximum number of indexed questions (LRU eviction)
+            ttl_seconds: Seconds an answer stays valid
+        """
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._dim = None
+        self._vectors = None                                     # (max_entries, dim) unit vectors
+        self._scope_ids = np.full(max_entries, -1, dtype=np.int64)   # -1 = free slot
+        self._expires_at = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._results: List[Optional[Dict[str, Any]]] = [None] * max_entries
+        # (stores, model) -> (store versions, scope id); only the latest versions are kept
+        self._scopes: Dict[Tuple, Tuple[Tuple, int]] = {}
+        self._next_scope_id = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.embedding_errors = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale = 0
+
+        logger.info(f"SemanticAnswerCache initialized - threshold: {threshold}, max_entries: {max_entries}, ttl: {ttl_seconds}s")
+
+    @staticmethod
+    def _make_scope(store_names: List[str], model: str, store_versions: Optional[Dict[str, int]]) -> Tuple:
+        stores = tuple(sorted(store_names))
+        store_versions = store_versions or {}
+        return (stores, model, tuple(store_versions.get(name, 0) for name in stores))
+
+    def _scope_id(self, scope: Tuple, create: bool = False) -> Optional[int]:
+        """
+        Resolve a scope to its id (caller holds the lock)
+
+        When the store versions differ from the ones recorded for the same stores and model,
+        the older scope and its answers are dropped, like stale entries in AnswerCache.
+
+        Args:
+            scope: Result of _make_scope
+            create: Allocate an id if the scope is unknown
+        """
+        key, versions = scope[:2], scope[2]
+        entry = self._scopes.get(key)
+        if entry is not None and entry[0] != versions:
+            del self._scopes[key]
+            self.stale += self._free_slots([entry[1]])
+            entry = None
+
+        if entry is None:
+            if not create:
+                return None
+            entry = self._scopes[key] = (versions, self._next_scope_id)
+            self._next_scope_id += 1
+        return entry[1]
+
+    def _free_slots(self, scope_ids: List[int]) -> int:
+        """Free every slot belonging to the given scope ids (caller holds the lock); returns the count"""
+        slots = np.flatnonzero(np.isin(self._scope_ids, scope_ids))
+        for slot in slots:
+            self._results[slot] = None
+        self._scope_ids[slots] = -1
+        self._last_used[slots] = 0.0
+        return int(slots.size)
+
+    def embed(self, query: str) -> Optional[np.ndarray]:
+        """
+        Embed a query as a unit vector
+
+        Returns:
+            Normalized float32 vector, or None if the embedding function failed
+        """
+        try:
+            vector = np.asarray(self.embed_fn(query), dtype=np.float32).ravel()
+        except Exception as e:
+            with self._lock:
+                self.embedding_errors += 1
+            logger.warning(f"SemanticAnswerCache embedding failed: {e}")
+            return None
+
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    def get(self, query: str, store_names: List[str], model: str,
+            store_versions: Optional[Dict[str, int]] = None,
+            embedding: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up the answer of the most similar cached question
+
+        Args:
+            query: Search query
+            store_names: Stores searched
+            model: Model name
+            store_versions: Current store versions; answers cached under older versions never match
+            embedding: Optional precomputed embedding from embed()
+
+        Returns:
+            Copy of the cached result with "semantic_similarity", or None on miss
+        """
+        if embedding is None:
+            embedding = self.embed(query)
+
+        scope = self._make_scope(store_names, model, store_versions)
+
+        with self._lock:
+            scope_id = self._scope_id(scope)
+            if embedding is None or scope_id is None or self._vectors is None or embedding.shape[0] != self._dim:
+                self.misses += 1
+                return None
+
+            now = time.monotonic()
+            candidates = np.flatnonzero((self._scope_ids == scope_id) & (self._expires_at > now))
+            if candidates.size == 0:
+                self.misses += 1
+                return None
+
+            similarities = self._vectors[candidates] @ embedding
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            slot = int(candidates[best])
+            self._last_used[slot] = now
+            self.hits += 1
+            result = dict(self._results[slot])
+
+        result['semantic_similarity'] = similarity
+        return result
+
+    def set(self, query: str, store_names: List[str], model: str, result: Dict[str, Any],
+            store_versions: Optional[Dict[str, int]] = None,
+            embedding: Optional[np.ndarray] = None) -> bool:
+        """
+        Index a successful search result under the query's embedding
+
+        Returns:
+            True if cached, False if the query could not be embedded
+        """
+        if embedding is None:
+            embedding = self.embed(query)
+        if embedding is None:
+            return False
+
+        scope = self._make_scope(store_names, model, store_versions)
+
+        with self._lock:
+            if self._vectors is None:
+                self._dim = embedding.shape[0]
+                self._vectors = np.zeros((self.max_entries, self._dim), dtype=np.float32)
+            elif embedding.shape[0] != self._dim:
+                logger.warning(f"SemanticAnswerCache dimension mismatch: {embedding.shape[0]} != {self._dim}")
+                return False
+
+            scope_id = self._scope_id(scope, create=True)
+
+            now = time.monotonic()
+            # Reuse a free or expired slot before evicting a live entry
+            free_slots = np.flatnonzero((self._scope_ids < 0) | (self._expires_at <= now))
+            if free_slots.size:
+                slot = int(free_slots[0])
+            else:
+                # Evict the least recently used entry
+                slot = int(np.argmin(self._last_used))
+                self.evictions += 1
+
+            self._vectors[slot] = embedding
+            self._scope_ids[slot] = scope_id
+            self._expires_at[slot] = now + self.ttl_seconds
+            self._last_used[slot] = now
+            self._results[slot] = dict(result)
+
+        return True
+
+    def invalidate_store(self, store_name: str) -> int:
+        """
+        Drop every cached answer that searched the given store
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._scopes if store_name in key[0]]
+            if not keys:
+                return 0
+
+            # Forget the scopes so the mapping does not grow with every store version
+            removed = self._free_slots([self._scopes.pop(key)[1] for key in keys])
+            self.invalidations += removed
+
+        if removed:
+            logger.info(f"SemanticAnswerCache invalidated {removed} entries for store {store_name}")
+        return removed
+
+    def clear(self):
+        """Remove all cached answers"""
+        with self._lock:
+            self._scope_ids[:] = -1
+            self._last_used[:] = 0.0
+            self._results = [None] * self.max_entries
+            self._scopes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters and size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": int(np.count_nonzero(self._scope_ids >= 0)),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "ttl_seconds": self.ttl_seconds,
+                "dimension": self._dim,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "embedding_errors": self.embedding_errors,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale": self.stale,
+                "scopes": len(self._scopes)
+            }
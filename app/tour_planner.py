@@ -0,0 +1,83 @@
+"""
+다중 경유지 방문 순서 계산
+첫 지점에서 출발해 나머지 지점을 한 번씩 방문하는 가장 짧은 순서(열린 경로 외판원 문제)를
+지점 간 도로 거리 행렬로 계산
+
+지점이 적으면 모든 순서를 확인해 최적 순서를, 많으면 최근접 이웃으로 초기 순서를 만든 뒤
+2-opt로 개선한 근사 순서를 반환합니다.
+"""
+import itertools
+import math
+
+# 모든 순서를 확인하는 최대 지점 수 (출발지 포함, 순서 수 = (n-1)!)
+EXACT_MAX_STOPS = 8
+
+
+def tour_length(distances, order):
+    """방문 순서의 총 거리"""
+    return sum(distances[a][b] for a, b in zip(order, order[1:]))
+
+
+def solve_tour(distances, keep_end=False):
+    """
+    첫 지점에서 출발해 모든 지점을 한 번씩 방문하는 순서
+
+    Args:
+        distances: (n, n) 지점 간 도로 거리 (대칭, 리스트의 리스트)
+        keep_end: 마지막 지점을 도착지로 고정
+
+    Returns:
+        tuple: (방문 순서 - 0으로 시작하는 지점 인덱스 리스트, 최적 순서 여부)
+    """
+    n = len(distances)
+    if n <= 2:
+        return list(range(n)), True
+
+    middle = list(range(1, n - 1 if keep_end else n))
+    tail = [n - 1] if keep_end else []
+
+    if n <= EXACT_MAX_STOPS:
+        best = min(itertools.permutations(middle), key=lambda perm: tour_length(distances, [0, *perm, *tail]))
+        return [0, *best, *tail], True
+
+    order = _nearest_neighbour(distances, middle) + tail
+    return _two_opt(distances, order, fixed_end=keep_end), False
+
+
+def _nearest_neighbour(distances, middle):
+    """최근접 이웃 초기 순서 (0에서 출발)"""
+    order = [0]
+    remaining = set(middle)
+    while remaining:
+        last = distances[order[-1]]
+        # 거리가 같으면 인덱스가 작은 지점 (입력 순서 유지)
+        nearest = min(remaining, key=lambda stop: (last[stop], stop))
+        order.append(nearest)
+        remaining.remove(nearest)
+    return order
+
+
+def _two_opt(distances, order, fixed_end=False):
+    """
+    2-opt 개선 (구간을 뒤집어 짧아지면 적용, 더 이상 개선이 없을 때까지)
+
+    첫 지점은 항상 고정하고, fixed_end이면 마지막 지점도 고정합니다.
+    거리가 대칭이므로 뒤집힌 구간 내부 거리는 변하지 않아 양 끝 간선만 비교합니다.
+    """
+    order = list(order)
+    last = len(order) - (2 if fixed_end else 1)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, last):
+            a, b = order[i - 1], order[i]
+            for j in range(i + 1, last + 1):
+                c = order[j]
+                d = order[j + 1] if j + 1 < len(order) else None
+                before = distances[a][b] + (distances[c][d] if d is not None else 0.0)
+                after = distances[a][c] + (distances[b][d] if d is not None else 0.0)
+                if after < before - 1e-9 and math.isfinite(after):
+                    order[i:j + 1] = reversed(order[i:j + 1])
+                    b = order[i]
+                    improved = True
+    return order
@@ -3,30 +3,73 @@
 올림픽공원 지도에서 최단 경로를 찾는 기능 제공
 """
 import json
-import networkx as nx
 import math
-import matplotlib
-matplotlib.use('Agg')  # GUI 없이 사용하기 위한 설정
-import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
+import hashlib
+import importlib.util
 from scipy.spatial import KDTree
 import numpy as np
-from matplotlib import font_manager, rc
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-from matplotlib.patches import Circle
 import platform
 import os
 from pathlib import Path
 import io
 import base64
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from app.logger import get_logger
+from app.route_cache import RouteCache
+from app.road_network import RoadNetwork, ROUTING_ALGORITHMS
+from app.facility_index import FacilityIndex
+from app.segment_index import SegmentIndex
+from app.tour_planner import solve_tour
+from app.distance_table import FacilityDistanceTable, DISTANCE_TABLE_FILENAME, compute_data_checksum
+from app.map_bundle import MapBundle, MAP_BUNDLE_FILENAME, write_bundle
 from PIL import Image, ImageDraw
 
 logger = get_logger()
 
+# NetworkX는 선택 의존성 (routing_engine='networkx' 일 때만 import)
+nx = None
+
+# matplotlib은 import 비용이 커서 matplotlib 렌더러를 처음 사용할 때 import
+# (pyplot의 전역 figure 관리자는 스레드 안전하지 않으므로 Figure + Agg 캔버스를 직접 사용)
+_matplotlib = None
+_import_lock = threading.Lock()
+
+
+def get_networkx():
+    """networkx 모듈 (최초 호출 시 import)"""
+    global nx
+    if nx is None:
+        with _import_lock:
+            if nx is None:
+                import networkx
+                nx = networkx
+    return nx
+
+
+def get_matplotlib():
+    """matplotlib 모듈 (최초 호출 시 Agg 백엔드 + 한글 폰트 설정 후 import)"""
+    global _matplotlib
+    if _matplotlib is None:
+        with _import_lock:
+            if _matplotlib is None:
+                import matplotlib
+                matplotlib.use('Agg')  # GUI 없이 사용하기 위한 설정
+                import matplotlib.image
+                from matplotlib.figure import Figure
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+                set_korean_font(matplotlib)
+                _matplotlib = matplotlib
+    return _matplotlib
+
+
 # 한글 폰트 설정
-def set_korean_font():
+def set_korean_font(matplotlib):
     """한글 폰트 설정 (깨짐 방지)"""
+    from matplotlib import font_manager, rc
+
     system_name = platform.system()
     if system_name == 'Windows':
         path = "c:/Windows/Fonts/malgun.ttf"
@@ -38,24 +81,90 @@ def set_korean_font():
                 pass
     elif system_name == 'Darwin':  # Mac
         rc('font', family='AppleGothic')
-    plt.rcParams['axes.unicode_minus'] = False
+    matplotlib.rcParams['axes.unicode_minus'] = False
+
+# 경로 이미지 렌더러: 'matplotlib' (기존 Figure 방식) 또는 'pillow' (캐시된 지도 이미지에 직접 그리기)
+RENDERERS = ('matplotlib', 'pillow')
+
+# 경로 응답 형식: 'image' (base64 PNG) 또는 'vector' (GeoJSON LineString, 브라우저에서 그리기)
+RESPONSE_FORMATS = ('image', 'vector')
+
+# 최단 경로 엔진: 'csgraph' (CSR 배열 + scipy.sparse.csgraph) 또는 'networkx' (기존 방식)
+ROUTING_ENGINES = ('csgraph', 'networkx')
+
+# 가까운 시설물 판단 기준: 'network' (도로 거리, 다중 목표 다익스트라) 또는 'straight' (직선 거리)
+NEAREST_MODES = ('network', 'straight')
+
+# 좌표 스냅 연결 요소: 'any' (가장 가까운 곳), 'largest' (가장 큰 연결 요소 안에서),
+# 'destination' (출발지를 도착지와 같은 연결 요소 안에서)
+SNAP_COMPONENTS = ('any', 'largest', 'destination')
+
+# 가까운 시설물 후보 최대 개수
+MAX_NEAREST_CANDIDATES = 10
+
+# 일괄 경로 찾기: 한 번의 다익스트라 호출에 묶을 출발 노드 수, 워커 풀을 사용할 최소 출발 노드 수
+BATCH_SOURCE_CHUNK = 16
+BATCH_PARALLEL_MIN_SOURCES = 2 * BATCH_SOURCE_CHUNK
+
+# 렌더러 프로세스 풀 워커의 서비스 인스턴스 (워커 프로세스마다 1개, 지도 이미지/마커를 따로 캐싱)
+_render_worker_service = None
+
+
+def _init_render_worker(map_dir, log_level):
+    """렌더러 프로세스 풀 워커 초기화 (로그 레벨은 부모 프로세스와 동일하게)"""
+    global _render_worker_service
+    get_logger().setLevel(log_level)
+    _render_worker_service = WayfindingService(map_dir=map_dir, route_cache_max_entries=0)
+
+
+def _render_in_worker(path, start_coords, end_coords, line_width, line_alpha, renderer):
+    """렌더러 프로세스 풀 워커에서 경로 이미지 생성"""
+    return _render_worker_service.render_route(path, start_coords, end_coords, line_width, line_alpha, renderer)
 
-set_korean_font()
 
 class WayfindingService:
     """길찾기 서비스 클래스"""
 
-    def __init__(self, map_dir='map'):
+    def __init__(self, map_dir='map', renderer='matplotlib', route_cache_max_entries=1024, route_cache_max_bytes=64 * 1024 * 1024,
+                 routing_engine='csgraph', routing_algorithm='astar', use_distance_table=True, use_map_bundle=True,
+                 render_processes=0, snap_to_edges=True, snap_component='any'):
         """
         초기화
         Args:
             map_dir: 지도 데이터가 있는 디렉토리 경로
+            renderer: 기본 경로 이미지 렌더러 ('matplotlib' 또는 'pillow')
+            routing_engine: 최단 경로 엔진 ('csgraph' 또는 'networkx')
+            routing_algorithm: 기본 최단 경로 알고리즘 ('dijkstra', 'astar', 'bidirectional_astar')
+            use_distance_table: 시설물 간 최단 거리 테이블 사용 (시설물 이름 기반 길찾기를 탐색 없이 처리)
+            use_map_bundle: 컴파일된 지도 번들이 있으면 JSON 대신 번들에서 로드
+            route_cache_max_entries: 경로/이미지 캐시 최대 항목 수
+            route_cache_max_bytes: 경로/이미지 캐시 메모리 상한 (바이트)
+            render_processes: 경로 이미지를 렌더링할 워커 프로세스 수 (0이면 요청 스레드에서 직접 렌더링)
+            snap_to_edges: 좌표 길찾기에서 클릭 좌표를 가장 가까운 도로 노드 대신 가장 가까운 도로 선분 위로 투영
+                           (csgraph 엔진에서만 사용)
+            snap_component: 좌표 스냅 시 연결 요소 제한 ('any', 'largest', 'destination')
         """
+        if renderer not in RENDERERS:
+            raise ValueError(f"Unknown renderer: {renderer} (available: {', '.join(RENDERERS)})")
+        if routing_engine not in ROUTING_ENGINES:
+            raise ValueError(f"Unknown routing engine: {routing_engine} (available: {', '.join(ROUTING_ENGINES)})")
+        if routing_engine == 'networkx' and importlib.util.find_spec('networkx') is None:
+            logger.warning("networkx is not installed - falling back to csgraph routing engine")
+            routing_engine = 'csgraph'
+        if routing_algorithm not in ROUTING_ALGORITHMS:
+            raise ValueError(f"Unknown routing algorithm: {routing_algorithm} (available: {', '.join(ROUTING_ALGORITHMS)})")
+        if snap_component not in SNAP_COMPONENTS:
+            raise ValueError(f"Unknown snap component: {snap_component} (available: {', '.join(SNAP_COMPONENTS)})")
+        if snap_to_edges and routing_engine == 'networkx':
+            logger.warning("Edge snapping requires the csgraph routing engine - snapping to road nodes")
+            snap_to_edges = False
         self.map_dir = Path(map_dir)
         self.map_image_path = self.map_dir / '올공맵.png'
         self.roads_geojson_path = self.map_dir / 'roads.geojson'
         self.facilities_json_path = self.map_dir / 'olympic_facilities.json'
         self.mascot_image_path = Path('static/images/mascot_profile.png')
+        self.distance_table_path = self.map_dir / DISTANCE_TABLE_FILENAME
+        self.map_bundle_path = self.map_dir / MAP_BUNDLE_FILENAME
 
         # 좌표 보정값
         self.CALIB_X_OFFSET = 33.0
@@ -66,13 +175,62 @@ class WayfindingService:
         # 거리 환산 (800 픽셀 = 2km)
         self.PIXEL_TO_KM = 2.0 / 800.0  # 1 픽셀 = 0.0025 km
 
-        # 캐시된 데이터
+        # 지도 좌표계 크기 (지도 이미지가 이 범위에 맞춰 그려짐)
+        self.MAP_WIDTH = 953
+        self.MAP_HEIGHT = 676
+
+        # Pillow 렌더러 출력 크기 상한 (matplotlib figsize=(10, 6), dpi=150 의 축 영역과 비슷하게)
+        self.RENDER_MAX_WIDTH = 1160
+        self.RENDER_MAX_HEIGHT = 690
+        self.RENDER_DPI = 150
+
+        self.renderer = renderer
+        self.routing_engine = routing_engine
+        self.routing_algorithm = routing_algorithm
+        self.use_distance_table = use_distance_table
+        self.use_map_bundle = use_map_bundle
+        self.render_processes = render_processes
+        self.snap_to_edges = snap_to_edges
+        self.snap_component = snap_component
+
+        # 캐시된 데이터 (_graph: csgraph 엔진이면 RoadNetwork, networkx 엔진이면 nx.Graph)
         self._graph = None
+        self._network = None
+        self._distance_table = None
+        self._facility_index = None
+        self._facility_nodes = None   # 시설물별 스냅된 도로 노드 ID
+        self._segment_index = None    # 도로 선분 격자 색인 (snap_to_edges)
+        self._component_trees = {}    # 연결 요소 -> (노드 ID 배열, KDTree) (snap_component)
+        self._map_bundle = None       # 번들에서 로드한 경우 mmap 버퍼를 유지
         self._facilities = None
         self._tree = None
         self._node_list = None
+        self._graph_lock = threading.Lock()
+        self._data_signature = None
+
+        # 노드 쌍별 최단 경로 및 렌더링된 이미지 캐시 (지도 데이터/보정값이 바뀌면 비움)
+        self.route_cache = RouteCache(max_entries=route_cache_max_entries, max_bytes=route_cache_max_bytes)
+
+        # 알고리즘별 경로 탐색 횟수/확장 노드 수 (캐시 미스로 실제 탐색한 경우만)
+        self._routing_stats_lock = threading.Lock()
+        self._routing_stats = {}
+
+        # 디코딩된 지도 이미지 캐시 (요청마다 PNG를 다시 읽지 않도록)
+        self._map_lock = threading.Lock()
+        self._map_array = None   # matplotlib용 NumPy 배열
+        self._map_image = None   # Pillow용 RGB 이미지 (흰 배경 합성)
 
-        logger.info(f"WayfindingService initialized with map_dir: {map_dir}")
+        # 출발/도착 마커 스프라이트 캐시 (결과가 항상 같으므로 색상/크기별 1회만 생성)
+        self._marker_lock = threading.Lock()
+        self._marker_sprites = {}   # (border_color, size) -> 읽기 전용 RGBA 배열
+        self._marker_images = {}    # (border_color, size, display_size) -> Pillow RGBA 이미지
+
+        # 렌더러 프로세스 풀 (render_processes > 0 일 때 최초 렌더링 시 생성)
+        self._render_pool = None
+        self._render_pool_lock = threading.Lock()
+
+        logger.info(f"WayfindingService initialized with map_dir: {map_dir}, renderer: {renderer}, "
+                    f"routing_engine: {routing_engine}, routing_algorithm: {routing_algorithm}")
 
     def create_circular_mascot(self, border_color, size=100):
         """원형 액자에 마스코트 이미지를 넣어서 반환"""
@@ -120,20 +278,144 @@ class WayfindingService:
             logger.error(f"Failed to create circular mascot: {e}")
             return None
 
+    def get_marker_sprite(self, border_color, size=50):
+        """
+        원형 마스코트 마커 반환 (최초 1회 생성 후 재사용)
+
+        Args:
+            border_color: 테두리 색상
+            size: 마스코트 크기 (픽셀)
+
+        Returns:
+            np.ndarray: 읽기 전용 RGBA 배열, 생성 실패 시 None
+        """
+        key = (border_color, size)
+        sprite = self._marker_sprites.get(key)
+        if sprite is not None:
+            return sprite
+
+        with self._marker_lock:
+            sprite = self._marker_sprites.get(key)
+            if sprite is None:
+                sprite = self.create_circular_mascot(border_color, size=size)
+                if sprite is None:
+                    return None
+                # 여러 요청이 공유하므로 실수로 수정되지 않도록 고정
+                sprite.setflags(write=False)
+                self._marker_sprites[key] = sprite
+        return sprite
+
+    def get_marker_image(self, border_color, size, display_size):
+        """
+        Pillow 렌더러용 마커 이미지 반환 (표시 크기로 리사이즈해 재사용)
+
+        Args:
+            border_color: 테두리 색상
+            size: 마스코트 크기 (픽셀)
+            display_size: 출력 이미지에서의 마커 크기 (픽셀)
+
+        Returns:
+            PIL.Image: RGBA 이미지 (수정하지 말 것), 생성 실패 시 None
+        """
+        key = (border_color, size, display_size)
+        image = self._marker_images.get(key)
+        if image is not None:
+            return image
+
+        sprite = self.get_marker_sprite(border_color, size)
+        if sprite is None:
+            return None
+
+        image = Image.fromarray(sprite).resize((display_size, display_size), Image.Resampling.BILINEAR)
+        with self._marker_lock:
+            self._marker_images.setdefault(key, image)
+        return self._marker_images[key]
+
+    def get_data_signature(self):
+        """
+        지도 데이터 파일과 좌표 보정값의 현재 상태
+
+        roads.geojson / 시설물 / 지도 이미지가 수정되거나 보정 상수가 바뀌면 값이 달라집니다.
+        """
+        def file_state(path):
+            try:
+                stat = os.stat(path)
+                return stat.st_mtime_ns, stat.st_size
+            except OSError:
+                return None
+
+        return (
+            file_state(self.roads_geojson_path),
+            file_state(self.facilities_json_path),
+            file_state(self.map_image_path),
+            file_state(self.map_bundle_path),
+            self.CALIB_X_OFFSET, self.CALIB_Y_OFFSET,
+            self.CALIB_X_SCALE, self.CALIB_Y_SCALE
+        )
+
+    def get_source_state(self):
+        """
+        체크섬 계산 대상(도로망/시설물 파일 + 보정값)의 현재 상태 (지도 번들 최신 여부 빠른 확인용)
+
+        Returns:
+            list: JSON으로 저장 가능한 [[mtime_ns, size], [mtime_ns, size], 보정값] 또는 파일이 없으면 None
+        """
+        try:
+            files = [[stat.st_mtime_ns, stat.st_size] for stat in
+                     (os.stat(self.roads_geojson_path), os.stat(self.facilities_json_path))]
+        except OSError:
+            return None
+        return files + [[self.CALIB_X_OFFSET, self.CALIB_Y_OFFSET, self.CALIB_X_SCALE, self.CALIB_Y_SCALE]]
+
+    def get_data_checksum(self):
+        """도로망/시설물 파일 내용과 보정값의 체크섬 (시설물 거리 테이블 유효성 확인용)"""
+        return compute_data_checksum(
+            self.roads_geojson_path,
+            self.facilities_json_path,
+            (self.CALIB_X_OFFSET, self.CALIB_Y_OFFSET, self.CALIB_X_SCALE, self.CALIB_Y_SCALE)
+        )
+
     def load_graph_data(self):
-        """도로망 그래프 및 시설물 데이터 로드 (캐싱)"""
-        if self._graph is not None:
+        """도로망 그래프 및 시설물 데이터 로드 (캐싱, 지도 데이터가 바뀌면 다시 로드)"""
+        signature = self.get_data_signature()
+        if self._graph is not None and signature == self._data_signature:
             return self._graph, self._facilities, self._tree, self._node_list
 
+        with self._graph_lock:
+            if self._graph is not None and signature == self._data_signature:
+                return self._graph, self._facilities, self._tree, self._node_list
+
+            if self._data_signature is not None:
+                # 지도 데이터 또는 보정값 변경 -> 그래프/지도 이미지/경로 캐시 모두 무효화
+                logger.info("Map data or calibration changed - reloading graph and clearing route cache")
+                self._graph = None
+                with self._map_lock:
+                    self._map_array = None
+                    self._map_image = None
+                self.route_cache.clear()
+
+            result = self._load_graph_data()
+            if result[0] is not None:
+                self._data_signature = signature
+            return result
+
+    def _load_graph_data(self):
+        """도로망 그래프 및 시설물 데이터 파일 읽기"""
         logger.info("Loading graph data...")
 
+        # 0) 컴파일된 지도 번들이 최신이면 JSON 파싱 없이 mmap으로 로드
+        if self.use_map_bundle:
+            result = self._load_map_bundle()
+            if result is not None:
+                return result
+
         # 1) 시설물 데이터 확인
         if not self.facilities_json_path.exists():
             logger.error(f"Facilities file not found: {self.facilities_json_path}")
             return None, None, None, None
 
         with open(self.facilities_json_path, 'r', encoding='utf-8') as f:
-            self._facilities = json.load(f)
+            facilities = json.load(f)
 
         # 2) 도로망 데이터 확인
         if not self.roads_geojson_path.exists():
@@ -143,8 +425,8 @@ class WayfindingService:
         with open(self.roads_geojson_path, 'r', encoding='utf-8') as f:
             geo_data = json.load(f)
 
-        # 3) NetworkX 그래프 생성
-        G = nx.Graph()
+        # 3) 도로 선분 추출
+        segments = []
         for feature in geo_data['features']:
             coords = feature['geometry']['coordinates']
 
@@ -161,40 +443,218 @@ class WayfindingService:
                 adjusted_coords.append((final_x, final_y))
 
             # 노드와 엣지(Link) 추가
-            for i in range(len(adjusted_coords) - 1):
-                u = adjusted_coords[i]
-                v = adjusted_coords[i + 1]
+            segments.extend(zip(adjusted_coords, adjusted_coords[1:]))
 
-                # 가중치(거리) 계산
-                dist = math.hypot(u[0] - v[0], u[1] - v[1])
-
-                G.add_edge(u, v, weight=dist)
-                G.nodes[u]['pos'] = u
-                G.nodes[v]['pos'] = v
-
-        # 4) 빠른 검색을 위한 KDTree 생성
-        nodes = list(G.nodes)
-        if not nodes:
+        # 4) 정수 노드 ID + CSR 인접 행렬로 변환 (노드 순서는 NetworkX 그래프와 동일)
+        network = RoadNetwork.from_segments(segments)
+        if not len(network):
             logger.error("No nodes found in graph")
             return None, None, None, None
 
-        self._tree = KDTree(np.array(nodes))
+        return self._set_graph_data(network, facilities, self.get_data_checksum())
+
+    def _load_map_bundle(self):
+        """
+        컴파일된 지도 번들에서 로드 (python -m app.map_bundle 로 생성)
+
+        원본 파일의 수정 시각/크기가 번들을 만들 때와 같으면 체크섬 계산(파일 전체 해시)을 생략하고,
+        다르면 체크섬으로 내용이 바뀌었는지 확인합니다.
+
+        Returns:
+            load_graph_data() 결과 튜플 또는 번들이 없거나 오래되었으면 None
+        """
+        bundle = MapBundle.open(self.map_bundle_path)
+        if bundle is None:
+            return None
+
+        # 원본 JSON 없이 번들만 배포된 경우 최신 여부 확인 생략
+        source_state = self.get_source_state()
+        if source_state is not None and source_state != bundle.metadata.get('source_state'):
+            try:
+                checksum = self.get_data_checksum()
+            except OSError:
+                checksum = bundle.checksum
+            if checksum != bundle.checksum:
+                logger.warning(f"Map bundle is stale: {self.map_bundle_path} (run: python -m app.map_bundle)")
+                bundle.close()
+                return None
+
+        def arrays(prefix):
+            return {name[len(prefix):]: bundle.array(name) for name in bundle.names() if name.startswith(prefix)}
+
+        network = RoadNetwork.from_arrays(
+            bundle.array('coords'), bundle.array('indptr'), bundle.array('indices'), bundle.array('weights'),
+            components=bundle.array('components')
+        )
+        facility_nodes = bundle.array('facility_nodes')
+        facility_index = FacilityIndex.from_arrays(bundle.metadata['facilities'], arrays('facility_'),
+                                                   bundle.metadata['facility_keys'])
+        segment_index = SegmentIndex.from_arrays(arrays('segment_')) if self.snap_to_edges else None
+
+        distance_table = None
+        if self.use_distance_table and 'table_distances' in bundle:
+            distance_table = FacilityDistanceTable(
+                bundle.checksum,
+                facility_nodes,
+                bundle.array('table_source_nodes'),
+                bundle.array('table_facility_rows'),
+                bundle.array('table_distances'),
+                bundle.array('table_predecessors')
+            )
+
+        self._map_bundle = bundle
+        return self._set_graph_data(network, bundle.metadata['facilities'], bundle.checksum,
+                                    facility_nodes=facility_nodes, distance_table=distance_table,
+                                    facility_index=facility_index, segment_index=segment_index)
+
+    def _set_graph_data(self, network, facilities, checksum, facility_nodes=None, distance_table=None,
+                        facility_index=None, segment_index=None):
+        """
+        도로망/시설물로 검색 구조를 만들고 캐시에 설정
+
+        Args:
+            network: RoadNetwork
+            facilities: 시설물 dict 리스트
+            checksum: 지도 데이터 체크섬 (시설물 거리 테이블 유효성 확인용)
+            facility_nodes: 시설물별 스냅된 도로 노드 ID (None이면 계산)
+            distance_table: 시설물 간 거리 테이블 (None이면 파일에서 읽거나 계산)
+            facility_index: 시설물 검색 인덱스 (None이면 계산)
+            segment_index: 도로 선분 격자 색인 (None이면 snap_to_edges일 때 계산)
+        """
+        if self.routing_engine == 'networkx':
+            G = self._build_networkx_graph(network)
+        else:
+            G = network
+
+        # 5) 빠른 검색을 위한 KDTree 생성 (KDTree 인덱스 = 노드 ID)
+        nodes = network.path_coords(np.arange(len(network)))
+        tree = KDTree(network.coords)
+
+        # 6) 시설물 검색 인덱스 (이름/카테고리/좌표/이름 n-gram) 및 시설물별 스냅된 도로 노드
+        if facility_index is None:
+            facility_index = FacilityIndex(facilities)
+        if facility_nodes is None:
+            if len(facility_index):
+                _, facility_nodes = tree.query(facility_index.coords)
+                facility_nodes = np.asarray(facility_nodes, dtype=np.int64)
+            else:
+                facility_nodes = np.empty(0, dtype=np.int64)
+
+        # 7) 좌표를 도로 선분 위로 투영하기 위한 선분 격자 색인
+        if segment_index is None and self.snap_to_edges:
+            segment_index = SegmentIndex(network)
+
+        # 8) 시설물 간 최단 거리 테이블 (미리 빌드된 파일이 최신이면 읽고, 아니면 메모리에서 계산)
+        if distance_table is None and self.use_distance_table and facilities:
+            distance_table = FacilityDistanceTable.load(self.distance_table_path, checksum, len(network))
+            if distance_table is None:
+                distance_table = FacilityDistanceTable.build(network, facility_nodes, checksum)
+
+        # 그래프를 마지막에 설정 (다른 스레드가 절반만 준비된 데이터를 보지 않도록)
+        self._facilities = facilities
+        self._tree = tree
         self._node_list = nodes
+        self._network = network
+        self._facility_index = facility_index
+        self._facility_nodes = facility_nodes
+        self._segment_index = segment_index
+        self._component_trees = {}
+        self._distance_table = distance_table
         self._graph = G
 
-        logger.info(f"Graph loaded: {len(nodes)} nodes, {len(G.edges)} edges")
+        logger.info(f"Graph loaded ({self.routing_engine}): {len(network)} nodes, {network.edge_count} edges, "
+                    f"{network.component_count} connected components")
         return self._graph, self._facilities, self._tree, self._node_list
 
-    def calculate_path_bounds_and_zoom(self, ax, path, start_coords, end_coords, margin_percent=0.2):
+    def build_distance_table(self):
         """
-        경로의 범위를 계산하고 해당 영역으로 확대
+        현재 지도 데이터로 시설물 간 최단 거리 테이블 계산 (python -m app.distance_table 에서 사용)
+
+        Returns:
+            FacilityDistanceTable 또는 지도 데이터를 읽을 수 없으면 None
+        """
+        G, facilities, _, _ = self.load_graph_data()
+        if not G or not facilities:
+            return None
+        return FacilityDistanceTable.build(self._network, self._facility_nodes, self.get_data_checksum())
+
+    def get_facility_index(self):
+        """시설물 검색 인덱스 (지도 데이터를 읽을 수 없으면 None)"""
+        G, _, _, _ = self.load_graph_data()
+        return self._facility_index if G else None
+
+    def build_map_bundle(self):
+        """
+        현재 지도 데이터를 컴파일된 지도 번들로 저장 (python -m app.map_bundle 에서 사용)
+
+        Returns:
+            bool: 저장 성공 여부
+        """
+        G, facilities, _, _ = self.load_graph_data()
+        if not G:
+            return False
+
+        network = self._network
+        checksum = self.get_data_checksum()
+        arrays = {
+            'coords': network.coords,
+            'indptr': network.adjacency.indptr,
+            'indices': network.adjacency.indices,
+            'weights': network.adjacency.data,
+            'components': network.components,
+            'facility_nodes': self._facility_nodes
+        }
+        facility_arrays, facility_keys = self._facility_index.to_arrays()
+        arrays.update({f'facility_{name}': array for name, array in facility_arrays.items()})
+        segment_index = self._segment_index if self._segment_index is not None else SegmentIndex(network)
+        arrays.update({f'segment_{name}': array for name, array in segment_index.to_arrays().items()})
+        table = self._distance_table
+        if table is None and facilities:
+            table = FacilityDistanceTable.build(network, self._facility_nodes, checksum)
+        if table is not None:
+            arrays.update({
+                'table_source_nodes': table.source_nodes,
+                'table_facility_rows': table.facility_rows,
+                'table_distances': table.distances,
+                'table_predecessors': table.predecessors
+            })
+
+        metadata = {
+            'facilities': facilities,
+            'facility_keys': facility_keys,
+            'source_state': self.get_source_state()
+        }
+        write_bundle(self.map_bundle_path, checksum, arrays, metadata)
+        return True
+
+    def _build_networkx_graph(self, network):
+        """도로망으로 NetworkX 그래프 생성 (routing_engine='networkx')"""
+        nx = get_networkx()
+        G = nx.Graph()
+        nodes = network.path_coords(np.arange(len(network)))
+        G.add_nodes_from((node, {'pos': node}) for node in nodes)
+
+        # CSR에는 양방향 간선이 모두 있으므로 u < v 인 간선만 추가
+        adjacency = network.adjacency
+        for u in range(len(network)):
+            for k in range(adjacency.indptr[u], adjacency.indptr[u + 1]):
+                v = adjacency.indices[k]
+                if u < v:
+                    G.add_edge(nodes[u], nodes[v], weight=float(adjacency.data[k]))
+        return G
+
+    def calculate_path_bounds(self, path, start_coords, end_coords, margin_percent=0.2):
+        """
+        경로가 모두 보이도록 여백을 포함한 표시 범위 계산
 
         Args:
-            ax: matplotlib axis 객체
             path: 경로 좌표 리스트
             start_coords: 출발지 좌표 (x, y)
             end_coords: 도착지 좌표 (x, y)
             margin_percent: 여백 비율 (기본 20%)
+
+        Returns:
+            tuple: (min_x, max_x, min_y, max_y) 지도 좌표계 기준
         """
         # 경로의 모든 좌표 수집
         all_x = [p[0] for p in path] + [start_coords[0], end_coords[0]]
@@ -226,11 +686,522 @@ class WayfindingService:
         margin_x = range_x * margin_percent
         margin_y = range_y * margin_percent
 
+        logger.info(f"Zoom bounds calculated: x=({min_x-margin_x:.1f}, {max_x+margin_x:.1f}), y=({min_y-margin_y:.1f}, {max_y+margin_y:.1f})")
+        return min_x - margin_x, max_x + margin_x, min_y - margin_y, max_y + margin_y
+
+    def calculate_path_bounds_and_zoom(self, ax, path, start_coords, end_coords, margin_percent=0.2):
+        """
+        경로의 범위를 계산하고 해당 영역으로 확대
+
+        Args:
+            ax: matplotlib axis 객체
+            path: 경로 좌표 리스트
+            start_coords: 출발지 좌표 (x, y)
+            end_coords: 도착지 좌표 (x, y)
+            margin_percent: 여백 비율 (기본 20%)
+        """
+        min_x, max_x, min_y, max_y = self.calculate_path_bounds(path, start_coords, end_coords, margin_percent)
+
         # 확대 범위 설정
-        ax.set_xlim(min_x - margin_x, max_x + margin_x)
-        ax.set_ylim(max_y + margin_y, min_y - margin_y)  # Y축은 반전
+        ax.set_xlim(min_x, max_x)
+        ax.set_ylim(max_y, min_y)  # Y축은 반전
 
-        logger.info(f"Zoom bounds calculated: x=({min_x-margin_x:.1f}, {max_x+margin_x:.1f}), y=({min_y-margin_y:.1f}, {max_y+margin_y:.1f})")
+    def build_route_vector(self, path, start_coords, end_coords):
+        """
+        경로를 브라우저에서 직접 그릴 수 있는 벡터 데이터로 변환
+
+        Args:
+            path: 경로 좌표 리스트
+            start_coords: 출발지 좌표 (x, y)
+            end_coords: 도착지 좌표 (x, y)
+
+        Returns:
+            dict: {
+                'route': GeoJSON LineString (지도 좌표계, 이미지 픽셀 기준 y 아래 방향),
+                'bounds': 경로 확대 범위 {'min_x', 'max_x', 'min_y', 'max_y'},
+                'map_size': 지도 좌표계 크기 {'width', 'height'}
+            }
+        """
+        min_x, max_x, min_y, max_y = self.calculate_path_bounds(path, start_coords, end_coords)
+        return {
+            'route': {
+                'type': 'LineString',
+                'coordinates': [[round(float(x), 2), round(float(y), 2)] for x, y in path]
+            },
+            'bounds': {
+                'min_x': round(float(min_x), 2),
+                'max_x': round(float(max_x), 2),
+                'min_y': round(float(min_y), 2),
+                'max_y': round(float(max_y), 2)
+            },
+            'map_size': {'width': self.MAP_WIDTH, 'height': self.MAP_HEIGHT}
+        }
+
+    def _load_map_array(self):
+        """matplotlib 렌더러용 지도 이미지 배열 (최초 1회 디코딩 후 캐싱)"""
+        if self._map_array is None:
+            with self._map_lock:
+                if self._map_array is None:
+                    self._map_array = get_matplotlib().image.imread(str(self.map_image_path))
+        return self._map_array
+
+    def _load_map_image(self):
+        """Pillow 렌더러용 지도 이미지 (최초 1회 디코딩, 흰 배경 합성 후 캐싱)"""
+        if self._map_image is None:
+            with self._map_lock:
+                if self._map_image is None:
+                    image = Image.open(str(self.map_image_path)).convert('RGBA')
+                    background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+                    map_image = Image.alpha_composite(background, image).convert('RGB')
+                    map_image.load()
+                    self._map_image = map_image
+        return self._map_image
+
+    def render_route(self, path, start_coords, end_coords, line_width=2, line_alpha=0.5, renderer=None):
+        """
+        지도 위에 경로와 출발/도착 마커를 그려 base64 PNG로 반환
+
+        Args:
+            path: 경로 좌표 리스트
+            start_coords: 출발지 좌표 (x, y) - 확대 범위 계산용
+            end_coords: 도착지 좌표 (x, y) - 확대 범위 계산용
+            line_width: 경로 선 두께 (포인트)
+            line_alpha: 경로 선 투명도
+            renderer: 'matplotlib' 또는 'pillow' (None이면 서비스 기본값)
+
+        Returns:
+            str: base64 인코딩된 PNG, 지도 이미지를 읽을 수 없으면 None
+        """
+        renderer = renderer or self.renderer
+        if renderer not in RENDERERS:
+            raise ValueError(f"Unknown renderer: {renderer} (available: {', '.join(RENDERERS)})")
+
+        # 같은 경로/렌더링 옵션이면 인코딩된 이미지를 재사용
+        # (양 끝이 같아도 경유지가 다르면 그림이 다르므로 경로 좌표 전체의 해시를 키로 사용,
+        #  확대 범위가 출발/도착 좌표에 따라 달라지므로 좌표도 키에 포함)
+        path_digest = hashlib.blake2b(np.asarray(path, dtype=np.float64).tobytes(), digest_size=16).digest()
+        key = (
+            'image', path_digest, len(path), renderer, line_width, line_alpha,
+            (round(start_coords[0], 1), round(start_coords[1], 1)),
+            (round(end_coords[0], 1), round(end_coords[1], 1))
+        )
+        image_base64 = self.route_cache.get(key)
+        if image_base64 is not None:
+            return image_base64
+
+        if self.render_processes > 0:
+            # GIL을 나눠 쓰지 않도록 워커 프로세스에서 렌더링 (지도 로드 실패 시 워커가 None 반환)
+            image_base64 = self._get_render_pool().submit(
+                _render_in_worker, [tuple(point) for point in path], tuple(start_coords), tuple(end_coords),
+                line_width, line_alpha, renderer
+            ).result()
+            if image_base64 is None:
+                return None
+        else:
+            try:
+                if renderer == 'pillow':
+                    self._load_map_image()
+                else:
+                    self._load_map_array()
+            except Exception as e:
+                logger.error(f"Failed to load map image: {e}")
+                return None
+
+            if renderer == 'pillow':
+                image_base64 = self._render_route_pillow(path, start_coords, end_coords, line_width, line_alpha)
+            else:
+                image_base64 = self._render_route_matplotlib(path, start_coords, end_coords, line_width, line_alpha)
+
+        self.route_cache.set(key, image_base64, len(image_base64))
+        return image_base64
+
+    def _get_render_pool(self):
+        """렌더러 프로세스 풀 (최초 호출 시 생성)"""
+        if self._render_pool is None:
+            with self._render_pool_lock:
+                if self._render_pool is None:
+                    # 요청 스레드가 여러 개인 상태에서 fork하지 않도록 spawn 사용
+                    self._render_pool = ProcessPoolExecutor(
+                        max_workers=self.render_processes,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_render_worker,
+                        initargs=(str(self.map_dir), logger.level)
+                    )
+                    logger.info(f"Render process pool started: {self.render_processes} workers")
+        return self._render_pool
+
+    def _render_route_matplotlib(self, path, start_coords, end_coords, line_width, line_alpha):
+        """
+        matplotlib Figure로 경로 이미지 생성
+
+        pyplot을 거치지 않고 요청마다 Figure와 Agg 캔버스를 직접 만들어 전역 상태를 공유하지 않으므로
+        여러 요청 스레드에서 동시에 호출할 수 있습니다.
+        """
+        get_matplotlib()  # Agg 백엔드/한글 폰트 설정
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+
+        img = self._load_map_array()
+
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+        ax.imshow(img, extent=[0, self.MAP_WIDTH, self.MAP_HEIGHT, 0])
+
+        # 경로 그리기
+        path_x = [p[0] for p in path]
+        path_y = [p[1] for p in path]
+
+        ax.plot(path_x, path_y, color='red', linewidth=line_width, label='추천 경로', alpha=line_alpha)
+
+        # 출발지/도착지 표시 (경로의 시작점과 끝점에 원형 액자 마스코트)
+        path_start = path[0]  # 경로 시작점
+        path_end = path[-1]   # 경로 끝점
+
+        if self.mascot_image_path.exists():
+            # 출발지 원형 마스코트 (파란색 테두리)
+            start_mascot = self.get_marker_sprite('#3399ff', size=50)
+            if start_mascot is not None:
+                imagebox_start = OffsetImage(start_mascot, zoom=0.5)
+                ab_start = AnnotationBbox(imagebox_start, path_start, frameon=False,
+                                          box_alignment=(0.5, 0.5))
+                ax.add_artist(ab_start)
+            else:
+                ax.scatter(*path_start, color='#3399ff', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
+
+            # 도착지 원형 마스코트 (초록색 테두리)
+            end_mascot = self.get_marker_sprite('#33ff99', size=50)
+            if end_mascot is not None:
+                imagebox_end = OffsetImage(end_mascot, zoom=0.5)
+                ab_end = AnnotationBbox(imagebox_end, path_end, frameon=False,
+                                       box_alignment=(0.5, 0.5))
+                ax.add_artist(ab_end)
+            else:
+                ax.scatter(*path_end, color='#33ff99', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
+        else:
+            # 마스코트 파일이 없으면 원으로 표시
+            ax.scatter(*path_start, color='#3399ff', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
+            ax.scatter(*path_end, color='#33ff99', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
+
+        # 경로 범위로 자동 확대
+        self.calculate_path_bounds_and_zoom(ax, path, start_coords, end_coords)
+
+        # 꾸미기
+        ax.axis('off')
+
+        # 이미지를 base64로 인코딩
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', bbox_inches='tight', dpi=self.RENDER_DPI)
+        buf.seek(0)
+        image_base64 = base64.b64encode(buf.read()).decode('utf-8')
+        return image_base64
+
+    def _render_route_pillow(self, path, start_coords, end_coords, line_width, line_alpha):
+        """
+        캐시된 지도 이미지를 경로 범위로 잘라 Pillow로 직접 그리기
+
+        matplotlib Figure 생성/래스터화 없이 잘라낸 영역만 리샘플링하므로
+        요청당 시간과 메모리 사용량이 훨씬 적습니다.
+        """
+        map_image = self._load_map_image()
+        min_x, max_x, min_y, max_y = self.calculate_path_bounds(path, start_coords, end_coords)
+
+        # 지도 좌표 -> 출력 픽셀 배율 (출력 크기 상한에 맞춤, 종횡비 유지)
+        scale = min(self.RENDER_MAX_WIDTH / (max_x - min_x), self.RENDER_MAX_HEIGHT / (max_y - min_y))
+        out_w = max(1, int(round((max_x - min_x) * scale)))
+        out_h = max(1, int(round((max_y - min_y) * scale)))
+
+        # 지도 좌표 -> 원본 이미지 픽셀 배율
+        src_sx = map_image.width / self.MAP_WIDTH
+        src_sy = map_image.height / self.MAP_HEIGHT
+
+        # 지도 범위를 벗어난 부분은 흰 배경으로 남기고 겹치는 영역만 리샘플링
+        canvas = Image.new('RGB', (out_w, out_h), (255, 255, 255))
+        vis_x0, vis_x1 = max(min_x, 0.0), min(max_x, float(self.MAP_WIDTH))
+        vis_y0, vis_y1 = max(min_y, 0.0), min(max_y, float(self.MAP_HEIGHT))
+        if vis_x1 > vis_x0 and vis_y1 > vis_y0:
+            dst_x0 = int(round((vis_x0 - min_x) * scale))
+            dst_y0 = int(round((vis_y0 - min_y) * scale))
+            dst_w = max(1, int(round((vis_x1 - min_x) * scale)) - dst_x0)
+            dst_h = max(1, int(round((vis_y1 - min_y) * scale)) - dst_y0)
+            region = map_image.resize(
+                (dst_w, dst_h),
+                Image.Resampling.BILINEAR,
+                box=(vis_x0 * src_sx, vis_y0 * src_sy, vis_x1 * src_sx, vis_y1 * src_sy)
+            )
+            canvas.paste(region, (dst_x0, dst_y0))
+
+        def to_pixel(point):
+            return ((point[0] - min_x) * scale, (point[1] - min_y) * scale)
+
+        # 경로 그리기 (반투명 빨간 선, 두께는 matplotlib 포인트 기준으로 환산)
+        px_per_pt = self.RENDER_DPI / 72.0
+        overlay = Image.new('RGBA', (out_w, out_h), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+        points = [to_pixel(p) for p in path]
+        if len(points) > 1:
+            draw.line(points, fill=(255, 0, 0, int(255 * line_alpha)),
+                      width=max(1, int(round(line_width * px_per_pt))), joint='curve')
+
+        # 출발지/도착지 표시 (경로의 시작점과 끝점에 원형 액자 마스코트)
+        for point, color in ((path[0], '#3399ff'), (path[-1], '#33ff99')):
+            cx, cy = to_pixel(point)
+            marker = self.get_marker_sprite(color, size=50) if self.mascot_image_path.exists() else None
+            if marker is not None:
+                # OffsetImage(zoom=0.5)와 같은 표시 크기
+                marker_size = max(1, int(round(marker.shape[1] * 0.5 * px_per_pt)))
+                sprite = self.get_marker_image(color, 50, marker_size)
+                overlay.alpha_composite(sprite, (int(round(cx - marker_size / 2)), int(round(cy - marker_size / 2))))
+            else:
+                # 마스코트가 없으면 흰 테두리 원으로 표시 (scatter s=250 과 같은 크기)
+                radius = math.sqrt(250) / 2 * px_per_pt
+                draw.ellipse((cx - radius, cy - radius, cx + radius, cy + radius),
+                             fill=color, outline='white', width=int(round(3 * px_per_pt)))
+
+        result = Image.alpha_composite(canvas.convert('RGBA'), overlay).convert('RGB')
+
+        # 이미지를 base64로 인코딩
+        buf = io.BytesIO()
+        result.save(buf, format='PNG', compress_level=3)
+        return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+    def shortest_path(self, start_node, end_node, algorithm=None):
+        """
+        두 도로 노드 사이 최단 경로 (노드 쌍별 캐시)
+
+        도로망은 양방향이므로 (A, B)와 (B, A)는 같은 캐시 항목을 사용합니다.
+        알고리즘과 관계없이 경로 길이는 같으므로 캐시도 공유합니다.
+
+        Args:
+            start_node: 출발 노드 좌표
+            end_node: 도착 노드 좌표
+            algorithm: 'dijkstra', 'astar', 'bidirectional_astar' (None이면 기본값)
+
+        Returns:
+            tuple: (경로 좌표 리스트, 경로 길이) 또는 길이 끊겨 있으면 None
+        """
+        algorithm = algorithm or self.routing_algorithm
+        if algorithm not in ROUTING_ALGORITHMS:
+            raise ValueError(f"Unknown routing algorithm: {algorithm} (available: {', '.join(ROUTING_ALGORITHMS)})")
+
+        G, _, _, _ = self.load_graph_data()
+
+        reverse = end_node < start_node
+        key = ('path', end_node, start_node) if reverse else ('path', start_node, end_node)
+        cached = self.route_cache.get(key, default=False)
+        if cached is False:
+            # 연결되지 않은 노드 쌍도 캐시 (None)
+            cached = self._compute_shortest_path(G, key[1], key[2], algorithm)
+            self.route_cache.set(key, cached, 64 + (len(cached[0]) * 72 if cached else 0))
+
+        if cached is None:
+            return None
+        path, path_length = cached
+        return (list(reversed(path)) if reverse else list(path)), path_length
+
+    def _compute_shortest_path(self, G, start_node, end_node, algorithm='dijkstra'):
+        """
+        캐시 없이 최단 경로 계산 (경로와 길이를 탐색 1회로 구함)
+
+        Args:
+            G: load_graph_data()가 반환한 그래프 (RoadNetwork 또는 nx.Graph)
+            start_node: 출발 노드 좌표
+            end_node: 도착 노드 좌표
+            algorithm: 'dijkstra', 'astar', 'bidirectional_astar'
+
+        Returns:
+            tuple: (경로 좌표 튜플, 경로 길이) 또는 길이 끊겨 있으면 None
+        """
+        if isinstance(G, RoadNetwork):
+            search_stats = {}
+            route = G.shortest_path(G.node_id(start_node), G.node_id(end_node), algorithm, search_stats)
+            self._record_search(algorithm, search_stats.get('expanded'))
+            if route is None:
+                return None
+            path_ids, path_length = route
+            return tuple(G.path_coords(path_ids)), path_length
+
+        # NetworkX 엔진은 확장 노드 수를 알 수 없으므로 탐색 횟수만 기록
+        # (양방향 A*는 NetworkX에 없으므로 단방향 A*로 대체)
+        self._record_search(algorithm, None)
+        network = self._network
+        if not network.connected(network.node_id(start_node), network.node_id(end_node)):
+            # 연결 요소가 다르면 NetworkX가 연결 요소 전체를 탐색하기 전에 경로 없음
+            return None
+        nx = get_networkx()
+        try:
+            if algorithm == 'dijkstra':
+                path_length, path = nx.single_source_dijkstra(G, start_node, end_node, weight='weight')
+            else:
+                path = nx.astar_path(G, start_node, end_node, heuristic=lambda u, v: math.hypot(u[0] - v[0], u[1] - v[1]),
+                                     weight='weight')
+                path_length = nx.path_weight(G, path, weight='weight')
+            return tuple(path), float(path_length)
+        except nx.NetworkXNoPath:
+            return None
+
+    def edge_route(self, start_coords, end_coords, algorithm=None):
+        """
+        두 좌표를 가장 가까운 도로 선분 위로 투영한 지점 사이 최단 경로 (투영 지점 쌍별 캐시)
+
+        Args:
+            start_coords, end_coords: 출발/도착 좌표
+            algorithm: 'dijkstra', 'astar', 'bidirectional_astar' (None이면 기본값)
+
+        Returns:
+            tuple: (투영 지점에서 시작해 투영 지점에서 끝나는 경로 좌표 리스트, 경로 길이) 또는 길이 끊겨 있으면 None
+        """
+        algorithm = algorithm or self.routing_algorithm
+        if algorithm not in ROUTING_ALGORITHMS:
+            raise ValueError(f"Unknown routing algorithm: {algorithm} (available: {', '.join(ROUTING_ALGORITHMS)})")
+
+        self.load_graph_data()
+        segment_index = self._segment_index
+        start, end = self._snap_endpoints(
+            start_coords, end_coords,
+            lambda coords, component: segment_index.project(*coords, component=component),
+            lambda projection: segment_index.components[projection[0]]
+        )
+        if start is None or end is None:
+            return None
+
+        key = ('edge_path', start[0], start[1], end[0], end[1])
+        cached = self.route_cache.get(key, default=False)
+        if cached is False:
+            # 양방향 A*는 가상 출발 노드가 둘이라 단방향 A*로 탐색
+            search_stats = {}
+            search_algorithm = 'dijkstra' if algorithm == 'dijkstra' else 'astar'
+            route = self._network.virtual_path(segment_index.edge_point(start), segment_index.edge_point(end),
+                                               search_algorithm, search_stats)
+            self._record_search(search_algorithm, search_stats.get('expanded'))
+            cached = None
+            if route is not None:
+                path_ids, path_length = route
+                cached = (tuple(self._virtual_route_coords(start[2], path_ids, end[2])), path_length)
+            self.route_cache.set(key, cached, 64 + (len(cached[0]) * 72 if cached else 0))
+
+        if cached is None:
+            return None
+        path, path_length = cached
+        return list(path), path_length
+
+    def _virtual_route_coords(self, start_point, path_ids, end_point):
+        """가상 출발 지점 + 도로 노드 경로 + 가상 도착 지점 좌표 리스트 (겹치는 점 제외)"""
+        path = [tuple(start_point)]
+        for point in self._network.path_coords(path_ids) + [tuple(end_point)]:
+            if point != path[-1]:
+                path.append(point)
+        return path
+
+    def _snap_endpoints(self, start_coords, end_coords, snap, component_of):
+        """
+        출발/도착 좌표 스냅 (snap_component 설정에 따라 연결 요소를 제한)
+
+        Args:
+            start_coords, end_coords: 출발/도착 좌표
+            snap: (좌표, 연결 요소 또는 None) -> 스냅 결과 (없으면 None)
+            component_of: 스냅 결과 -> 연결 요소
+
+        Returns:
+            tuple: (출발지 스냅 결과, 도착지 스냅 결과)
+        """
+        component = self._network.largest_component if self.snap_component == 'largest' else None
+        end = snap(end_coords, component)
+        if end is not None and self.snap_component == 'destination':
+            component = component_of(end)
+        return snap(start_coords, component), end
+
+    def _snap_coords(self, coords, component=None):
+        """
+        좌표를 도로 위 지점으로 스냅 (snap_to_edges 이면 가장 가까운 선분 위 투영점, 아니면 가장 가까운 노드)
+
+        Returns:
+            tuple: (가상 노드 (u, v, u까지 거리, v까지 거리) - 도로 노드 자체는 (n, n, 0, 0), 스냅 지점 좌표)
+                   또는 스냅할 선분이 없으면 None
+        """
+        segment_index = self._segment_index
+        if segment_index is not None:
+            projection = segment_index.project(*coords, component=component)
+            return None if projection is None else (segment_index.edge_point(projection), projection[2])
+        node_id = self._nearest_node(coords, component)
+        return (node_id, node_id, 0.0, 0.0), tuple(self._network.coords[node_id].tolist())
+
+    def _nearest_node(self, coords, component=None):
+        """좌표에서 가장 가까운 도로 노드 ID (component를 지정하면 해당 연결 요소 안에서)"""
+        if component is None:
+            _, node_id = self._tree.query(coords)
+            return int(node_id)
+
+        entry = self._component_trees.get(component)
+        if entry is None:
+            nodes = np.flatnonzero(self._network.components == component)
+            entry = self._component_trees[component] = (nodes, KDTree(self._network.coords[nodes]))
+        nodes, tree = entry
+        _, i = tree.query(coords)
+        return int(nodes[i])
+
+    def facility_route(self, start_index, end_index, start_node, end_node, algorithm=None):
+        """
+        두 시설물 사이 최단 경로
+
+        시설물 거리 테이블이 있으면 탐색 없이 선행 노드로 경로를 복원하고,
+        없으면 shortest_path()로 탐색합니다.
+
+        Args:
+            start_index, end_index: 시설물 인덱스 (시설물 JSON 순서)
+            start_node, end_node: 시설물에 스냅된 도로 노드 좌표
+            algorithm: 테이블이 없을 때 사용할 최단 경로 알고리즘
+
+        Returns:
+            tuple: (경로 좌표 리스트, 경로 길이) 또는 길이 끊겨 있으면 None
+        """
+        table = self._distance_table
+        if table is None:
+            return self.shortest_path(start_node, end_node, algorithm=algorithm)
+
+        self._record_search('distance_table', 0)
+        route = table.route(start_index, end_index)
+        if route is None:
+            return None
+        path_ids, path_length = route
+        return self._network.path_coords(path_ids), path_length
+
+    def _record_search(self, algorithm, expanded):
+        """경로 탐색 통계 기록 (expanded: 확장한 노드 수, 알 수 없으면 None)"""
+        with self._routing_stats_lock:
+            entry = self._routing_stats.setdefault(algorithm, {'searches': 0, 'expanded_nodes': 0, 'counted_searches': 0})
+            entry['searches'] += 1
+            if expanded is not None:
+                entry['expanded_nodes'] += expanded
+                entry['counted_searches'] += 1
+
+    def routing_stats(self):
+        """알고리즘별 경로 탐색 횟수와 평균 확장 노드 수"""
+        with self._routing_stats_lock:
+            by_algorithm = {}
+            for algorithm, entry in self._routing_stats.items():
+                counted = entry['counted_searches']
+                by_algorithm[algorithm] = {
+                    'searches': entry['searches'],
+                    'expanded_nodes': entry['expanded_nodes'],
+                    'avg_expanded_nodes': (entry['expanded_nodes'] / counted) if counted else None
+                }
+
+        network = self._network
+        table = self._distance_table
+        return {
+            'engine': self.routing_engine,
+            'default_algorithm': self.routing_algorithm,
+            'nodes': len(network) if network is not None else 0,
+            'components': network.component_count if network is not None else 0,
+            'distance_table': {
+                'loaded': table is not None,
+                'facilities': len(table.facility_nodes) if table is not None else 0,
+                'bytes': table.nbytes if table is not None else 0
+            },
+            'by_algorithm': by_algorithm
+        }
 
     def get_facility_names(self):
         """시설물 이름 목록 반환"""
@@ -239,19 +1210,23 @@ class WayfindingService:
             return [f["name"] for f in facilities]
         return []
 
-    def find_path(self, start_name, end_name):
+    def find_path(self, start_name, end_name, renderer=None, response_format='image', algorithm=None):
         """
         최단 경로를 찾고 이미지를 생성
 
         Args:
             start_name: 출발지 이름
             end_name: 도착지 이름
+            renderer: 이미지 렌더러 ('matplotlib' 또는 'pillow', None이면 기본값)
+            response_format: 'image' 또는 'vector' (이미지 대신 경로 좌표 반환)
+            algorithm: 최단 경로 알고리즘 ('dijkstra', 'astar', 'bidirectional_astar', None이면 기본값)
 
         Returns:
             dict: {
                 'success': bool,
                 'message': str,
-                'image': str (base64 encoded image),
+                'image': str (base64 encoded image, 'image' 형식),
+                'route', 'bounds', 'map_size' ('vector' 형식, build_route_vector 참고),
                 'distance': float
             }
         """
@@ -268,8 +1243,8 @@ class WayfindingService:
                 }
 
             # 1. 출발지/도착지 좌표 찾기
-            start_poi = next((item for item in facilities if item["name"] == start_name), None)
-            end_poi = next((item for item in facilities if item["name"] == end_name), None)
+            start_index, start_poi = self._facility_index.find_by_name(start_name)
+            end_index, end_poi = self._facility_index.find_by_name(end_name)
 
             if not start_poi or not end_poi:
                 return {
@@ -280,108 +1255,340 @@ class WayfindingService:
             start_coords = (start_poi['x'], start_poi['y'])
             end_coords = (end_poi['x'], end_poi['y'])
 
-            # 2. 가장 가까운 도로 노드 매칭 (Snapping)
-            _, s_idx = tree.query(start_coords)
-            _, e_idx = tree.query(end_coords)
-            start_node = node_list[s_idx]
-            end_node = node_list[e_idx]
+            # 2. 가장 가까운 도로 노드 매칭 (Snapping, 로드 시 시설물별로 미리 계산)
+            start_node = node_list[self._facility_nodes[start_index]]
+            end_node = node_list[self._facility_nodes[end_index]]
 
-            # 3. 다익스트라(Dijkstra) 경로 탐색
-            try:
-                path = nx.shortest_path(G, source=start_node, target=end_node, weight='weight')
-                path_length = nx.shortest_path_length(G, source=start_node, target=end_node, weight='weight')
-            except nx.NetworkXNoPath:
+            # 3. 시설물 거리 테이블 조회 (테이블이 없으면 노드 쌍별 캐시 + 경로 탐색)
+            route = self.facility_route(start_index, end_index, start_node, end_node, algorithm=algorithm)
+            if route is None:
                 return {
                     'success': False,
                     'message': '길이 끊겨 있어 갈 수 없습니다.'
                 }
+            path, path_length = route
 
-            # 4. 지도 이미지 로드 및 시각화
-            if not self.map_image_path.exists():
-                return {
-                    'success': False,
-                    'message': f'지도 이미지 파일이 없습니다: {self.map_image_path}'
-                }
+            # 거리를 km로 환산
+            distance_km = path_length * self.PIXEL_TO_KM
 
-            try:
-                img = mpimg.imread(str(self.map_image_path))
-            except Exception as e:
-                logger.error(f"Failed to load map image: {e}")
-                return {
-                    'success': False,
-                    'message': '지도 이미지를 읽을 수 없습니다.'
-                }
+            result = {
+                'success': True,
+                'message': '최단 경로를 찾았습니다!',
+                'distance': float(distance_km),
+                'distance_pixels': float(path_length)
+            }
 
-            # 이미지 크기 설정
-            fixed_w = 953
-            fixed_h = 676
+            if response_format == 'vector':
+                # 4. 이미지 대신 경로 좌표 반환 (브라우저가 지도 위에 직접 그림)
+                result.update(self.build_route_vector(path, start_coords, end_coords))
+            else:
+                # 4. 지도 이미지 위에 경로 시각화
+                if not self.map_image_path.exists():
+                    return {
+                        'success': False,
+                        'message': f'지도 이미지 파일이 없습니다: {self.map_image_path}'
+                    }
+
+                image_base64 = self.render_route(path, start_coords, end_coords, line_width=2, line_alpha=0.5, renderer=renderer)
+                if image_base64 is None:
+                    return {
+                        'success': False,
+                        'message': '지도 이미지를 읽을 수 없습니다.'
+                    }
+                result['image'] = image_base64
 
-            fig, ax = plt.subplots(figsize=(10, 6))
-            ax.imshow(img, extent=[0, fixed_w, fixed_h, 0])
+            logger.info(f"Path found successfully: distance={path_length:.2f} pixels ({distance_km:.2f} km)")
+            return result
 
-            # 경로 그리기
-            path_x = [p[0] for p in path]
-            path_y = [p[1] for p in path]
+        except Exception as e:
+            logger.error(f"Error in find_path: {e}", exc_info=True)
+            return {
+                'success': False,
+                'message': f'경로 찾기 중 오류가 발생했습니다: {str(e)}'
+            }
 
-            ax.plot(path_x, path_y, color='red', linewidth=2, label='추천 경로', alpha=0.5)
+    def _parse_endpoint(self, point):
+        """
+        일괄 경로 찾기/경유지 지점 해석
 
-            # 출발지/도착지 표시 (경로의 시작점과 끝점에 원형 액자 마스코트)
-            path_start = path[0]  # 경로 시작점
-            path_end = path[-1]   # 경로 끝점
+        Args:
+            point: 시설물 이름(str), (x, y) 시퀀스 또는 {'x': .., 'y': ..} dict
 
-            if self.mascot_image_path.exists():
-                # 출발지 원형 마스코트 (파란색 테두리)
-                start_mascot = self.create_circular_mascot('#3399ff', size=50)
-                if start_mascot is not None:
-                    imagebox_start = OffsetImage(start_mascot, zoom=0.5)
-                    ab_start = AnnotationBbox(imagebox_start, path_start, frameon=False,
-                                              box_alignment=(0.5, 0.5))
-                    ax.add_artist(ab_start)
-                else:
-                    ax.scatter(*path_start, color='#3399ff', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-
-                # 도착지 원형 마스코트 (초록색 테두리)
-                end_mascot = self.create_circular_mascot('#33ff99', size=50)
-                if end_mascot is not None:
-                    imagebox_end = OffsetImage(end_mascot, zoom=0.5)
-                    ab_end = AnnotationBbox(imagebox_end, path_end, frameon=False,
-                                           box_alignment=(0.5, 0.5))
-                    ax.add_artist(ab_end)
-                else:
-                    ax.scatter(*path_end, color='#33ff99', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-            else:
-                # 마스코트 파일이 없으면 원으로 표시
-                ax.scatter(*path_start, color='#3399ff', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-                ax.scatter(*path_end, color='#33ff99', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
+        Returns:
+            tuple: ((x, y), 시설물에 스냅된 노드 ID 또는 좌표면 None) 또는 알 수 없는 지점이면 None
+        """
+        if isinstance(point, str):
+            index, facility = self._facility_index.find_by_name(point)
+            if index is None:
+                return None
+            return (facility['x'], facility['y']), int(self._facility_nodes[index])
+
+        if isinstance(point, dict):
+            point = (point.get('x'), point.get('y'))
+        try:
+            x, y = float(point[0]), float(point[1])
+        except (TypeError, ValueError, IndexError):
+            return None
+        return (x, y), None
 
-            # 경로 범위로 자동 확대
-            self.calculate_path_bounds_and_zoom(ax, path, start_coords, end_coords)
+    def _snap_endpoint(self, endpoint, component=None):
+        """
+        _parse_endpoint 결과를 가상 노드로 변환 (시설물은 스냅된 도로 노드, 좌표는 _snap_coords)
 
-            # 꾸미기
-            ax.axis('off')
+        Returns:
+            tuple: (가상 노드, 스냅 지점 좌표) 또는 스냅할 선분이 없으면 None
+        """
+        coords, node_id = endpoint
+        if node_id is not None:
+            return (node_id, node_id, 0.0, 0.0), tuple(self._network.coords[node_id].tolist())
+        return self._snap_coords(coords, component)
 
-            # 이미지를 base64로 인코딩
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight', dpi=150)
-            buf.seek(0)
-            image_base64 = base64.b64encode(buf.read()).decode('utf-8')
-            plt.close(fig)
+    def _resolve_stops(self, stops):
+        """
+        경유지 목록을 가상 노드로 변환 (단일 경로 찾기와 같은 스냅 규칙)
 
-            # 거리를 km로 환산
-            distance_km = path_length * self.PIXEL_TO_KM
+        snap_component='destination' 이면 좌표 경유지를 마지막 경유지의 연결 요소 안에서 스냅합니다
+        (두 지점 경로에서 출발지를 도착지의 연결 요소 안에서 스냅하는 것과 동일).
 
-            logger.info(f"Path found successfully: distance={path_length:.2f} pixels ({distance_km:.2f} km)")
+        Returns:
+            list: 경유지별 (좌표, 가상 노드, 스냅 지점 좌표) 또는 알 수 없는 지점이면 None
+        """
+        parsed = [self._parse_endpoint(stop) for stop in stops]
+        component = self._network.largest_component if self.snap_component == 'largest' else None
+        last = self._snap_endpoint(parsed[-1], component) if parsed[-1] is not None else None
+        if last is not None and self.snap_component == 'destination':
+            component = self._network.components[last[0][0]]
+
+        points = []
+        for endpoint in parsed[:-1]:
+            snapped = self._snap_endpoint(endpoint, component) if endpoint is not None else None
+            points.append(None if snapped is None else (endpoint[0], *snapped))
+        points.append(None if last is None else (parsed[-1][0], *last))
+        return points
+
+    def _resolve_pair(self, start, end):
+        """
+        일괄 경로 찾기의 출발/도착 지점 쌍을 가상 노드로 변환 (단일 경로 찾기와 같은 스냅 규칙)
+
+        시설물 이름은 시설물에 스냅된 도로 노드 (find_path 와 동일), 좌표는 snap_to_edges 이면
+        가장 가까운 도로 선분 위 투영점, 아니면 가장 가까운 도로 노드이며 snap_component 를 적용합니다
+        (find_path_from_coords 와 동일).
+
+        Returns:
+            tuple: ((좌표, 가상 노드, 스냅 지점 좌표), (좌표, 가상 노드, 스냅 지점 좌표))
+                   - 가상 노드는 (u, v, u까지 거리, v까지 거리), 도로 노드 자체는 (n, n, 0, 0)
+                   또는 알 수 없는 지점이 있으면 None
+        """
+        parsed = (self._parse_endpoint(start), self._parse_endpoint(end))
+        if None in parsed:
+            return None
 
+        network = self._network
+        start_point, end_point = self._snap_endpoints(parsed[0], parsed[1], self._snap_endpoint,
+                                                      lambda point: network.components[point[0][0]])
+        if start_point is None or end_point is None:
+            return None
+        return (parsed[0][0], *start_point), (parsed[1][0], *end_point)
+
+    def find_paths_batch(self, pairs, renderer=None, response_format='vector', max_workers=4):
+        """
+        여러 출발지/도착지 쌍의 최단 경로를 한 번에 계산
+
+        지점은 단일 경로 찾기와 같은 규칙으로 스냅하고(_resolve_pair), 같은 출발 지점(가상 노드)을
+        가진 쌍을 묶어 출발 지점마다 양 끝 노드의 최단 경로 트리를 한 번만 계산합니다.
+        출발 지점이 많으면 묶음 단위로 워커 풀에서 처리합니다.
+
+        Args:
+            pairs: (출발지, 도착지) 목록 - 각 지점은 시설물 이름, (x, y) 또는 {'x', 'y'}
+            renderer: 이미지 렌더러 ('image' 형식에서 사용, None이면 기본값)
+            response_format: 'vector' (경로 좌표, 기본값) 또는 'image'
+            max_workers: 워커 풀 스레드 수
+
+        Returns:
+            dict: {
+                'success': bool,
+                'results': 쌍 순서대로 find_path_from_coords 와 같은 형식의 결과 목록,
+                'sources': 출발 지점(가상 노드) 수
+            }
+        """
+        G, facilities, tree, node_list = self.load_graph_data()
+        if not G:
             return {
-                'success': True,
-                'message': '최단 경로를 찾았습니다!',
-                'image': image_base64,
-                'distance': float(distance_km),
-                'distance_pixels': float(path_length)
+                'success': False,
+                'message': '지도 데이터 파일이 없거나 로드에 실패했습니다.'
             }
+        network = self._network
+
+        # 1. 지점 스냅 및 출발 지점(가상 노드)별로 묶기
+        results = [None] * len(pairs)
+        endpoints = [None] * len(pairs)
+        groups = {}
+        for i, (start, end) in enumerate(pairs):
+            endpoints[i] = self._resolve_pair(start, end)
+            if endpoints[i] is None:
+                results[i] = {
+                    'success': False,
+                    'message': '출발지 또는 도착지를 찾을 수 없습니다.'
+                }
+                continue
+            groups.setdefault(endpoints[i][0][1], []).append(i)
+
+        sources = list(groups)
+        chunks = [sources[i:i + BATCH_SOURCE_CHUNK] for i in range(0, len(sources), BATCH_SOURCE_CHUNK)]
+
+        def solve(chunk):
+            """출발 지점 묶음의 양 끝 노드에 대해 다익스트라 1회 + 경로 복원"""
+            nodes = list(dict.fromkeys(node for source in chunk for node in source[:2]))
+            distances, predecessors = network.shortest_path_tree(nodes)
+            trees = {}
+            for row, node in enumerate(nodes):
+                self._record_search('batch_dijkstra', int(np.isfinite(distances[row]).sum()))
+                trees[node] = (distances[row], predecessors[row])
+
+            solved = []
+            for source in chunk:
+                for i in groups[source]:
+                    end = endpoints[i][1][1]
+                    if not network.connected(source[0], end[0]):
+                        solved.append((i, None))
+                        continue
+                    solved.append((i, network.virtual_path_from_trees(source, end, trees)))
+            return solved
+
+        # 2. 출발 노드 묶음별 탐색 (많으면 워커 풀)
+        if len(sources) >= BATCH_PARALLEL_MIN_SOURCES and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+                solved_chunks = list(executor.map(solve, chunks))
+        else:
+            solved_chunks = [solve(chunk) for chunk in chunks]
+
+        # 3. 쌍별 응답 생성 (이미지 렌더링은 요청 스레드에서)
+        for solved in solved_chunks:
+            for i, route in solved:
+                if route is None:
+                    results[i] = {
+                        'success': False,
+                        'message': '길이 끊겨 있어 갈 수 없습니다.'
+                    }
+                    continue
+                (start_coords, _, start_point), (end_coords, _, end_point) = endpoints[i]
+                path_ids, path_length = route
+                results[i] = self._route_result(self._virtual_route_coords(start_point, path_ids, end_point), path_length,
+                                                start_coords, end_coords, renderer, response_format)
+
+        logger.info(f"Batch routes: {len(pairs)} pairs, {len(sources)} source points, "
+                    f"{sum(1 for r in results if r['success'])} found")
+        return {
+            'success': True,
+            'results': results,
+            'sources': len(sources)
+        }
+
+    def plan_tour(self, stops, renderer=None, response_format='image', optimize=True, keep_end=False):
+        """
+        여러 경유지를 한 번에 방문하는 경로 (방문 순서 최적화 + 하나로 이어진 경로)
+
+        경유지를 좌표 길찾기와 같은 규칙으로 도로 위 지점(가상 노드)으로 스냅하고, 경유지 간 도로 거리를
+        다익스트라 1회 호출(스냅 간선 양 끝 노드 출발)로 한꺼번에 구한 뒤, 첫 경유지에서 출발하는
+        방문 순서를 계산해 구간 경로를 이어 붙여 이미지 하나 또는 벡터 하나로 반환합니다.
+
+        Args:
+            stops: 경유지 목록 - 각 지점은 시설물 이름, (x, y) 또는 {'x', 'y'} (첫 지점이 출발지)
+            renderer: 이미지 렌더러 (None이면 기본값)
+            response_format: 'image' 또는 'vector'
+            optimize: False이면 입력 순서 그대로 방문
+            keep_end: 마지막 경유지를 도착지로 고정
+
+        Returns:
+            dict: find_path_from_coords 와 같은 형식의 경로 결과 + 방문 순서별 'stops' 목록
+        """
+        try:
+            logger.info(f"Planning tour: {len(stops)} stops (optimize={optimize}, keep_end={keep_end})")
+
+            G, facilities, tree, node_list = self.load_graph_data()
+            if not G:
+                return {
+                    'success': False,
+                    'message': '지도 데이터 파일이 없거나 로드에 실패했습니다.'
+                }
+            if len(stops) < 2:
+                return {
+                    'success': False,
+                    'message': '경유지를 2개 이상 지정해 주세요.'
+                }
+
+            # 1. 경유지를 좌표와 가상 노드로 변환
+            points = self._resolve_stops(stops)
+            missing = [str(stop) for stop, point in zip(stops, points) if point is None]
+            if missing:
+                return {
+                    'success': False,
+                    'message': f"경유지를 찾을 수 없습니다: {', '.join(missing)}"
+                }
+
+            # 2. 경유지 간 도로 거리 (가상 노드 양 끝의 중복을 제외한 출발 노드로 다익스트라 1회)
+            network = self._network
+            sources = list(dict.fromkeys(node for _, virtual, _ in points for node in virtual[:2]))
+            distances, predecessors = network.shortest_path_tree(sources)
+            for row in range(len(sources)):
+                self._record_search('tour_dijkstra', int(np.isfinite(distances[row]).sum()))
+            trees = {node: (distances[row], predecessors[row]) for row, node in enumerate(sources)}
+
+            legs = {}
+            matrix = np.full((len(points), len(points)), np.inf)
+            for i, (_, start, _) in enumerate(points):
+                for j, (_, end, _) in enumerate(points):
+                    route = network.virtual_path_from_trees(start, end, trees) if i != j else (None, 0.0)
+                    if route is not None:
+                        legs[i, j] = route
+                        matrix[i, j] = route[1]
+
+            unreachable = [str(stops[i]) for i in range(1, len(stops)) if not np.isfinite(matrix[0, i])]
+            if unreachable:
+                return {
+                    'success': False,
+                    'message': f"길이 끊겨 있어 갈 수 없는 경유지가 있습니다: {', '.join(unreachable)}"
+                }
+
+            # 3. 방문 순서
+            if optimize:
+                order, exact = solve_tour(matrix.tolist(), keep_end=keep_end)
+            else:
+                order, exact = list(range(len(stops))), False
+
+            # 4. 구간 경로 이어 붙이기 (스냅 지점에서 시작해 스냅 지점에서 끝남)
+            path = [points[order[0]][2]]
+            stop_results = [{
+                'order': 0,
+                'index': order[0],
+                'name': stops[order[0]] if isinstance(stops[order[0]], str) else None,
+                'coords': {'x': points[order[0]][0][0], 'y': points[order[0]][0][1]},
+                'leg_distance': 0.0
+            }]
+            total_length = 0.0
+            for k, (a, b) in enumerate(zip(order, order[1:]), start=1):
+                path_ids, leg_length = legs[a, b]
+                path.extend(self._virtual_route_coords(points[a][2], path_ids, points[b][2])[1:])
+                total_length += leg_length
+                stop_results.append({
+                    'order': k,
+                    'index': b,
+                    'name': stops[b] if isinstance(stops[b], str) else None,
+                    'coords': {'x': points[b][0][0], 'y': points[b][0][1]},
+                    'leg_distance': float(leg_length * self.PIXEL_TO_KM)
+                })
+
+            result = self._route_result(path, total_length, points[order[0]][0], points[order[-1]][0],
+                                        renderer, response_format)
+            if result['success']:
+                result['message'] = '경유지를 모두 지나는 경로를 찾았습니다!'
+                result['stops'] = stop_results
+                result['optimized'] = optimize
+                result['exact'] = exact
+            return result
 
         except Exception as e:
-            logger.error(f"Error in find_path: {e}", exc_info=True)
+            logger.error(f"Error in plan_tour: {e}", exc_info=True)
             return {
                 'success': False,
                 'message': f'경로 찾기 중 오류가 발생했습니다: {str(e)}'
@@ -399,31 +1606,24 @@ class WayfindingService:
         Returns:
             str: 시설물 이름 또는 None
         """
-        _, facilities, _, _ = self.load_graph_data()
+        facility_index = self.get_facility_index()
 
-        if not facilities:
+        if not facility_index or not len(facility_index):
             return None
 
-        min_dist = float('inf')
-        nearest = None
-
-        for facility in facilities:
-            fx, fy = facility['x'], facility['y']
-            dist = math.hypot(x - fx, y - fy)
+        index, _ = facility_index.nearest(x, y, max_distance=max_distance)
+        return facility_index.facilities[index]['name'] if index is not None else None
 
-            if dist < min_dist and dist <= max_distance:
-                min_dist = dist
-                nearest = facility['name']
-
-        return nearest
-
-    def find_path_from_coords(self, start_x, start_y, end_x, end_y):
+    def find_path_from_coords(self, start_x, start_y, end_x, end_y, renderer=None, response_format='image', algorithm=None):
         """
         좌표를 이용한 경로 찾기 (지도 클릭 기반)
 
         Args:
             start_x, start_y: 출발지 좌표
             end_x, end_y: 도착지 좌표
+            renderer: 이미지 렌더러 ('matplotlib' 또는 'pillow', None이면 기본값)
+            response_format: 'image' 또는 'vector' (이미지 대신 경로 좌표 반환)
+            algorithm: 최단 경로 알고리즘 ('dijkstra', 'astar', 'bidirectional_astar', None이면 기본값)
 
         Returns:
             dict: 경로 찾기 결과
@@ -440,119 +1640,201 @@ class WayfindingService:
                     'message': '지도 데이터 파일이 없거나 로드에 실패했습니다.'
                 }
 
-            # 1. 클릭한 좌표에서 가장 가까운 도로 노드 찾기
             start_coords = (start_x, start_y)
             end_coords = (end_x, end_y)
 
-            _, s_idx = tree.query(start_coords)
-            _, e_idx = tree.query(end_coords)
-            start_node = node_list[s_idx]
-            end_node = node_list[e_idx]
-
-            # 2. 다익스트라 경로 탐색
-            try:
-                path = nx.shortest_path(G, source=start_node, target=end_node, weight='weight')
-                path_length = nx.shortest_path_length(G, source=start_node, target=end_node, weight='weight')
-            except nx.NetworkXNoPath:
+            if self._segment_index is not None:
+                # 1-2. 클릭한 좌표를 가장 가까운 도로 선분 위로 투영하고 투영 지점 사이 경로 탐색
+                route = self.edge_route(start_coords, end_coords, algorithm=algorithm)
+            else:
+                # 1. 클릭한 좌표에서 가장 가까운 도로 노드 찾기
+                network = self._network
+                s_idx, e_idx = self._snap_endpoints(start_coords, end_coords, self._nearest_node,
+                                                    lambda node_id: network.components[node_id])
+                start_node = node_list[s_idx]
+                end_node = node_list[e_idx]
+
+                # 2. 다익스트라 경로 탐색 (노드 쌍별 캐시)
+                route = self.shortest_path(start_node, end_node, algorithm=algorithm)
+            if route is None:
                 return {
                     'success': False,
                     'message': '길이 끊겨 있어 갈 수 없습니다.'
                 }
+            path, path_length = route
+
+            return self._route_result(path, path_length, start_coords, end_coords, renderer, response_format)
 
-            # 3. 지도 이미지 로드 및 시각화
+        except Exception as e:
+            logger.error(f"Error in find_path_from_coords: {e}", exc_info=True)
+            return {
+                'success': False,
+                'message': f'경로 찾기 중 오류가 발생했습니다: {str(e)}'
+            }
+
+    def _route_result(self, path, path_length, start_coords, end_coords, renderer, response_format):
+        """
+        좌표 기반 경로 응답 생성 (거리 환산 + 이미지 또는 벡터)
+
+        Args:
+            path: 경로 좌표 리스트
+            path_length: 경로 길이 (픽셀)
+            start_coords, end_coords: 출발/도착 좌표
+            renderer: 이미지 렌더러 (None이면 기본값)
+            response_format: 'image' 또는 'vector'
+
+        Returns:
+            dict: 경로 찾기 결과
+        """
+        # 거리를 km로 환산
+        distance_km = path_length * self.PIXEL_TO_KM
+
+        result = {
+            'success': True,
+            'message': '최단 경로를 찾았습니다!',
+            'distance': float(distance_km),
+            'distance_pixels': float(path_length),
+            'start_coords': {'x': start_coords[0], 'y': start_coords[1]},
+            'end_coords': {'x': end_coords[0], 'y': end_coords[1]}
+        }
+
+        if response_format == 'vector':
+            # 이미지 대신 경로 좌표 반환 (브라우저가 지도 위에 직접 그림)
+            result.update(self.build_route_vector(path, start_coords, end_coords))
+        else:
+            # 지도 이미지 위에 경로 시각화
             if not self.map_image_path.exists():
                 return {
                     'success': False,
                     'message': f'지도 이미지 파일이 없습니다: {self.map_image_path}'
                 }
 
-            try:
-                img = mpimg.imread(str(self.map_image_path))
-            except Exception as e:
-                logger.error(f"Failed to load map image: {e}")
+            image_base64 = self.render_route(path, start_coords, end_coords, line_width=3, line_alpha=0.7, renderer=renderer)
+            if image_base64 is None:
                 return {
                     'success': False,
                     'message': '지도 이미지를 읽을 수 없습니다.'
                 }
+            result['image'] = image_base64
 
-            # 이미지 크기 설정
-            fixed_w = 953
-            fixed_h = 676
-
-            fig, ax = plt.subplots(figsize=(10, 6))
-            ax.imshow(img, extent=[0, fixed_w, fixed_h, 0])
-
-            # 경로 그리기
-            path_x = [p[0] for p in path]
-            path_y = [p[1] for p in path]
+        logger.info(f"Path found successfully: distance={path_length:.2f} pixels ({distance_km:.2f} km)")
+        return result
 
-            ax.plot(path_x, path_y, color='red', linewidth=3, label='추천 경로', alpha=0.7)
+    def find_nearest_facilities(self, x, y, category='toilet', name_pattern=None, k=1):
+        """
+        도로 거리 기준으로 가장 가까운 시설물 k개 (다중 목표 다익스트라 1회)
 
-            # 출발지/도착지 표시 (경로의 시작점과 끝점에 원형 액자 마스코트)
-            path_start = path[0]  # 경로 시작점
-            path_end = path[-1]   # 경로 끝점
+        현재 위치를 좌표 길찾기와 같은 규칙(snap_to_edges, snap_component)으로 스냅한 지점에서
+        탐색을 시작해 조건에 맞는 시설물 노드를 k개 확정하는 즉시 종료하므로,
+        시설물마다 경로를 따로 찾는 것보다 빠릅니다. snap_component='destination' 이면
+        직선 거리로 가장 가까운 조건에 맞는 시설물의 연결 요소 안에서 스냅합니다.
 
-            if self.mascot_image_path.exists():
-                # 출발지 원형 마스코트 (파란색 테두리)
-                start_mascot = self.create_circular_mascot('#3399ff', size=50)
-                if start_mascot is not None:
-                    imagebox_start = OffsetImage(start_mascot, zoom=0.5)
-                    ab_start = AnnotationBbox(imagebox_start, path_start, frameon=False,
-                                              box_alignment=(0.5, 0.5))
-                    ax.add_artist(ab_start)
-                else:
-                    ax.scatter(*path_start, color='#3399ff', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-
-                # 도착지 원형 마스코트 (초록색 테두리)
-                end_mascot = self.create_circular_mascot('#33ff99', size=50)
-                if end_mascot is not None:
-                    imagebox_end = OffsetImage(end_mascot, zoom=0.5)
-                    ab_end = AnnotationBbox(imagebox_end, path_end, frameon=False,
-                                           box_alignment=(0.5, 0.5))
-                    ax.add_artist(ab_end)
-                else:
-                    ax.scatter(*path_end, color='#33ff99', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-            else:
-                # 마스코트 파일이 없으면 원으로 표시
-                ax.scatter(*path_start, color='#3399ff', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
-                ax.scatter(*path_end, color='#33ff99', s=250, zorder=5, edgecolors='white', linewidth=3, alpha=0.9)
+        Args:
+            x, y: 현재 위치 좌표
+            category: 시설물 카테고리 (name_pattern이 없을 때 사용)
+            name_pattern: 시설물 이름 검색 패턴
+            k: 찾을 시설물 수
 
-            # 경로 범위로 자동 확대
-            self.calculate_path_bounds_and_zoom(ax, path, (start_x, start_y), (end_x, end_y))
+        Returns:
+            list: 가까운 순서의 (시설물 인덱스, 스냅 지점에서 시작하는 경로 좌표 리스트, 경로 길이) 리스트
+        """
+        G, facilities, tree, node_list = self.load_graph_data()
+        network = self._network
+        if not G or not facilities:
+            return []
+
+        matches = self._facility_index.match(category, name_pattern)
+        snapped = self._snap_origin(x, y, matches)
+        if snapped is None:
+            return []
+        source, snap_point = snapped
+
+        key = ('nearest', source, category if not name_pattern else None, name_pattern, k)
+        cached = self.route_cache.get(key)
+        if cached is None:
+            # 조건에 맞는 시설물을 스냅된 도로 노드별로 묶기
+            targets = {}
+            for index, node_id in zip(matches.tolist(), self._facility_nodes[matches].tolist()):
+                targets.setdefault(node_id, []).append(index)
+
+            search_stats = {}
+            found = network.nearest_targets(source, targets, k=k, stats=search_stats) if targets else []
+            self._record_search('nearest_dijkstra', search_stats.get('expanded', 0))
+
+            cached = tuple(
+                (index, tuple(self._virtual_route_coords(snap_point, path_ids, network.coords[path_ids[-1]].tolist())), path_length)
+                for index, path_length, path_ids in found
+            )
+            self.route_cache.set(key, cached, 64 + sum(72 * len(path) + 64 for _, path, _ in cached))
 
-            # 꾸미기
-            ax.axis('off')
+        return [(index, list(path), path_length) for index, path, path_length in cached]
 
-            # 이미지를 base64로 인코딩
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight', dpi=150)
-            buf.seek(0)
-            image_base64 = base64.b64encode(buf.read()).decode('utf-8')
-            plt.close(fig)
+    def _snap_origin(self, x, y, matches):
+        """
+        시설물 찾기 출발 위치 스냅 (좌표 길찾기와 같은 규칙, 'destination' 이면 matches 중
+        직선 거리로 가장 가까운 시설물의 연결 요소 안에서)
 
-            # 거리를 km로 환산
-            distance_km = path_length * self.PIXEL_TO_KM
+        Returns:
+            tuple: (가상 노드, 스냅 지점 좌표) 또는 스냅할 선분이 없으면 None
+        """
+        network = self._network
+        component = None
+        if self.snap_component == 'largest':
+            component = network.largest_component
+        elif self.snap_component == 'destination' and len(matches):
+            nearest_index, _ = self._facility_index.nearest_among(x, y, matches)
+            component = int(network.components[self._facility_nodes[nearest_index]])
+        return self._snap_coords((x, y), component)
+
+    def facility_route_from(self, x, y, index, algorithm=None):
+        """
+        현재 위치에서 시설물까지 최단 경로 (find_nearest_facilities 와 같은 출발 스냅 / 도착 노드)
 
-            logger.info(f"Path found successfully: distance={path_length:.2f} pixels ({distance_km:.2f} km)")
+        도착 지점은 시설물에 스냅된 도로 노드(find_path 와 동일)이므로, 직선/도로 거리 모드가
+        같은 시설물에 대해 같은 경로와 거리를 반환합니다.
 
-            return {
-                'success': True,
-                'message': '최단 경로를 찾았습니다!',
-                'image': image_base64,
-                'distance': float(distance_km),
-                'distance_pixels': float(path_length),
-                'start_coords': {'x': start_x, 'y': start_y},
-                'end_coords': {'x': end_x, 'y': end_y}
-            }
+        Args:
+            x, y: 현재 위치 좌표
+            index: 시설물 인덱스
+            algorithm: 'dijkstra', 'astar', 'bidirectional_astar' (None이면 기본값)
 
-        except Exception as e:
-            logger.error(f"Error in find_path_from_coords: {e}", exc_info=True)
-            return {
-                'success': False,
-                'message': f'경로 찾기 중 오류가 발생했습니다: {str(e)}'
-            }
+        Returns:
+            tuple: (스냅 지점에서 시작해 시설물 노드에서 끝나는 경로 좌표 리스트, 경로 길이) 또는 길이 끊겨 있으면 None
+        """
+        algorithm = algorithm or self.routing_algorithm
+        if algorithm not in ROUTING_ALGORITHMS:
+            raise ValueError(f"Unknown routing algorithm: {algorithm} (available: {', '.join(ROUTING_ALGORITHMS)})")
+
+        self.load_graph_data()
+        network = self._network
+        node_id = int(self._facility_nodes[index])
+        snapped = self._snap_origin(x, y, np.array([index], dtype=np.int64))
+        if snapped is None:
+            return None
+        source, snap_point = snapped
+
+        key = ('facility_path', source, node_id)
+        cached = self.route_cache.get(key, default=False)
+        if cached is False:
+            # 양방향 A*는 가상 출발 노드가 둘이라 단방향 A*로 탐색 (edge_route 와 동일)
+            search_stats = {}
+            search_algorithm = 'dijkstra' if algorithm == 'dijkstra' else 'astar'
+            route = network.virtual_path(source, (node_id, node_id, 0.0, 0.0), search_algorithm, search_stats)
+            self._record_search(search_algorithm, search_stats.get('expanded'))
+            cached = None
+            if route is not None:
+                path_ids, path_length = route
+                end_point = network.coords[node_id].tolist()
+                cached = (tuple(self._virtual_route_coords(snap_point, path_ids, end_point)), path_length)
+            self.route_cache.set(key, cached, 64 + (len(cached[0]) * 72 if cached else 0))
+
+        if cached is None:
+            return None
+        path, path_length = cached
+        return list(path), path_length
 
-    def find_nearest_facility_by_category(self, x, y, category='toilet', name_pattern=None):
+    def find_nearest_facility_by_category(self, x, y, category='toilet', name_pattern=None, renderer=None, response_format='image',
+                                          algorithm=None, mode='straight', k=1):
         """
         특정 카테고리 또는 이름 패턴의 가장 가까운 시설물 찾기 및 경로 표시
 
@@ -560,12 +1842,24 @@ class WayfindingService:
             x, y: 현재 위치 좌표
             category: 시설물 카테고리 (예: 'toilet')
             name_pattern: 시설물 이름 검색 패턴 (예: '매점', '음수대')
+            renderer: 이미지 렌더러 ('matplotlib' 또는 'pillow', None이면 기본값)
+            response_format: 'image' 또는 'vector' (이미지 대신 경로 좌표 반환)
+            algorithm: 최단 경로 알고리즘 ('straight' 모드에서 사용, None이면 기본값)
+
+        두 모드 모두 출발 위치는 find_nearest_facilities 와 같이 스냅하고 시설물에 스냅된 도로 노드까지
+        경로를 찾으므로, 같은 시설물이면 같은 경로와 거리를 반환합니다.
+            mode: 'straight' (직선 거리 기준, 기본값) 또는 'network' (도로 거리 기준)
+            k: 'network' 모드에서 함께 반환할 후보 시설물 수 (가까운 순서)
 
         Returns:
-            dict: 경로 찾기 결과
+            dict: 경로 찾기 결과 (가장 가까운 시설물까지의 경로)
+                + 'facility': 가장 가까운 시설물, 'candidates': 도로 거리 순 후보 목록 ('network' 모드)
         """
         try:
-            logger.info(f"Finding nearest facility - category: {category}, pattern: {name_pattern} from ({x}, {y})")
+            logger.info(f"Finding nearest facility - category: {category}, pattern: {name_pattern}, mode: {mode} from ({x}, {y})")
+
+            if mode not in NEAREST_MODES:
+                raise ValueError(f"Unknown nearest mode: {mode} (available: {', '.join(NEAREST_MODES)})")
 
             # 데이터 로드
             G, facilities, tree, node_list = self.load_graph_data()
@@ -576,44 +1870,57 @@ class WayfindingService:
                     'message': '지도 데이터 파일이 없거나 로드에 실패했습니다.'
                 }
 
-            # 1. 카테고리 또는 이름 패턴으로 시설물 필터링
+            search_term = name_pattern if name_pattern else category
+
+            if mode == 'network':
+                # 도로 거리 기준 가까운 시설물 k개 (탐색 1회)
+                nearest = self.find_nearest_facilities(x, y, category, name_pattern, k=max(1, min(k, MAX_NEAREST_CANDIDATES)))
+                if not nearest:
+                    return {
+                        'success': False,
+                        'message': f'{search_term} 시설물을 찾을 수 없거나 갈 수 있는 길이 없습니다.'
+                    }
+
+                index, path, path_length = nearest[0]
+                facility = facilities[index]
+                result = self._route_result(path, path_length, (x, y), (facility['x'], facility['y']), renderer, response_format)
+                if result['success']:
+                    result['facility'] = facility
+                    result['candidates'] = [
+                        {**facilities[i], 'distance': float(length * self.PIXEL_TO_KM), 'distance_pixels': float(length)}
+                        for i, _, length in nearest
+                    ]
+                return result
+
+            # 1. 가장 가까운 시설물 찾기 (직선 거리)
+            facility_index = self._facility_index
             if name_pattern:
-                # 이름 패턴으로 검색
-                category_facilities = [f for f in facilities if name_pattern in f.get('name', '')]
+                # 이름 패턴으로 검색 (n-gram 색인 후보 중 가장 가까운 시설물)
+                nearest_index, _ = facility_index.nearest_among(x, y, facility_index.search_name(name_pattern))
             else:
-                # 카테고리로 검색
-                category_facilities = [f for f in facilities if f.get('category') == category]
+                # 카테고리로 검색 (카테고리별 KDTree)
+                nearest_index, _ = facility_index.nearest(x, y, category=category)
 
-            if not category_facilities:
-                search_term = name_pattern if name_pattern else category
+            if nearest_index is None:
                 return {
                     'success': False,
                     'message': f'{search_term} 시설물을 찾을 수 없습니다.'
                 }
+            nearest_facility = facilities[nearest_index]
 
-            # 2. 가장 가까운 시설물 찾기
-            min_dist = float('inf')
-            nearest_facility = None
-
-            for facility in category_facilities:
-                fx, fy = facility['x'], facility['y']
-                dist = math.hypot(x - fx, y - fy)
-
-                if dist < min_dist:
-                    min_dist = dist
-                    nearest_facility = facility
-
-            if not nearest_facility:
+            # 2. 경로 찾기 (시설물에 스냅된 도로 노드까지, 'network' 모드와 같은 도착 지점)
+            route = self.facility_route_from(x, y, nearest_index, algorithm=algorithm)
+            if route is None:
                 return {
                     'success': False,
-                    'message': '가까운 시설물을 찾을 수 없습니다.'
+                    'message': '길이 끊겨 있어 갈 수 없습니다.'
                 }
-
-            # 3. 경로 찾기 (좌표 기반)
-            return self.find_path_from_coords(
-                x, y,
-                nearest_facility['x'], nearest_facility['y']
-            )
+            path, path_length = route
+            result = self._route_result(path, path_length, (x, y), (nearest_facility['x'], nearest_facility['y']),
+                                        renderer, response_format)
+            if result['success']:
+                result['facility'] = nearest_facility
+            return result
 
         except Exception as e:
             logger.error(f"Error in find_nearest_facility_by_category: {e}", exc_info=True)
@@ -0,0 +1,10 @@
+from app import create_app
+from app.asgi import AsyncGateway
+import os
+
+# ASGI 서빙 모드: uvicorn asgi:application --host 0.0.0.0 --port 5001
+application = AsyncGateway(create_app())
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(application, host='0.0.0.0', port=int(os.getenv('PORT', '5001')))
@@ -0,0 +1,179 @@
+"""
+app/db.py 마이크로 벤치마크
+호출마다 연결을 여는 기존 방식(rollback journal)과 스레드별 연결 + WAL 방식의
+혼합 읽기/쓰기 처리량을 비교합니다.
+
+실행: python -m benchmarks.db_benchmark --threads 8 --ops 2000 --write-ratio 0.2
+"""
+import argparse
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+import logging
+from pathlib import Path
+
+import app.db as db
+from app.logger import get_logger
+
+
+# ==================== 기존 방식 (호출마다 connect/close) ====================
+
+def legacy_save_mapping(path, document_name, original_filename, store_name, category):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT OR REPLACE INTO document_mappings
+        (document_name, original_filename, file_id, store_name, category)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (document_name, original_filename, None, store_name, category))
+    conn.commit()
+    conn.close()
+
+
+def legacy_get_mapping(path, document_name):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT original_filename FROM document_mappings WHERE document_name = ?', (document_name,))
+    result = cursor.fetchone()
+    conn.close()
+    return result[0] if result else None
+
+
+def legacy_get_config(path, key):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT value FROM config WHERE key = ?', (key,))
+    result = cursor.fetchone()
+    conn.close()
+    return result[0] if result else None
+
+
+def legacy_bump_store_version(path, store_name):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO store_versions (store_name, version, updated_at)
+        VALUES (?, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT(store_name) DO UPDATE SET version = version + 1
+    ''', (store_name,))
+    conn.commit()
+    conn.close()
+
+
+def create_legacy_schema(path):
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE document_mappings (
+            document_name TEXT PRIMARY KEY, original_filename TEXT NOT NULL,
+            file_id TEXT, store_name TEXT, category TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE config (
+            key TEXT PRIMARY KEY, value TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE store_versions (
+            store_name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO config (key, value) VALUES ('active_stores', '["fileSearchStores/bench"]');
+    ''')
+    conn.commit()
+    conn.close()
+
+
+# ==================== 워크로드 ====================
+
+def make_operations(save_mapping, get_mapping, get_config, bump_store_version):
+    """(읽기 작업 목록, 쓰기 작업 목록) - 각 작업은 문서 번호를 인자로 받음"""
+    reads = [
+        lambda i: get_mapping(f'fileSearchStores/bench/documents/doc{i}'),
+        lambda i: get_config('active_stores'),
+    ]
+    writes = [
+        lambda i: save_mapping(f'fileSearchStores/bench/documents/doc{i}', f'file{i}.pdf', 'fileSearchStores/bench', 'bench'),
+        lambda i: bump_store_version('fileSearchStores/bench'),
+    ]
+    return reads, writes
+
+
+def run_workload(reads, writes, threads, ops, write_ratio, seed):
+    """스레드별로 ops개의 혼합 작업을 실행하고 (소요 시간, 오류 수) 반환"""
+    errors = [0]
+    errors_lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(worker_id):
+        rng = random.Random(seed + worker_id)
+        barrier.wait()
+        for _ in range(ops):
+            i = rng.randrange(1000)
+            operation = rng.choice(writes) if rng.random() < write_ratio else rng.choice(reads)
+            try:
+                operation(i)
+            except sqlite3.OperationalError:
+                with errors_lock:
+                    errors[0] += 1
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start, errors[0]
+
+
+def report(label, elapsed, errors, total_ops):
+    print(f"{label:<28} {elapsed:8.2f}s {total_ops / elapsed:12.0f} ops/s   errors: {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='app/db.py 혼합 읽기/쓰기 처리량 벤치마크')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--ops', type=int, default=2000, help='스레드당 작업 수')
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # 로그 출력 비용이 측정을 가리지 않도록 경고 이상만 기록
+    get_logger().setLevel(logging.WARNING)
+
+    total_ops = args.threads * args.ops
+    print(f"threads={args.threads} ops/thread={args.ops} write_ratio={args.write_ratio}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 기존 방식: 호출마다 connect/close, rollback journal
+        legacy_path = Path(tmp) / 'legacy.db'
+        create_legacy_schema(legacy_path)
+        reads, writes = make_operations(
+            lambda *a: legacy_save_mapping(legacy_path, *a),
+            lambda *a: legacy_get_mapping(legacy_path, *a),
+            lambda *a: legacy_get_config(legacy_path, *a),
+            lambda *a: legacy_bump_store_version(legacy_path, *a),
+        )
+        elapsed, errors = run_workload(reads, writes, args.threads, args.ops, args.write_ratio, args.seed)
+        report('connect-per-call (before)', elapsed, errors, total_ops)
+
+        # 현재 방식: 스레드별 연결 + WAL (app.db)
+        original_path = db.DB_PATH
+        db.DB_PATH = Path(tmp) / 'pooled.db'
+        try:
+            db.init_db()
+            db.set_config('active_stores', '["fileSearchStores/bench"]')
+            reads, writes = make_operations(
+                lambda path_doc, name, store, category: db.save_mapping(path_doc, name, store_name=store, category=category),
+                db.get_mapping, db.get_config, db.bump_store_version
+            )
+            elapsed, errors = run_workload(reads, writes, args.threads, args.ops, args.write_ratio, args.seed)
+            report('pooled WAL (after)', elapsed, errors, total_ops)
+        finally:
+            db.close_connection()
+            db.DB_PATH = original_path
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+시설물 검색 인덱스 벤치마크
+합성 시설물 지도(기본 5만 개)에서 기존 선형 검색과 FacilityIndex의
+이름/좌표/카테고리/이름 패턴 조회 시간을 비교합니다.
+
+실행: python -m benchmarks.facility_index_benchmark --facilities 50000 --queries 500
+"""
+import argparse
+import math
+import random
+import statistics
+import time
+
+from app.facility_index import FacilityIndex
+
+SYLLABLES = '가나다라마바사아자차카타파하공원매점화장실음수대광장호수경기장'
+CATEGORIES = ['toilet', 'others', 'store', 'water', 'parking', 'gate', 'info', 'sports']
+
+
+def make_facilities(count, rng):
+    facilities = []
+    for i in range(count):
+        name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 8))) + str(i)
+        facilities.append({
+            'id': f'synthetic_{i}',
+            'name': name,
+            'x': rng.uniform(0, 953),
+            'y': rng.uniform(0, 676),
+            'category': rng.choice(CATEGORIES)
+        })
+    return facilities
+
+
+# ==================== 기존 방식 (선형 검색) ====================
+
+def linear_find_by_name(facilities, name):
+    return next((item for item in facilities if item["name"] == name), None)
+
+
+def linear_nearest(facilities, x, y, max_distance=50):
+    min_dist = float('inf')
+    nearest = None
+    for facility in facilities:
+        dist = math.hypot(x - facility['x'], y - facility['y'])
+        if dist < min_dist and dist <= max_distance:
+            min_dist = dist
+            nearest = facility['name']
+    return nearest
+
+
+def linear_nearest_in_category(facilities, x, y, category):
+    category_facilities = [f for f in facilities if f.get('category') == category]
+    return min(category_facilities, key=lambda f: math.hypot(x - f['x'], y - f['y']), default=None)
+
+
+def linear_search_name(facilities, pattern):
+    return [f for f in facilities if pattern in f.get('name', '')]
+
+
+def timed(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시설물 검색 인덱스 벤치마크')
+    parser.add_argument('--facilities', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    facilities = make_facilities(args.facilities, rng)
+
+    start = time.perf_counter()
+    index = FacilityIndex(facilities)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"facilities={len(facilities)} queries={args.queries} index build={build_ms:.0f} ms")
+
+    names = [(rng.choice(facilities)['name'],) for _ in range(args.queries)]
+    points = [(rng.uniform(0, 953), rng.uniform(0, 676)) for _ in range(args.queries)]
+    category_points = [(x, y, rng.choice(CATEGORIES)) for x, y in points]
+    patterns = [(rng.choice(SYLLABLES) + rng.choice(SYLLABLES),) for _ in range(args.queries)]
+
+    cases = [
+        ('name lookup',
+         lambda name: linear_find_by_name(facilities, name), index.find_by_name, names),
+        ('nearest (50px)',
+         lambda x, y: linear_nearest(facilities, x, y), lambda x, y: index.nearest(x, y, max_distance=50), points),
+        ('nearest in category',
+         lambda x, y, c: linear_nearest_in_category(facilities, x, y, c),
+         lambda x, y, c: index.nearest(x, y, category=c), category_points),
+        ('name pattern search',
+         lambda p: linear_search_name(facilities, p), index.search_name, patterns),
+    ]
+
+    print(f"{'query':<22} {'linear ms':>12} {'index ms':>12} {'speedup':>10}")
+    for label, linear_fn, index_fn, args_list in cases:
+        linear_ms = timed(linear_fn, args_list)
+        index_ms = timed(index_fn, args_list)
+        print(f"{label:<22} {linear_ms:12.3f} {index_ms:12.4f} {linear_ms / index_ms:9.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+길찾기 경로 이미지 렌더러 벤치마크
+matplotlib 렌더러와 Pillow 렌더러의 요청당 지연 시간과 최대 메모리 할당량을 비교합니다.
+
+실행: python -m benchmarks.render_benchmark --runs 30
+"""
+import argparse
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+
+from app.logger import get_logger
+from app.wayfinding import WayfindingService, RENDERERS
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='matplotlib / Pillow 경로 렌더러 비교')
+    parser.add_argument('--runs', type=int, default=30, help='렌더러당 경로 수')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # 로그 출력 비용이 측정을 가리지 않도록 경고 이상만 기록
+    get_logger().setLevel(logging.WARNING)
+
+    service = WayfindingService()
+    G, facilities, tree, node_list = service.load_graph_data()
+    if not G:
+        print('지도 데이터를 불러올 수 없습니다.')
+        return
+
+    # 같은 경로 집합으로 두 렌더러를 비교
+    rng = random.Random(args.seed)
+    routes = []
+    while len(routes) < args.runs:
+        start, end = rng.sample(facilities, 2)
+        start_coords = (start['x'], start['y'])
+        end_coords = (end['x'], end['y'])
+        _, s_idx = tree.query(start_coords)
+        _, e_idx = tree.query(end_coords)
+        route = service.shortest_path(node_list[s_idx], node_list[e_idx])
+        if route is None:
+            continue
+        path, _ = route
+        routes.append((path, start_coords, end_coords))
+
+    print(f"routes={len(routes)}")
+    print(f"{'renderer':<12} {'mean ms':>10} {'p95 ms':>10} {'peak MB':>10} {'avg KB':>10}")
+
+    for renderer in RENDERERS:
+        # 지도 이미지 디코딩 등 최초 1회 비용 제외
+        service.render_route(*routes[0], renderer=renderer)
+
+        timings = []
+        sizes = []
+        tracemalloc.start()
+        for path, start_coords, end_coords in routes:
+            start = time.perf_counter()
+            image_base64 = service.render_route(path, start_coords, end_coords, renderer=renderer)
+            timings.append((time.perf_counter() - start) * 1000)
+            sizes.append(len(image_base64) * 3 / 4 / 1024)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{renderer:<12} {statistics.mean(timings):10.1f} {percentile(timings, 95):10.1f} "
+              f"{peak / 1024 / 1024:10.1f} {statistics.mean(sizes):10.1f}")
+
+
+if __name__ == '__main__':
+    main()
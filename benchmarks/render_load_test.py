@@ -0,0 +1,84 @@
+"""
+길찾기 경로 이미지 동시 렌더링 부하 테스트
+스레드 Flask 워커처럼 여러 스레드에서 동시에 좌표 길찾기(이미지 응답)를 요청해
+동시 요청 수(기본 1, 4, 16)별 처리량과 지연 시간을 측정합니다.
+경로/이미지 캐시는 끄고 매 요청마다 새로 렌더링합니다.
+
+실행: python -m benchmarks.render_load_test --requests 64 --concurrency 1 4 16 --processes 0 4
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.logger import get_logger
+from app.wayfinding import WayfindingService, RENDERERS
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_level(service, requests, concurrency, renderer):
+    """동시 요청 수 concurrency로 requests를 모두 처리하고 (처리량, 평균 ms, p95 ms, 실패 수) 반환"""
+    def handle(coords):
+        start = time.perf_counter()
+        result = service.find_path_from_coords(*coords, renderer=renderer, response_format='image')
+        return (time.perf_counter() - start) * 1000, result['success']
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(handle, requests))
+    elapsed = time.perf_counter() - start
+
+    timings = [ms for ms, _ in outcomes]
+    failed = sum(1 for _, success in outcomes if not success)
+    return len(requests) / elapsed, statistics.mean(timings), percentile(timings, 95), failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='경로 이미지 동시 렌더링 부하 테스트')
+    parser.add_argument('--requests', type=int, default=64, help='동시 요청 수 단계별 요청 수')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--processes', type=int, nargs='+', default=[0, 4], help='렌더러 프로세스 수 (0: 요청 스레드에서 렌더링)')
+    parser.add_argument('--renderer', choices=RENDERERS, default='matplotlib')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # 로그 출력 비용이 측정을 가리지 않도록 경고 이상만 기록
+    get_logger().setLevel(logging.WARNING)
+
+    rng = random.Random(args.seed)
+    requests = [
+        (rng.uniform(100, 850), rng.uniform(100, 600), rng.uniform(100, 850), rng.uniform(100, 600))
+        for _ in range(args.requests)
+    ]
+
+    print(f"cpus={os.cpu_count()} renderer={args.renderer} requests={args.requests}")
+    print(f"{'processes':>10} {'concurrency':>12} {'req/s':>10} {'mean ms':>10} {'p95 ms':>10} {'failed':>8}")
+
+    for processes in args.processes:
+        service = WayfindingService(renderer=args.renderer, route_cache_max_entries=0, render_processes=processes)
+        G, _, _, _ = service.load_graph_data()
+        if not G:
+            print('지도 데이터를 불러올 수 없습니다.')
+            return
+
+        # 지도 이미지 디코딩, 워커 프로세스 시작 등 최초 1회 비용 제외
+        run_level(service, requests[:max(1, processes)], max(1, processes), args.renderer)
+
+        for concurrency in args.concurrency:
+            throughput, mean_ms, p95_ms, failed = run_level(service, requests, concurrency, args.renderer)
+            print(f"{processes:>10} {concurrency:>12} {throughput:10.1f} {mean_ms:10.1f} {p95_ms:10.1f} {failed:>8}")
+
+        if service._render_pool is not None:
+            service._render_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+길찾기 최단 경로 엔진 벤치마크
+CSR 배열 기반 csgraph 엔진과 NetworkX 엔진의 그래프 메모리 사용량과
+알고리즘(다익스트라 / A* / 양방향 A*)별 경로 탐색 지연 시간, 확장 노드 수를 비교합니다.
+(경로 캐시는 거치지 않음)
+
+실행: python -m benchmarks.routing_benchmark --queries 200
+"""
+import argparse
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+
+from app.logger import get_logger
+from app.wayfinding import WayfindingService, ROUTING_ENGINES
+from app.road_network import ROUTING_ALGORITHMS
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='csgraph / NetworkX 최단 경로 엔진 비교')
+    parser.add_argument('--queries', type=int, default=200, help='엔진당 경로 탐색 수')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # 로그 출력 비용이 측정을 가리지 않도록 경고 이상만 기록
+    get_logger().setLevel(logging.WARNING)
+
+    print(f"{'engine':<10} {'algorithm':<20} {'load ms':>10} {'graph MB':>10} {'mean ms':>10} {'p95 ms':>10} {'expanded':>10}")
+
+    pairs = None
+    results = {}
+    for engine in ROUTING_ENGINES:
+        service = WayfindingService(routing_engine=engine)
+
+        # 그래프 생성 시간과 생성 중 할당된 메모리 (시설물/KDTree 포함)
+        tracemalloc.start()
+        start = time.perf_counter()
+        G, _, _, node_list = service.load_graph_data()
+        load_ms = (time.perf_counter() - start) * 1000
+        graph_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if not G:
+            print('지도 데이터를 불러올 수 없습니다.')
+            return
+
+        # 같은 노드 쌍으로 두 엔진을 비교
+        if pairs is None:
+            rng = random.Random(args.seed)
+            pairs = [tuple(rng.sample(node_list, 2)) for _ in range(args.queries)]
+
+        for algorithm in ROUTING_ALGORITHMS:
+            timings = []
+            lengths = []
+            for start_node, end_node in pairs:
+                start = time.perf_counter()
+                route = service._compute_shortest_path(G, start_node, end_node, algorithm)
+                timings.append((time.perf_counter() - start) * 1000)
+                lengths.append(route[1] if route else None)
+            results[(engine, algorithm)] = lengths
+
+            # NetworkX 엔진은 확장 노드 수를 집계하지 않음
+            expanded = service.routing_stats()['by_algorithm'][algorithm]['avg_expanded_nodes']
+            expanded = f"{expanded:10.0f}" if expanded is not None else f"{'-':>10}"
+            print(f"{engine:<10} {algorithm:<20} {load_ms:10.1f} {graph_bytes / 1024 / 1024:10.2f} "
+                  f"{statistics.mean(timings):10.3f} {percentile(timings, 95):10.3f} {expanded}")
+
+    # 모든 엔진/알고리즘의 경로 길이가 같은지 확인
+    baseline = results[(ROUTING_ENGINES[0], 'dijkstra')]
+    mismatches = sum(
+        1 for lengths in results.values() for a, b in zip(baseline, lengths)
+        if (a is None) != (b is None) or (a is not None and abs(a - b) > 1e-6)
+    )
+    print(f"pairs={len(pairs)} length mismatches={mismatches}")
+
+
+if __name__ == '__main__':
+    main()
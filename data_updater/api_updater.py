@@ -11,6 +11,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # API 키는 config_data에서 가져옴
 import config_data
+from app.db import bump_store_version
 
 client = genai.Client(api_key=config_data.GOOGLE_API_KEY)
 
@@ -319,6 +320,9 @@ def update_store_files(store_name: str, chunks: list[tuple[str, str]], base_name
     # 2) 새 파일들 병렬 업로드
     parallel_upload_chunks(chunks, store_name, max_workers=5)
 
+    # 3) 웹 서버의 답변 캐시 무효화 (스토어 버전 갱신)
+    bump_store_version(store_name)
+
     print("   [✔] 동기화 완료\n")
 
 
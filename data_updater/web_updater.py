@@ -11,6 +11,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # config_data에서 설정 가져오기
 import config_data
+from app.db import bump_store_version
 
 client = genai.Client(api_key=config_data.GOOGLE_API_KEY)
 
@@ -390,6 +391,9 @@ def update_store_files(store_name: str, chunks: list[tuple[str, str]], base_name
             else:
                 print(f"   ❌ {name} - {msg}")
 
+    # 웹 서버의 답변 캐시 무효화 (스토어 버전 갱신)
+    bump_store_version(store_name)
+
     print("   [✔] 동기화 완료\n")
 
 
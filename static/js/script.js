@@ -1067,6 +1067,8 @@ async function performSearch() {
     searchQuery.value = '';
     searchLoading.style.display = 'flex';
 
+    let modelMessage = null;
+
     try {
         const requestData = {
             query: query,
@@ -1076,7 +1078,7 @@ async function performSearch() {
 
         console.log('Sending request:', requestData);
 
-        const response = await fetch('/api/search', {
+        const response = await fetch('/api/search/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -1084,13 +1086,31 @@ async function performSearch() {
             body: JSON.stringify(requestData)
         });
 
-        const data = await response.json();
+        // Validation errors are returned as plain JSON before streaming starts
+        if (!response.ok || !response.body) {
+            const data = await response.json();
+            throw new Error(data.error);
+        }
+
+        let answer = '';
+        const data = await readSearchStream(response, (text) => {
+            // First token arrived: replace loading indicator with the answer bubble
+            if (!modelMessage) {
+                searchLoading.style.display = 'none';
+                modelMessage = addMessageToChat('model', '');
+            }
+            answer += text;
+            modelMessage.querySelector('.message-text').textContent = answer;
+            chatHistory.scrollTop = chatHistory.scrollHeight;
+        });
 
         console.log('Response:', data);
 
         if (data.success) {
-            // Add AI response to conversation history and UI
-            addMessageToChat('model', data.result);
+            if (!modelMessage) {
+                modelMessage = addMessageToChat('model', data.result);
+            }
+            renderCitations(modelMessage, data.citations);
 
             // Update conversation history for Gemini API
             state.conversationHistory.push({
@@ -1112,7 +1132,10 @@ async function performSearch() {
     } catch (error) {
         console.error('Search error:', error);
         showToast(`검색 실패: ${error.message}`, 'error');
-        // Remove the user message on error
+        // Remove the partial answer and the user message on error
+        if (modelMessage) {
+            modelMessage.remove();
+        }
         const messages = chatHistory.querySelectorAll('.chat-message');
         if (messages.length > 0) {
             messages[messages.length - 1].remove();
@@ -1122,6 +1145,67 @@ async function performSearch() {
     }
 }
 
+async function readSearchStream(response, onDelta) {
+    // Parse Server-Sent Events from the fetch body (EventSource only supports GET)
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder('utf-8');
+    let buffer = '';
+    let result = { success: false, error: 'Stream ended unexpectedly' };
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+
+        for (const rawEvent of events) {
+            let eventType = 'message';
+            let payload = '';
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) eventType = line.slice(7);
+                else if (line.startsWith('data: ')) payload += line.slice(6);
+            });
+            if (!payload) continue;
+
+            const data = JSON.parse(payload);
+            if (eventType === 'delta') {
+                onDelta(data.text);
+            } else if (eventType === 'done' || eventType === 'error') {
+                result = data;
+            }
+        }
+    }
+
+    return result;
+}
+
+function renderCitations(messageDiv, citations) {
+    if (!messageDiv || !citations || citations.length === 0) return;
+
+    const citationsDiv = document.createElement('div');
+    citationsDiv.className = 'message-citations';
+
+    const label = document.createElement('span');
+    label.className = 'citations-label';
+    label.textContent = '출처';
+    citationsDiv.appendChild(label);
+
+    citations.forEach(citation => {
+        const item = document.createElement('span');
+        item.className = 'citation-item';
+        item.textContent = citation.title || citation.document_name || '문서';
+        if (citation.text) {
+            item.title = citation.text;
+        }
+        citationsDiv.appendChild(item);
+    });
+
+    const timeDiv = messageDiv.querySelector('.message-time');
+    messageDiv.querySelector('.message-content').insertBefore(citationsDiv, timeDiv);
+}
+
 function addMessageToChat(role, text) {
     if (!chatHistory) return;
 
@@ -1174,6 +1258,8 @@ function addMessageToChat(role, text) {
 
     // Scroll to bottom
     chatHistory.scrollTop = chatHistory.scrollHeight;
+
+    return messageDiv;
 }
 
 function clearConversation() {
@@ -1687,6 +1773,8 @@ const resetMapBtn = document.getElementById('resetMapBtn');
 const mapClickStatus = document.getElementById('mapClickStatus');
 const initialMap = document.getElementById('initialMap');
 const initialMapImage = document.getElementById('initialMapImage');
+const initialMapCanvas = document.getElementById('initialMapCanvas');
+const pathImageContainer = document.getElementById('pathImageContainer');
 
 // Nearest Facility DOM 요소
 const facilityPathResult = document.getElementById('facilityPathResult');
@@ -1699,6 +1787,14 @@ const facilityMapStatus = document.getElementById('facilityMapStatus');
 const facilityType = document.getElementById('facilityType');
 const initialFacilityMap = document.getElementById('initialFacilityMap');
 const initialFacilityMapImage = document.getElementById('initialFacilityMapImage');
+const initialFacilityMapCanvas = document.getElementById('initialFacilityMapCanvas');
+const facilityPathImageContainer = document.getElementById('facilityPathImageContainer');
+
+// 지도 좌표계 크기 (서버 응답의 map_size 기본값)
+const MAP_WIDTH = 953;
+const MAP_HEIGHT = 676;
+// 캔버스 해상도 배율 (고해상도 화면에서도 선이 흐리지 않도록)
+const ROUTE_CANVAS_SCALE = 2;
 
 // 이벤트 리스너 등록
 if (closePathResultBtn) {
@@ -1721,6 +1817,62 @@ if (resetFacilityMapBtn) {
     resetFacilityMapBtn.addEventListener('click', resetFacilityMapClickState);
 }
 
+// 벡터 경로를 지도 이미지 위 캔버스에 그리기 (서버는 경로 탐색만 수행)
+function drawRouteOnCanvas(canvas, data) {
+    if (!canvas) return;
+
+    const mapWidth = (data.map_size && data.map_size.width) || MAP_WIDTH;
+    const mapHeight = (data.map_size && data.map_size.height) || MAP_HEIGHT;
+    const coords = data.route.coordinates;
+
+    // 캔버스는 CSS로 이미지 크기에 맞춰 늘어나므로 지도 좌표계 그대로 그림
+    canvas.width = mapWidth * ROUTE_CANVAS_SCALE;
+    canvas.height = mapHeight * ROUTE_CANVAS_SCALE;
+    const ctx = canvas.getContext('2d');
+    ctx.setTransform(ROUTE_CANVAS_SCALE, 0, 0, ROUTE_CANVAS_SCALE, 0, 0);
+    ctx.clearRect(0, 0, mapWidth, mapHeight);
+
+    // 경로 선
+    if (coords.length > 1) {
+        ctx.beginPath();
+        ctx.moveTo(coords[0][0], coords[0][1]);
+        for (let i = 1; i < coords.length; i++) {
+            ctx.lineTo(coords[i][0], coords[i][1]);
+        }
+        ctx.strokeStyle = 'rgba(255, 0, 0, 0.7)';
+        ctx.lineWidth = 4;
+        ctx.lineJoin = 'round';
+        ctx.lineCap = 'round';
+        ctx.stroke();
+    }
+
+    // 출발지(파란색) / 도착지(초록색) 마커
+    if (coords.length > 0) {
+        drawRouteMarker(ctx, coords[0], '#3399ff');
+        drawRouteMarker(ctx, coords[coords.length - 1], '#33ff99');
+    }
+
+    canvas.parentElement.classList.add('has-route');
+}
+
+function drawRouteMarker(ctx, point, color) {
+    ctx.beginPath();
+    ctx.arc(point[0], point[1], 8, 0, 2 * Math.PI);
+    ctx.fillStyle = color;
+    ctx.fill();
+    ctx.lineWidth = 3;
+    ctx.strokeStyle = 'white';
+    ctx.stroke();
+}
+
+function clearRouteCanvas(canvas) {
+    if (!canvas) return;
+    const ctx = canvas.getContext('2d');
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    canvas.parentElement.classList.remove('has-route');
+}
+
 // 지도 초기화 (Wayfinding)
 function resetMapClickState() {
     mapClickState.startCoords = null;
@@ -1729,6 +1881,7 @@ function resetMapClickState() {
     mapClickStatus.textContent = translations[lang]['click_start'];
     mapClickStatus.style.color = 'var(--text-secondary)';
     pathResult.style.display = 'none';
+    clearRouteCanvas(initialMapCanvas);
     if (initialMap) initialMap.style.display = 'block';
 }
 
@@ -1739,6 +1892,7 @@ function resetFacilityMapClickState() {
     facilityMapStatus.textContent = translations[lang]['click_location'];
     facilityMapStatus.style.color = 'var(--text-secondary)';
     facilityPathResult.style.display = 'none';
+    clearRouteCanvas(initialFacilityMapCanvas);
     if (initialFacilityMap) initialFacilityMap.style.display = 'block';
 }
 
@@ -1792,7 +1946,8 @@ async function findPathFromCoords() {
                 start_x: mapClickState.startCoords.x,
                 start_y: mapClickState.startCoords.y,
                 end_x: mapClickState.endCoords.x,
-                end_y: mapClickState.endCoords.y
+                end_y: mapClickState.endCoords.y,
+                response_format: 'vector'
             })
         });
 
@@ -1803,10 +1958,17 @@ async function findPathFromCoords() {
 
         if (data.success) {
             pathDistance.textContent = `${data.distance.toFixed(2)} km`;
-            pathImage.src = `data:image/png;base64,${data.image}`;
 
-            // 초기 지도 숨기고 결과 표시
-            if (initialMap) initialMap.style.display = 'none';
+            if (data.route) {
+                // 벡터 응답: 이미 로드된 지도 위에 경로를 직접 그림
+                drawRouteOnCanvas(initialMapCanvas, data);
+                if (pathImageContainer) pathImageContainer.style.display = 'none';
+            } else {
+                // 이미지 응답: 초기 지도 숨기고 결과 이미지 표시
+                pathImage.src = `data:image/png;base64,${data.image}`;
+                if (pathImageContainer) pathImageContainer.style.display = 'block';
+                if (initialMap) initialMap.style.display = 'none';
+            }
             pathResult.style.display = 'block';
 
             mapClickStatus.textContent = translations[lang]['path_found'];
@@ -1855,7 +2017,8 @@ async function findNearestFacility(x, y) {
                 x: x,
                 y: y,
                 category: searchParams.category,
-                name_pattern: searchParams.name_pattern
+                name_pattern: searchParams.name_pattern,
+                response_format: 'vector'
             })
         });
 
@@ -1866,10 +2029,17 @@ async function findNearestFacility(x, y) {
 
         if (data.success) {
             facilityPathDistance.textContent = `${data.distance.toFixed(2)} km`;
-            facilityPathImage.src = `data:image/png;base64,${data.image}`;
 
-            // 초기 지도 숨기고 결과 표시
-            if (initialFacilityMap) initialFacilityMap.style.display = 'none';
+            if (data.route) {
+                // 벡터 응답: 이미 로드된 지도 위에 경로를 직접 그림
+                drawRouteOnCanvas(initialFacilityMapCanvas, data);
+                if (facilityPathImageContainer) facilityPathImageContainer.style.display = 'none';
+            } else {
+                // 이미지 응답: 초기 지도 숨기고 결과 이미지 표시
+                facilityPathImage.src = `data:image/png;base64,${data.image}`;
+                if (facilityPathImageContainer) facilityPathImageContainer.style.display = 'block';
+                if (initialFacilityMap) initialFacilityMap.style.display = 'none';
+            }
             facilityPathResult.style.display = 'block';
 
             facilityMapStatus.textContent = translations[lang]['facility_found'];